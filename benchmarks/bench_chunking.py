@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Microbenchmark: legacy quadratic chunk_text vs. the streaming chunker.
+
+    python benchmarks/bench_chunking.py [--sizes 2000 20000 100000]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.modules.text_chunker import iter_chunks  # noqa: E402
+
+WORDS = "the company reported quarterly revenue growth while analysts expect margins to widen".split()
+
+
+def legacy_chunk_text(text, max_chars=1500):
+    """The pre-tokenizer implementation, kept here for comparison."""
+    chunks = []
+    words = text.split()
+    current = []
+    for w in words:
+        if sum(len(x) for x in current) + len(w) + len(current) > max_chars:
+            chunks.append(" ".join(current))
+            current = []
+        current.append(w)
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def make_article(n_words: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    paragraphs, sentence, paragraph = [], [], []
+    for _ in range(n_words):
+        sentence.append(rng.choice(WORDS))
+        if len(sentence) >= rng.randint(12, 25):
+            paragraph.append(" ".join(sentence).capitalize() + ".")
+            sentence = []
+            if len(paragraph) >= rng.randint(3, 6):
+                paragraphs.append(" ".join(paragraph))
+                paragraph = []
+    paragraphs.append(" ".join(paragraph + [" ".join(sentence)]))
+    return "\n".join(paragraphs)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2_000, 20_000, 100_000])
+    parser.add_argument("--chunk-chars", type=int, default=1500)
+    args = parser.parse_args()
+
+    budget = args.chunk_chars // 4
+    print(f"{'words':>8} {'legacy ms':>10} {'streaming ms':>13} {'speedup':>8} {'chunks old/new':>15}")
+    for size in args.sizes:
+        text = make_article(size)
+        runs = max(1, 20_000 // size)
+        legacy = min(timeit.repeat(lambda: legacy_chunk_text(text, args.chunk_chars), number=runs, repeat=3)) / runs
+        stream = min(timeit.repeat(lambda: list(iter_chunks(text, budget)), number=runs, repeat=3)) / runs
+        n_old, n_new = len(legacy_chunk_text(text, args.chunk_chars)), len(list(iter_chunks(text, budget)))
+        print(f"{size:8d} {legacy * 1000:10.2f} {stream * 1000:13.2f} {legacy / stream:7.1f}x {n_old:7d}/{n_new:<7d}")
+
+
+if __name__ == "__main__":
+    main()
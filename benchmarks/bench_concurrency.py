@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Load test: concurrent API requests with blocking dependencies, inline vs. offloaded.
+
+Quote lookups and analysis queries are replaced with sleeps of realistic
+length, then many requests are fired at the app at once (in-process, over
+ASGI). `--inline` runs the blocking calls directly in the async handlers,
+as the app used to, which serializes every request on the event loop.
+
+    python benchmarks/bench_concurrency.py [--requests 32] [--latency 0.25] [--inline]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+async def _completed(coro, since: float) -> float:
+    """Seconds from `since` until the response is in (queueing on a blocked loop included)."""
+    response = await coro
+    response.raise_for_status()
+    return time.perf_counter() - since
+
+
+async def _load(app, requests: int) -> tuple[float, list[float], list[float]]:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        start = time.perf_counter()
+        stock = [asyncio.ensure_future(_completed(client.post("/api/stock", json={"company": f"T{i}"}), start))
+                 for i in range(requests)]
+        analysis = [asyncio.ensure_future(_completed(client.get("/api/analysis/run/top_market_cap"), start))
+                    for _ in range(requests // 4)]
+        # A cheap route, sent every 50 ms while the slow ones are in flight
+        probes = []
+        for _ in range(5):
+            due = time.perf_counter() + 0.05
+            await asyncio.sleep(0.05)
+            probes.append(await _completed(client.get("/api/io/metrics"), due))
+        latencies = await asyncio.gather(*stock, *analysis)
+        return time.perf_counter() - start, list(latencies), probes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=32, help="concurrent /api/stock requests")
+    parser.add_argument("--latency", type=float, default=0.25, help="seconds each blocking call takes")
+    parser.add_argument("--inline", action="store_true", help="call blocking code on the event loop (old behaviour)")
+    args = parser.parse_args()
+
+    import frontend.app as app_module
+    from src.core import offload, pipeline
+
+    pipeline.fetch_stock_info = lambda company: time.sleep(args.latency) or {"ticker": company}
+    app_module.run_analysis_query = lambda query_id: time.sleep(args.latency) or {"id": query_id, "rows": []}
+    if args.inline:
+        async def inline(dependency, fn, *a, **kw):
+            return fn(*a, **kw)
+
+        offload.run = inline
+
+    elapsed, latencies, probes = asyncio.run(_load(app_module.app, args.requests))
+    total = len(latencies)
+    mode = "inline (blocking)" if args.inline else "offloaded"
+    print(f"{mode}: {total} slow requests ({args.latency * 1000:.0f} ms of blocking work each)")
+    print(f"  wall time        {elapsed:7.2f} s   (fully serialized: {total * args.latency:.2f} s)")
+    print(f"  throughput       {total / elapsed:7.1f} req/s")
+    print(f"  completion p50   {statistics.median(latencies) * 1000:7.0f} ms   max {max(latencies) * 1000:.0f} ms")
+    print(f"  cheap route max  {max(probes) * 1000:7.1f} ms late while under load")
+    if not args.inline:
+        for name, stats in offload.offloader.stats()["dependencies"].items():
+            if stats["calls"]:
+                print(f"  {name:8} limit {stats['limit']:2}  peak {stats['peak_active']:2}  calls {stats['calls']}")
+
+
+if __name__ == "__main__":
+    main()
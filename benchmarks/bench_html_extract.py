@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Microbenchmark: full html.parser soup vs. the restricted extraction backends.
+
+Runs link and paragraph extraction over the saved HTML fixtures, checks that
+every backend returns exactly the reference output, and reports per-page time.
+
+    python benchmarks/bench_html_extract.py [--repeat 20] [--scale 1]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.modules import html_extract  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parents[1] / "tests" / "fixtures" / "html"
+
+
+def reference(page: str):
+    return html_extract._soup_links(page), html_extract._soup_paragraphs(page)
+
+
+def run(page: str, backend: str):
+    return html_extract.extract_links(page, backend), html_extract.extract_paragraphs(page, backend)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--scale", type=int, default=1, help="concatenate each page body N times")
+    args = parser.parse_args()
+
+    backends = ["strainer"] + (["lxml"] if html_extract._has_lxml() else [])
+    print(f"{'fixture':<24} {'KB':>6} {'soup ms':>8} " + " ".join(f"{b + ' ms':>12} {'speedup':>8}" for b in backends))
+    for path in sorted(FIXTURES.glob("*.html")):
+        with open(path, encoding="utf-8", newline="") as f:
+            page = f.read()
+        if args.scale > 1:
+            head, sep, body = page.partition("<body>")
+            page = head + sep + body.replace("</body></html>", "") * args.scale + "</body></html>"
+
+        expected = reference(page)
+        base = min(timeit.repeat(lambda: reference(page), number=args.repeat, repeat=3)) / args.repeat
+        row = f"{path.name:<24} {len(page) / 1024:6.0f} {base * 1000:8.2f} "
+        for backend in backends:
+            if run(page, backend) != expected:
+                raise SystemExit(f"{backend} output differs from the reference on {path.name}")
+            took = min(timeit.repeat(lambda: run(page, backend), number=args.repeat, repeat=3)) / args.repeat
+            row += f"{took * 1000:12.2f} {base / took:7.1f}x "
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
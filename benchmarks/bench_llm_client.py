@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Benchmark: fresh OpenAI client per call vs. the pooled client registry.
+
+By default the calls go to a local OpenAI-compatible stub so the numbers
+isolate client construction + connection setup. Point it at a real
+endpoint with OPENAI_BASE_URL / OPENROUTER_API_KEY and --live to include
+TLS handshakes.
+
+    python benchmarks/bench_llm_client.py [--calls 50] [--live]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+COMPLETION = {
+    "id": "bench",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "bench",
+    "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "ok"}}],
+}
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps(COMPLETION).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _call(client, model):
+    client.chat.completions.create(model=model, messages=[{"role": "user", "content": "ping"}], max_tokens=1)
+
+
+def _time_calls(make_client, calls, model):
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        _call(make_client(), model)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--live", action="store_true", help="use OPENAI_BASE_URL/OPENROUTER_API_KEY instead of the stub")
+    parser.add_argument("--model", default="x-ai/grok-4.1-fast")
+    args = parser.parse_args()
+
+    server = None
+    if not args.live:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}/v1"
+        os.environ["OPENROUTER_API_KEY"] = "bench"
+
+    from openai import OpenAI
+    from src.core import llm_client
+
+    api_key, base_url = llm_client._credentials()
+    if not api_key:
+        sys.exit("No API key configured for --live run.")
+
+    fresh = _time_calls(lambda: OpenAI(base_url=base_url, api_key=api_key), args.calls, args.model)
+    llm_client.reset_clients()
+    _call(llm_client.get_client(), args.model)  # warm the pool once
+    pooled = _time_calls(llm_client.get_client, args.calls, args.model)
+
+    print(f"Target: {base_url} ({args.calls} calls each)")
+    for label, samples in (("fresh client/call", fresh), ("pooled registry", pooled)):
+        print(f"  {label:18} median {statistics.median(samples):7.2f} ms   p95 {sorted(samples)[int(0.95 * (len(samples) - 1))]:7.2f} ms")
+    print(f"  saved per call     {statistics.median(fresh) - statistics.median(pooled):7.2f} ms (median)")
+
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Startup benchmark: import time and RSS of the CLI, pipeline and web app.
+
+Each target is imported in a fresh interpreter several times; the median
+import time and peak RSS are reported together with any heavy dependency
+that got imported eagerly. With --check the script exits non-zero when a
+budget is exceeded, so it can run in CI.
+
+    python benchmarks/bench_startup.py [--repeat 5] [--check]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# Module -> (import-time budget in ms, RSS budget in MB)
+BUDGETS = {
+    "run": (50, 40),
+    "src.core.pipeline": (300, 60),
+    "frontend.app": (1500, 120),
+}
+
+# Dependencies that must only load on first use (or via warm_up())
+HEAVY_MODULES = ("spacy", "yfinance", "openai", "psycopg", "bs4", "requests", "pandas", "newspaper", "feedparser")
+
+_PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - start) * 1000
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"ms": elapsed, "rss_mb": rss_kb / 1024, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module: str) -> dict:
+    code = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--check", action="store_true", help="exit 1 when a budget is exceeded")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'module':20} {'import ms':>10} {'RSS MB':>8}  eager heavy deps")
+    for module, (ms_budget, rss_budget) in BUDGETS.items():
+        runs = [measure(module) for _ in range(args.repeat)]
+        ms = statistics.median(r["ms"] for r in runs)
+        rss = statistics.median(r["rss_mb"] for r in runs)
+        heavy = runs[-1]["heavy"]
+        print(f"{module:20} {ms:10.1f} {rss:8.1f}  {', '.join(heavy) or '-'}")
+        if ms > ms_budget or rss > rss_budget or heavy:
+            failures.append(f"{module}: {ms:.0f} ms / {rss:.0f} MB (budget {ms_budget} ms / {rss_budget} MB), eager: {heavy}")
+
+    if failures:
+        print("\nOver budget:\n  " + "\n  ".join(failures))
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,16 @@
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import FileResponse, HTMLResponse, JSONResponse
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 import uvicorn
 import traceback
 
+import asyncio
+import json
+import os
 import sys
+import threading
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 # Ensure project root is on sys.path so `src` package can be imported when
@@ -17,11 +22,33 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 # Import pipeline functions after updating sys.path
-from src.core import pipeline
+from src.core import latency, offload, pipeline, stage_dag
 from src.core.db import list_analysis_queries, run_analysis_query
-from src.modules.extract_company_name import extract_company_name
+from src.modules import chart_data, indicators, news_fetcher, news_prefetcher, quote_service
+from src.modules.quote_ingest import resolve_symbols
+from src.modules.extract_company_name import extract_company
 
-app = FastAPI(title="FinTech Chatbot Frontend")
+# Seconds between checks for a disconnected client while a report stream is idle
+SSE_DISCONNECT_POLL = float(os.getenv("SSE_DISCONNECT_POLL", "1"))
+
+# Set WARMUP_ON_STARTUP=1 to load the spaCy model and heavy clients in the
+# background at startup instead of on the first request that needs them.
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "0") == "1"
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    if WARMUP_ON_STARTUP:
+        asyncio.get_running_loop().run_in_executor(None, pipeline.warm_up)
+    # NEWS_PREFETCH=1 keeps the article store warm for the watchlist companies
+    prefetcher = news_prefetcher.NewsPrefetcher().start() if news_prefetcher.NEWS_PREFETCH else None
+    yield
+    if prefetcher is not None:
+        prefetcher.stop(timeout=1)
+    offload.offloader.shutdown()
+
+
+app = FastAPI(title="FinTech Chatbot Frontend", lifespan=lifespan)
 
 # Serve static files using absolute path (project-root aware)
 STATIC_DIR = PROJECT_ROOT / "frontend" / "static"
@@ -33,18 +60,32 @@ class QueryPayload(BaseModel):
 class CompanyPayload(BaseModel):
     company: str
 
+class HistoryPayload(CompanyPayload):
+    period: str = "1y"
+    interval: str = "1d"
+    # None uses CHART_MAX_POINTS; 0 returns every bar
+    max_points: int | None = None
+    ohlcv: bool = False
 
-def _index_to_date_str(idx) -> str:
-    """Safely convert an index value to a date string.
+class IndicatorsPayload(BaseModel):
+    # Ticker symbols or company names; omitted means every tracked symbol
+    tickers: list[str] | None = None
+    period: str | None = None
 
-    Many DataFrame indices are pandas Timestamps which expose `.date()`.
-    Static type checkers (Pylance) may treat the index as `Hashable` and
-    complain about `.date()`. Use a try/except fallback to `str(idx)`.
-    """
+
+def _price_history(ticker, period: str = "1y", interval: str = "1d", max_points: int | None = None,
+                   ohlcv: bool = False) -> dict:
+    """Columnar chart data for the report chart (empty arrays when unavailable)."""
     try:
-        return str(idx.date())
+        hist = quote_service.get_history(ticker, period=period)
+        return chart_data.chart_payload(hist, interval, max_points, ohlcv)
     except Exception:
-        return str(idx)
+        return chart_data.chart_payload(None, interval, max_points, ohlcv)
+
+
+def _sse(event: str, data) -> str:
+    """Format one server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
 
 @app.get("/", response_class=HTMLResponse)
 async def index():
@@ -53,8 +94,10 @@ async def index():
 @app.post("/api/extract")
 async def api_extract(payload: QueryPayload):
     try:
-        company = extract_company_name(payload.query)
-        return {"company": company}
+        result = await offload.run("nlp", extract_company, payload.query)
+        if result is None:
+            return {"company": None, "confidence": 0.0, "tier": None}
+        return {"company": result.name, "confidence": result.confidence, "tier": result.tier}
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
@@ -63,7 +106,7 @@ async def api_extract(payload: QueryPayload):
 async def api_news(payload: CompanyPayload):
     try:
         # Use pipeline's fetch_news which includes summarization
-        summaries = pipeline.fetch_news(payload.company)
+        summaries = await offload.run("news", pipeline.fetch_news, payload.company)
         return {"news_summaries": summaries}
     except Exception as e:
         traceback.print_exc()
@@ -72,77 +115,215 @@ async def api_news(payload: CompanyPayload):
 @app.post("/api/stock")
 async def api_stock(payload: CompanyPayload):
     try:
-        stock = pipeline.fetch_stock_info(payload.company)
+        stock = await offload.run("yfinance", pipeline.fetch_stock_info, payload.company)
         return {"stock_info": stock}
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+
+def _history(payload: HistoryPayload) -> dict:
+    ticker = payload.company
+    # if company is a name, try to resolve
+    hist = None
+    try:
+        hist = quote_service.get_history(ticker, period=payload.period)
+    except Exception:
+        # try symbol from info
+        info = quote_service.get_info(ticker)
+        sym = info.get("symbol") if info else None
+        if sym:
+            hist = quote_service.get_history(sym, period=payload.period)
+    return chart_data.chart_payload(hist, payload.interval, payload.max_points, payload.ohlcv)
+
 @app.post("/api/stock/history")
-async def api_stock_history(payload: CompanyPayload):
+async def api_stock_history(payload: HistoryPayload):
+    if payload.interval not in chart_data.INTERVALS:
+        raise HTTPException(status_code=400, detail=f"interval must be one of {', '.join(chart_data.INTERVALS)}")
     try:
-        import yfinance as yf
-        ticker = payload.company
-        t = yf.Ticker(ticker)
-        # if company is a name, try to resolve
-        hist = None
-        try:
-            hist = t.history(period='1y')
-        except Exception:
-            # try symbol from info
-            info = t.info
-            sym = info.get("symbol") if info else None
-            if sym:
-                t2 = yf.Ticker(sym)
-                hist = t2.history(period='1y')
-
-        if hist is None or hist.empty:
-            return {"history": []}
-
-        # Return dates and close prices
-        data = [{"date": _index_to_date_str(idx), "close": float(row.Close)} for idx, row in hist.iterrows()]
-        return {"history": data}
+        return {"history": await offload.run("yfinance", _history, payload)}
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _indicators(payload: IndicatorsPayload) -> dict:
+    symbols, unresolved = resolve_symbols(payload.tickers)
+    values = indicators.indicators_for(symbols, payload.period)
+    return {
+        "period": payload.period or indicators.INDICATOR_PERIOD,
+        "indicators": values,
+        "unresolved": unresolved,
+        "missing": [symbol for symbol in symbols if symbol not in values],
+    }
+
+@app.post("/api/stock/indicators")
+async def api_stock_indicators(payload: IndicatorsPayload):
+    try:
+        return await offload.run("yfinance", _indicators, payload)
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+def _chart_stage() -> stage_dag.Stage:
+    """The report chart, fetched alongside the quote once the ticker is known."""
+    return stage_dag.Stage("chart", lambda ticker: _price_history(ticker), ("ticker",), "yfinance",
+                           fallback=chart_data.chart_payload(None))
+
+
+def _timings(run: stage_dag.DagRun) -> dict:
+    return {
+        "total": round(run.elapsed, 3),
+        "critical_path": run.critical_path,
+        "stages": {t.name: {"started": round(t.started, 3), "seconds": round(t.duration, 3), "error": t.error}
+                   for t in run.timings.values()},
+    }
+
+
 @app.post("/api/report")
 async def api_report(payload: QueryPayload):
+    # Extract, then news / ticker -> stock, indicators, chart side by side, then aggregate and generate
+    stages = pipeline.report_stages(report=pipeline.agenerate_detailed_report) + [_chart_stage()]
     try:
-        # Orchestrate: extract, news, stock, aggregate, generate
-        company = extract_company_name(payload.query)
-        if not company:
-            raise HTTPException(status_code=400, detail="Could not extract company name from query")
-
-        news = pipeline.fetch_news(company)
-        stock = pipeline.fetch_stock_info(company)
-        
-        # Get price history for chart
-        import yfinance as yf
-        ticker = stock.get('ticker', company) if isinstance(stock, dict) else company
-        chart_data = []
-        try:
-            hist = yf.Ticker(ticker).history(period='1y')
-            if hist is not None and not hist.empty:
-                chart_data = [{"date": _index_to_date_str(idx), "close": float(row.Close)} for idx, row in hist.iterrows()]
-        except:
-            pass
-        
-        aggregated = pipeline.aggregate_information(company, news, stock)
-        detailed = pipeline.generate_detailed_report(company, aggregated)
-
-        return {
-            "company": company,
-            "stock_info": stock,
-            "news_summaries": news,
-            "detailed_report": detailed,
-            "chart_data": chart_data
-        }
-    except HTTPException:
-        raise
+        run = await stage_dag.arun_stages(stages, {"query": payload.query})
+    except pipeline.CompanyNotFound as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
+    print(run.summary())
+
+    results = run.results
+    return {
+        "company": results["company"],
+        "stock_info": results["stock"],
+        "news_summaries": results["news"],
+        "detailed_report": results["report"],
+        "chart_data": results["chart"],
+        "timings": _timings(run),
+    }
+
+
+async def _report_events(request: Request, query: str):
+    """Yield SSE events for a report as each stage finishes.
+
+    The report DAG (up to aggregation, plus the chart) runs on the event
+    loop through `arun_stages`, so its blocking stages share the
+    per-dependency offload limits with every other request. Stage results
+    and news summaries are relayed through a queue in arrival order, then
+    the detailed report streams token by token. A client that disconnects
+    stops the run: no new stages start and the summarizer and report stream
+    stop making LLM calls.
+    """
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    stop = threading.Event()
+
+    def on_stage(timing: stage_dag.StageTiming, value) -> None:
+        if timing.error is not None:
+            events.put_nowait(("warning", {"stage": timing.name, "detail": timing.error}))
+        if timing.name == "company":
+            events.put_nowait(("company", {"company": value}))
+        elif timing.name == "stock":
+            events.put_nowait(("stock", {"stock_info": value or {}}))
+        elif timing.name == "chart":
+            events.put_nowait(("chart", {"chart_data": value}))
+
+    def push(event: str, data) -> None:
+        # Called on worker threads
+        loop.call_soon_threadsafe(events.put_nowait, (event, data))
+
+    async def relay(task: asyncio.Future):
+        """Yield queued (event, data) pairs until `task` is done; sets `stop` if the client goes away."""
+        task.add_done_callback(lambda _task: events.put_nowait(None))
+        while True:
+            try:
+                item = await asyncio.wait_for(events.get(), timeout=SSE_DISCONNECT_POLL)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    print("[REPORT] Client disconnected; stopping the report")
+                    stop.set()
+                    return
+                continue
+            if item is None:
+                return
+            yield item
+
+    stages = pipeline.report_stages(on_summary=lambda idx, summary: push("news", {"index": idx, "summary": summary}),
+                                    stop=stop) + [_chart_stage()]
+    run_task = asyncio.ensure_future(
+        stage_dag.arun_stages(stages, {"query": query}, targets=("aggregate", "chart"), on_stage=on_stage)
+    )
+    report_task = None
+    try:
+        async for event, data in relay(run_task):
+            yield _sse(event, data)
+        if stop.is_set():
+            return
+        try:
+            run = run_task.result()
+        except pipeline.CompanyNotFound as e:
+            yield _sse("error", {"detail": str(e)})
+            return
+        except Exception as e:
+            traceback.print_exc()
+            yield _sse("error", {"detail": str(e)})
+            return
+        print(run.summary())
+        company, results = run.results["company"], run.results
+
+        def stream_report() -> None:
+            for delta in pipeline.stream_detailed_report(company, results["aggregate"]):
+                if stop.is_set():
+                    break
+                push("report_delta", {"text": delta})
+
+        report_task = asyncio.ensure_future(offload.run("llm", stream_report))
+        parts = []
+        async for event, data in relay(report_task):
+            parts.append(data["text"])
+            yield _sse(event, data)
+        if stop.is_set():
+            return
+
+        yield _sse("done", {
+            "company": company,
+            "stock_info": results["stock"] or {},
+            "news_summaries": results["news"],
+            "detailed_report": "".join(parts),
+            "chart_data": results["chart"],
+            "timings": _timings(run),
+        })
+    finally:
+        # Also reached when the server cancels the response because the client left
+        stop.set()
+        for task in (run_task, report_task):
+            if task is not None and not task.done():
+                task.cancel()
+
+
+@app.get("/api/report/stream")
+async def api_report_stream(request: Request, query: str):
+    return StreamingResponse(
+        _report_events(request, query),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _cache_stats() -> list:
+    return [pipeline.summary_cache.stats(), news_fetcher.http_cache.stats(),
+            news_fetcher.article_store.stats(), quote_service.service.stats(),
+            quote_service.price_store.stats()]
+
+@app.get("/api/cache/stats")
+async def api_cache_stats():
+    return {"caches": await offload.run("local", _cache_stats)}
+
+
+@app.get("/api/io/metrics")
+async def api_io_metrics():
+    return {**latency.policy.metrics(), "executors": offload.offloader.stats()}
 
 
 @app.get("/api/analysis/options")
@@ -157,8 +338,7 @@ async def api_analysis_options():
 @app.get("/api/analysis/run/{query_id}")
 async def api_analysis_run(query_id: str):
     try:
-        result = run_analysis_query(query_id)
-        return result
+        return await offload.run("db", run_analysis_query, query_id)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
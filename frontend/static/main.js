@@ -298,39 +298,7 @@ function addAnalysisCard(title, data, type) {
             `;
 
         if (Array.isArray(data)) {
-            data.forEach((item, idx) => {
-                // Format news: preserve line breaks, extract header (bold text before colon), and add proper bullet structure
-                const lines = item
-                    .split('\n')
-                    .filter(line => line.trim())
-                    .map(line => {
-                        // Remove word count metadata like *(Word count: 378)*
-                        let cleanLine = line.replace(/\*\(Word count:.*?\)\*/g, '').trim();
-                        if (!cleanLine) return '';
-
-                        // Parse bullet points with format "- **Header**: Content"
-                        const headerMatch = cleanLine.match(/^[-•]\s*\*\*(.*?)\*\*:\s*(.*)$/);
-                        if (headerMatch) {
-                            const [, header, content] = headerMatch;
-                            return `<div class="news-bullet"><strong class="bullet-header">${header}:</strong> <span class="bullet-content">${content}</span></div>`;
-                        }
-
-                        // Parse bullet points with format "- Header: Content"
-                        const simpleMatch = cleanLine.match(/^[-•]\s*([^:]+):\s*(.*)$/);
-                        if (simpleMatch) {
-                            const [, header, content] = simpleMatch;
-                            return `<div class="news-bullet"><strong class="bullet-header">${header}:</strong> <span class="bullet-content">${content}</span></div>`;
-                        }
-
-                        // Otherwise treat as regular content
-                        return `<div class="news-bullet"><span class="bullet-content">${cleanLine}</span></div>`;
-                    })
-                    .join('');
-
-                if (lines) {
-                    html += `<li class="news-item">${lines}</li>`;
-                }
-            });
+            data.forEach(item => { html += formatNewsItem(item); });
         }
 
         html += '</ul>';
@@ -345,6 +313,43 @@ function addAnalysisCard(title, data, type) {
     setTimeout(() => {
         dom.messagesArea.scrollTop = dom.messagesArea.scrollHeight;
     }, 0);
+    return card;
+}
+
+function formatNewsItem(item) {
+    // Format news: preserve line breaks, extract header (bold text before colon), and add proper bullet structure
+    const lines = String(item || '')
+        .split('\n')
+        .filter(line => line.trim())
+        .map(line => {
+            // Remove word count metadata like *(Word count: 378)*
+            let cleanLine = line.replace(/\*\(Word count:.*?\)\*/g, '').trim();
+            if (!cleanLine) return '';
+
+            // Parse bullet points with format "- **Header**: Content"
+            const headerMatch = cleanLine.match(/^[-•]\s*\*\*(.*?)\*\*:\s*(.*)$/);
+            if (headerMatch) {
+                const [, header, content] = headerMatch;
+                return `<div class="news-bullet"><strong class="bullet-header">${header}:</strong> <span class="bullet-content">${content}</span></div>`;
+            }
+
+            // Parse bullet points with format "- Header: Content"
+            const simpleMatch = cleanLine.match(/^[-•]\s*([^:]+):\s*(.*)$/);
+            if (simpleMatch) {
+                const [, header, content] = simpleMatch;
+                return `<div class="news-bullet"><strong class="bullet-header">${header}:</strong> <span class="bullet-content">${content}</span></div>`;
+            }
+
+            // Otherwise treat as regular content
+            return `<div class="news-bullet"><span class="bullet-content">${cleanLine}</span></div>`;
+        })
+        .join('');
+
+    return lines ? `<li class="news-item">${lines}</li>` : '';
+}
+
+function hasChartData(chartData) {
+    return Boolean(chartData && chartData.dates && chartData.dates.length > 0);
 }
 
 function renderPriceChart(chartData, company) {
@@ -362,8 +367,9 @@ function renderPriceChart(chartData, company) {
     }
 
     const ctx = chartCanvas.getContext('2d');
-    const dates = chartData.map(d => d.date);
-    const prices = chartData.map(d => d.close);
+    // Columnar payload: parallel `dates` / `close` arrays, already downsampled server-side
+    const dates = chartData.dates;
+    const prices = chartData.close;
 
     const minPrice = Math.min(...prices);
     const maxPrice = Math.max(...prices);
@@ -553,7 +559,7 @@ function openReportModal(company, report, stockInfo, chartData) {
             </div>
 
             <!-- Price Chart -->
-            ${chartData && chartData.length > 0 ? `
+            ${hasChartData(chartData) ? `
             <div class="chart-section">
                 <h3 class="section-title">12-Month Price Performance</h3>
                 <canvas id="priceChart" class="price-chart" height="80"></canvas>
@@ -573,7 +579,7 @@ function openReportModal(company, report, stockInfo, chartData) {
     dom.reportContent.innerHTML = reportHTML;
 
     // Initialize chart if data exists
-    if (chartData && chartData.length > 0) {
+    if (hasChartData(chartData)) {
         setTimeout(() => {
             renderPriceChart(chartData, company);
         }, 100);
@@ -616,7 +622,136 @@ function downloadReport() {
 /* ====================================
    MAIN FLOW: GENERATE REPORT
    ==================================== */
-async function generateReport(query) {
+function generateReport(query) {
+    if (!window.EventSource) return generateReportOnce(query);
+    if (!query.trim()) {
+        showToast('Please enter a company name or query', 'warning');
+        return;
+    }
+
+    setLoading(true);
+    const empty = document.querySelector('.empty-state');
+    if (empty) empty.style.display = 'none';
+    addMessage(query, true);
+    addMessage('Analyzing your query...', false);
+    const thinking = dom.messagesArea ? dom.messagesArea.lastChild : null;
+
+    const scrollDown = () => {
+        if (dom.messagesArea) dom.messagesArea.scrollTop = dom.messagesArea.scrollHeight;
+    };
+
+    // Pieces arrive independently; render each one as soon as it lands
+    let company = null;
+    let stockInfo = null;
+    let chartData = null;
+    let newsList = null;
+    const newsItems = [];
+    let reportText = '';
+    let reportBubble = null;
+    let reportPreview = null;
+    let finished = false;
+
+    const source = new EventSource(`/api/report/stream?query=${encodeURIComponent(query)}`);
+    const finish = () => {
+        finished = true;
+        source.close();
+        setLoading(false);
+    };
+    // Transport errors also fire 'error', but without a data payload
+    const on = (event, handler) => source.addEventListener(event, e => {
+        if (e.data) handler(JSON.parse(e.data));
+    });
+
+    on('company', data => {
+        if (thinking && thinking.parentNode) thinking.parentNode.removeChild(thinking);
+        company = data.company;
+        state.currentCompany = company;
+        addMessage(`Analyzing ${company}...`, false);
+    });
+
+    on('stock', data => {
+        stockInfo = data.stock_info;
+        if (stockInfo && Object.keys(stockInfo).length) {
+            addAnalysisCard('Stock Information', stockInfo, 'stock');
+        }
+    });
+
+    on('chart', data => { chartData = data.chart_data || null; });
+
+    on('news', data => {
+        if (!newsList) {
+            newsList = addAnalysisCard('Recent News', [], 'news').querySelector('.news-list');
+        }
+        // Keep article order even though summaries finish out of order
+        newsItems[data.index] = formatNewsItem(data.summary);
+        newsList.innerHTML = newsItems.filter(Boolean).join('');
+        scrollDown();
+    });
+
+    on('report_delta', data => {
+        if (!reportBubble) {
+            const messageGroup = document.createElement('div');
+            messageGroup.className = 'message-group assistant';
+            reportBubble = document.createElement('div');
+            reportBubble.className = 'analysis-card analysis-report';
+            reportBubble.innerHTML = `
+        <h3>
+          <svg class="analysis-card-icon" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+            <path d="M14 2H6a2 2 0 0 0-2 2v16a2 2 0 0 0 2 2h12a2 2 0 0 0 2-2V8z"></path>
+            <polyline points="14 2 14 8 20 8"></polyline>
+            <line x1="12" y1="13" x2="18" y2="13"></line>
+            <line x1="12" y1="17" x2="18" y2="17"></line>
+          </svg>
+          AI Analysis
+        </h3>
+        <div class="report-preview report-formatter"></div>
+      `;
+            reportPreview = reportBubble.querySelector('.report-preview');
+            messageGroup.appendChild(reportBubble);
+            dom.messagesArea.appendChild(messageGroup);
+        }
+        reportText += data.text;
+        reportPreview.innerHTML = formatReportHTML(reportText);
+        scrollDown();
+    });
+
+    on('done', data => {
+        finish();
+        if (reportBubble && data.detailed_report) {
+            reportPreview.innerHTML = formatReportHTML(data.detailed_report);
+            const reportBtn = document.createElement('button');
+            reportBtn.className = 'btn btn-primary';
+            reportBtn.textContent = 'View Full Report';
+            reportBtn.addEventListener('click', () => {
+                openReportModal(data.company, data.detailed_report, data.stock_info, data.chart_data || chartData);
+            });
+            reportBubble.appendChild(reportBtn);
+            scrollDown();
+        }
+        showToast('Analysis complete', 'success');
+    });
+
+    // Server-side failure reported as an event (e.g. no company in the query)
+    on('error', data => {
+        finish();
+        if (thinking && thinking.parentNode) thinking.parentNode.removeChild(thinking);
+        addMessage(`Error: ${data.detail}`, false);
+        showToast('Failed to generate report. Please try again.', 'error');
+    });
+
+    on('warning', data => console.warn(`Stage ${data.stage} failed:`, data.detail));
+
+    // Transport failure: EventSource would otherwise reconnect and rerun the report
+    source.onerror = () => {
+        if (finished) return;
+        finish();
+        addMessage('Error: connection to the server was lost', false);
+        showToast('Failed to generate report. Please try again.', 'error');
+    };
+}
+
+// Single-request fallback for browsers without EventSource
+async function generateReportOnce(query) {
     if (!query.trim()) {
         showToast('Please enter a company name or query', 'warning');
         return;
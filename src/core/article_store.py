@@ -0,0 +1,223 @@
+"""Local store of fetched news articles with an SQLite FTS5 full-text index.
+
+Articles are kept once per canonical URL and per body, so the same story
+crawled for several companies (or re-crawled later) is stored a single
+time. Every crawl also records when its topic was last refreshed, which
+lets readers decide whether the stored results are recent enough to skip
+the network. Like the other caches the file runs in WAL mode so the
+prefetch worker and the request handlers can share it.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable, NamedTuple, Sequence
+
+CREATE_ARTICLE_TABLES_SQL = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url_key TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    text TEXT NOT NULL,
+    source TEXT NOT NULL,
+    content_hash TEXT NOT NULL UNIQUE,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_fetched_at ON articles (fetched_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, text, content='articles', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, title, text) VALUES (new.id, new.title, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, text) VALUES ('delete', old.id, old.title, old.text);
+END;
+CREATE TABLE IF NOT EXISTS crawled_topics (
+    topic TEXT PRIMARY KEY,
+    crawled_at REAL NOT NULL
+);
+"""
+
+# bm25() is lower for better matches; the title counts more than the body
+SEARCH_SQL = """
+SELECT a.url, a.title, a.text, a.source, a.fetched_at
+FROM articles_fts JOIN articles AS a ON a.id = articles_fts.rowid
+WHERE articles_fts MATCH ? AND a.fetched_at >= ?
+ORDER BY bm25(articles_fts, 2.0, 1.0), a.fetched_at DESC
+LIMIT ?
+"""
+
+_WORD = re.compile(r"\w+")
+
+
+class StoredArticle(NamedTuple):
+    url: str
+    title: str
+    text: str
+    source: str
+    fetched_at: float
+
+
+def topic_key(topic: str) -> str:
+    return " ".join(_WORD.findall((topic or "").lower()))
+
+
+def match_expression(phrases: Iterable[str]) -> str:
+    """FTS5 query matching any of `phrases` (each as an exact phrase)."""
+    quoted = dict.fromkeys('"' + " ".join(_WORD.findall(p.lower())) + '"' for p in phrases)
+    return " OR ".join(q for q in quoted if q != '""')
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(" ".join(text.lower().split()).encode("utf-8")).hexdigest()
+
+
+class ArticleStore:
+    """Deduplicated article archive searchable by full text.
+
+    Pass `path=None` to disable the store (nothing is kept, searches return
+    nothing and every topic is stale). Articles older than `max_age` seconds
+    are pruned on write.
+    """
+
+    def __init__(self, path: str | Path | None, max_age: float = 7 * 24 * 3600) -> None:
+        self.path = Path(path) if path else None
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._disk_ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        assert self.path is not None
+        if not self._disk_ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=10, isolation_level=None)
+        with self._lock:
+            if not self._disk_ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(CREATE_ARTICLE_TABLES_SQL)
+                self._disk_ready = True
+        return conn
+
+    def add(
+        self,
+        topic: str,
+        articles: Sequence,
+        url_key: Callable[[str], str] = lambda url: url,
+    ) -> int:
+        """Store `articles` (objects with url, title, text and source) crawled for `topic`.
+
+        Articles whose canonical URL or body is already stored are not added
+        again, but their fetch time is bumped so they stay fresh. Marks `topic` as crawled now and returns how many articles were new.
+        """
+        if self.path is None:
+            return 0
+        now = time.time()
+        added = 0
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                for article in articles:
+                    if not article.text:
+                        continue
+                    key, content_hash = url_key(article.url), _content_hash(article.text)
+                    # Upsert: a re-crawled article keeps its row but counts as fetched now
+                    cursor = conn.execute(
+                        "UPDATE articles SET fetched_at = ? WHERE url_key = ? OR content_hash = ?",
+                        (now, key, content_hash),
+                    )
+                    if cursor.rowcount:
+                        continue
+                    cursor = conn.execute(
+                        "INSERT OR IGNORE INTO articles (url_key, url, title, text, source, content_hash, fetched_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (key, article.url, article.title or "", article.text, article.source, content_hash, now),
+                    )
+                    added += cursor.rowcount
+                conn.execute(
+                    "INSERT OR REPLACE INTO crawled_topics (topic, crawled_at) VALUES (?, ?)",
+                    (topic_key(topic), now),
+                )
+                conn.execute("DELETE FROM articles WHERE fetched_at < ?", (now - self.max_age,))
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+            finally:
+                conn.close()
+        except sqlite3.Error as exc:
+            print(f"[ARTICLE STORE] Write failed: {exc}")
+            return 0
+        return added
+
+    def crawled_at(self, topic: str) -> float | None:
+        """When `topic` was last crawled, or None if never."""
+        if self.path is None:
+            return None
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT crawled_at FROM crawled_topics WHERE topic = ?", (topic_key(topic),)
+                ).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error as exc:
+            print(f"[ARTICLE STORE] Lookup failed: {exc}")
+            return None
+        return row[0] if row is not None else None
+
+    def is_fresh(self, topic: str, ttl_seconds: float) -> bool:
+        crawled = self.crawled_at(topic)
+        return crawled is not None and time.time() - crawled <= ttl_seconds
+
+    def search(self, phrases: Iterable[str], limit: int = 5, max_age: float | None = None) -> list[StoredArticle]:
+        """Best full-text matches for any of `phrases` among articles younger than `max_age`."""
+        expression = match_expression(phrases)
+        if self.path is None or not expression or limit <= 0:
+            return []
+        max_age = self.max_age if max_age is None else max_age
+        try:
+            conn = self._connect()
+            try:
+                rows = conn.execute(SEARCH_SQL, (expression, time.time() - max_age, limit)).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as exc:
+            print(f"[ARTICLE STORE] Search failed: {exc}")
+            return []
+        return [StoredArticle(*row) for row in rows]
+
+    def clear(self) -> None:
+        if self.path is None:
+            return
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM articles")
+                conn.execute("DELETE FROM crawled_topics")
+            finally:
+                conn.close()
+        except sqlite3.Error as exc:
+            print(f"[ARTICLE STORE] Clear failed: {exc}")
+
+    def stats(self) -> dict[str, int | str]:
+        """Return article and topic counts."""
+        articles = topics = 0
+        if self.path is not None:
+            try:
+                conn = self._connect()
+                try:
+                    articles = conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+                    topics = conn.execute("SELECT COUNT(*) FROM crawled_topics").fetchone()[0]
+                finally:
+                    conn.close()
+            except sqlite3.Error as exc:
+                print(f"[ARTICLE STORE] Stats failed: {exc}")
+        return {"namespace": "articles", "articles": articles, "topics": topics}
@@ -0,0 +1,164 @@
+"""Two-tier (memory + SQLite) cache for expensive string results such as LLM summaries."""
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_CACHE_DIR = Path(os.getenv("CACHE_DIR", str(PROJECT_ROOT / ".cache")))
+
+CREATE_CACHE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+"""
+
+
+def make_key(*parts: object) -> str:
+    """Return a stable content hash for the given key parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part if part is not None else "").encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+class TwoTierCache:
+    """In-process LRU bounded by bytes, backed by a shared SQLite file with a TTL.
+
+    The SQLite tier runs in WAL mode so several uvicorn workers can read and
+    write the same file. Pass `path=None` to keep the cache in memory only.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        path: str | Path | None,
+        ttl_seconds: float,
+        max_memory_bytes: int = 8 * 1024 * 1024,
+    ) -> None:
+        self.namespace = namespace
+        self.path = Path(path) if path else None
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_bytes = max_memory_bytes
+        # key -> (value, created_at, size in UTF-8 bytes)
+        self._memory: OrderedDict[str, tuple[str, float, int]] = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._disk_ready = False
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        assert self.path is not None
+        if not self._disk_ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=5)
+        if not self._disk_ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(CREATE_CACHE_TABLE_SQL)
+            conn.commit()
+            self._disk_ready = True
+        return conn
+
+    def _remember(self, key: str, value: str, created_at: float) -> None:
+        """Insert into the memory tier and evict least-recently-used entries."""
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= old[2]
+        size = len(value.encode("utf-8"))
+        if size > self.max_memory_bytes:
+            return
+        self._memory[key] = (value, created_at, size)
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, (_, _, evicted) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted
+
+    def get(self, key: str) -> str | None:
+        """Return the cached value for `key`, or None when missing or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and now - entry[1] <= self.ttl_seconds:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry[0]
+
+        row = None
+        if self.path is not None:
+            try:
+                with closing(self._connect()) as conn, conn:
+                    row = conn.execute(
+                        "SELECT value, created_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                        (self.namespace, key),
+                    ).fetchone()
+            except sqlite3.Error as exc:
+                print(f"[CACHE] Disk lookup failed: {exc}")
+
+        with self._lock:
+            if row is not None and now - row[1] <= self.ttl_seconds:
+                self._remember(key, row[0], row[1])
+                self.disk_hits += 1
+                return row[0]
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        """Store `value` in both tiers."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+
+        if self.path is None:
+            return
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache_entries (namespace, key, value, created_at) VALUES (?, ?, ?, ?)",
+                    (self.namespace, key, value, now),
+                )
+                conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND created_at < ?",
+                    (self.namespace, now - self.ttl_seconds),
+                )
+        except sqlite3.Error as exc:
+            print(f"[CACHE] Disk write failed: {exc}")
+
+    def clear(self) -> None:
+        """Drop every entry in this namespace from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        if self.path is None:
+            return
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+        except sqlite3.Error as exc:
+            print(f"[CACHE] Disk clear failed: {exc}")
+
+    def stats(self) -> dict[str, int | str]:
+        """Return hit/miss counters and memory-tier usage."""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "namespace": self.namespace,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate_pct": round(100 * (self.memory_hits + self.disk_hits) / lookups) if lookups else 0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+            }
@@ -3,10 +3,12 @@ from __future__ import annotations
 
 import json
 import os
-from typing import Any, Mapping
+from typing import TYPE_CHECKING, Any, Mapping, Sequence
 
 from dotenv import load_dotenv
-import psycopg
+
+if TYPE_CHECKING:
+    import psycopg
 
 # Ensure .env values are loaded even when this module is imported before pipeline.py
 load_dotenv()
@@ -276,6 +278,13 @@ def _prepare_payload(stock_data: Mapping[str, Any]) -> dict[str, Any]:
     }
 
 
+def _connect(database_url: str) -> "psycopg.Connection":
+    """Open a connection; psycopg is only imported once the DB is actually used."""
+    import psycopg
+
+    return psycopg.connect(database_url)
+
+
 def _ensure_table(conn: psycopg.Connection) -> None:
     global _TABLE_READY
     if _TABLE_READY:
@@ -301,7 +310,7 @@ def save_stock_snapshot(stock_data: Mapping[str, Any]) -> None:
         return
 
     try:
-        with psycopg.connect(database_url) as conn:
+        with _connect(database_url) as conn:
             _ensure_table(conn)
             with conn.cursor() as cur:
                 cur.execute(INSERT_STOCK_SQL, payload)
@@ -311,6 +320,34 @@ def save_stock_snapshot(stock_data: Mapping[str, Any]) -> None:
         print(f"[DB] Failed to store stock snapshot: {exc}")
 
 
+def save_stock_snapshots(snapshots: Sequence[Mapping[str, Any]]) -> int:
+    """Persist many stock snapshots in one transaction and return how many were written.
+
+    Rows go through `executemany`, which psycopg pipelines into a single
+    round trip. Snapshots without a ticker are skipped; returns 0 when
+    DATABASE_URL is not configured or the write fails.
+    """
+    database_url = _get_database_url()
+    if not database_url:
+        print("[DB] DATABASE_URL not set; skipping persistence.")
+        return 0
+
+    payloads = [payload for payload in map(_prepare_payload, snapshots) if payload.get("ticker")]
+    if not payloads:
+        return 0
+
+    try:
+        with _connect(database_url) as conn:
+            _ensure_table(conn)
+            with conn.cursor() as cur:
+                cur.executemany(INSERT_STOCK_SQL, payloads)
+            conn.commit()
+    except Exception as exc:
+        print(f"[DB] Failed to store {len(payloads)} stock snapshots: {exc}")
+        return 0
+    return len(payloads)
+
+
 def list_analysis_queries() -> list[dict[str, str]]:
     """Return metadata for the available predefined SQL insights."""
     return [
@@ -336,7 +373,7 @@ def run_analysis_query(query_id: str) -> dict[str, Any]:
     rows: list[dict[str, Any]] = []
 
     try:
-        with psycopg.connect(database_url) as conn:
+        with _connect(database_url) as conn:
             _ensure_table(conn)
             with conn.cursor() as cur:
                 cur.execute(query_meta["sql"])  # type: ignore[arg-type]
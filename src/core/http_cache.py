@@ -0,0 +1,190 @@
+"""Disk-backed HTTP response cache with validators for conditional requests.
+
+Entries live in one SQLite file (WAL mode, busy timeout) so several
+processes can share it. Each entry keeps the body plus its ETag and
+Last-Modified headers; callers decide freshness with a per-request TTL and
+revalidate stale entries with `If-None-Match` / `If-Modified-Since`. The
+file is capped at `max_bytes` of bodies, evicting least-recently-used URLs.
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+CREATE_HTTP_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS http_responses (
+    url TEXT PRIMARY KEY,
+    body TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+"""
+
+# Keep the most recently used rows whose bodies fit in the cap, drop the rest
+EVICT_SQL = """
+DELETE FROM http_responses WHERE url IN (
+    SELECT url FROM (
+        SELECT url, SUM(size) OVER (ORDER BY last_access DESC, url) AS running
+        FROM http_responses
+    ) WHERE running > ?
+)
+"""
+
+
+class CachedResponse(NamedTuple):
+    body: str
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+
+    def is_fresh(self, ttl_seconds: float, now: float | None = None) -> bool:
+        return (now if now is not None else time.time()) - self.fetched_at <= ttl_seconds
+
+    def validators(self) -> dict[str, str]:
+        """Headers that turn the next request for this URL into a conditional one."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """URL -> response body store shared across threads and processes.
+
+    Pass `path=None` to disable caching (every lookup misses).
+    """
+
+    def __init__(self, path: str | Path | None, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.path = Path(path) if path else None
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._disk_ready = False
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        assert self.path is not None
+        if not self._disk_ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=10, isolation_level=None)
+        if not self._disk_ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(CREATE_HTTP_TABLE_SQL)
+            self._disk_ready = True
+        return conn
+
+    def record(self, outcome: str) -> None:
+        """Count a lookup outcome: "hits", "revalidated" or "misses"."""
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def lookup(self, url: str) -> CachedResponse | None:
+        """Return the stored response for `url` (fresh or not) and mark it recently used."""
+        if self.path is None:
+            return None
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT body, etag, last_modified, fetched_at FROM http_responses WHERE url = ?",
+                    (url,),
+                ).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE http_responses SET last_access = ? WHERE url = ?", (time.time(), url))
+            finally:
+                conn.close()
+        except sqlite3.Error as exc:
+            print(f"[HTTP CACHE] Lookup failed: {exc}")
+            return None
+        return CachedResponse(*row) if row is not None else None
+
+    def store(self, url: str, body: str, etag: str | None = None, last_modified: str | None = None) -> None:
+        """Save a full response and evict least-recently-used entries over the size cap."""
+        if self.path is None:
+            return
+        size = len(body.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(
+                    "INSERT OR REPLACE INTO http_responses (url, body, etag, last_modified, fetched_at, last_access, size) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (url, body, etag, last_modified, now, now, size),
+                )
+                conn.execute(EVICT_SQL, (self.max_bytes,))
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+            finally:
+                conn.close()
+        except sqlite3.Error as exc:
+            print(f"[HTTP CACHE] Write failed: {exc}")
+
+    def refresh(self, url: str) -> None:
+        """Restart the TTL of an entry the server confirmed unchanged (HTTP 304)."""
+        if self.path is None:
+            return
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "UPDATE http_responses SET fetched_at = ?, last_access = ? WHERE url = ?",
+                    (now, now, url),
+                )
+            finally:
+                conn.close()
+        except sqlite3.Error as exc:
+            print(f"[HTTP CACHE] Refresh failed: {exc}")
+
+    def clear(self) -> None:
+        if self.path is None:
+            return
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM http_responses")
+            finally:
+                conn.close()
+        except sqlite3.Error as exc:
+            print(f"[HTTP CACHE] Clear failed: {exc}")
+
+    def stats(self) -> dict[str, int | str]:
+        """Return hit counters and on-disk usage."""
+        entries = size = 0
+        if self.path is not None:
+            try:
+                conn = self._connect()
+                try:
+                    entries, size = conn.execute(
+                        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM http_responses"
+                    ).fetchone()
+                finally:
+                    conn.close()
+            except sqlite3.Error as exc:
+                print(f"[HTTP CACHE] Stats failed: {exc}")
+        with self._lock:
+            lookups = self.hits + self.revalidated + self.misses
+            return {
+                "namespace": "http",
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "hit_rate_pct": round(100 * (self.hits + self.revalidated) / lookups) if lookups else 0,
+                "disk_entries": entries,
+                "disk_bytes": size,
+            }
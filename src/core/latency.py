@@ -0,0 +1,249 @@
+"""Latency-aware policy for outbound I/O: adaptive timeouts, hedging, circuit breaking.
+
+Every call goes through `policy.call(host, fn, max_timeout)`, where `fn`
+takes the timeout to use and performs one request. A "host" is really one
+kind of call with its own latency profile: `yfinance.info`,
+`yfinance.history` and `yfinance.download` are tracked (and broken)
+separately. Per host the policy
+keeps a rolling window of latencies and
+
+- derives the timeout from the window's p95 (`IO_TIMEOUT_MULTIPLIER` x p95,
+  clamped between `IO_MIN_TIMEOUT` and the caller's `max_timeout`), so a
+  stuck request is abandoned after a few typical round trips instead of the
+  worst-case limit;
+- sends a hedged second request when the first has not answered within
+  the p95, and returns whichever finishes first (at most `IO_HEDGE_BUDGET`
+  of requests are hedged, so a slow host is not hit twice as hard);
+- opens a circuit breaker after `IO_BREAKER_FAILURES` consecutive failures:
+  calls fail immediately with `CircuitOpenError` for `IO_BREAKER_COOLDOWN`
+  seconds, then a single probe decides whether to close it again.
+
+Callers only see the result or an exception; `policy.metrics()` reports
+the decisions taken per host.
+"""
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+IO_WINDOW = int(os.getenv("IO_WINDOW", "100"))
+# Latency samples a host needs before its p95 is trusted for timeouts and hedging
+IO_MIN_SAMPLES = int(os.getenv("IO_MIN_SAMPLES", "5"))
+IO_TIMEOUT_MULTIPLIER = float(os.getenv("IO_TIMEOUT_MULTIPLIER", "3"))
+IO_MIN_TIMEOUT = float(os.getenv("IO_MIN_TIMEOUT", "1"))
+# Set IO_HEDGE=0 to never send a second request
+IO_HEDGE = os.getenv("IO_HEDGE", "1") == "1"
+IO_HEDGE_BUDGET = float(os.getenv("IO_HEDGE_BUDGET", "0.2"))
+IO_BREAKER_FAILURES = int(os.getenv("IO_BREAKER_FAILURES", "5"))
+IO_BREAKER_COOLDOWN = float(os.getenv("IO_BREAKER_COOLDOWN", "30"))
+IO_MAX_WORKERS = int(os.getenv("IO_MAX_WORKERS", "32"))
+
+_COUNTERS = ("requests", "successes", "failures", "timeouts", "hedges", "hedge_wins", "short_circuits", "breaker_trips")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a host whose circuit breaker is open."""
+
+
+class _HostState:
+    def __init__(self, window: int) -> None:
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.probing = False
+        self.counters = dict.fromkeys(_COUNTERS, 0)
+
+    def p95(self) -> float | None:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+
+    def state(self, now: float) -> str:
+        if not self.open_until:
+            return "closed"
+        return "open" if now < self.open_until else "half-open"
+
+
+class IOPolicy:
+    """Per-host latency tracking plus the hedging and breaker decisions built on it."""
+
+    def __init__(
+        self,
+        window: int = IO_WINDOW,
+        min_samples: int = IO_MIN_SAMPLES,
+        timeout_multiplier: float = IO_TIMEOUT_MULTIPLIER,
+        min_timeout: float = IO_MIN_TIMEOUT,
+        hedge: bool = IO_HEDGE,
+        hedge_budget: float = IO_HEDGE_BUDGET,
+        breaker_failures: int = IO_BREAKER_FAILURES,
+        breaker_cooldown: float = IO_BREAKER_COOLDOWN,
+        max_workers: int = IO_MAX_WORKERS,
+    ) -> None:
+        self.window = window
+        self.min_samples = min_samples
+        self.timeout_multiplier = timeout_multiplier
+        self.min_timeout = min_timeout
+        self.hedge = hedge
+        self.hedge_budget = hedge_budget
+        self.breaker_failures = breaker_failures
+        self.breaker_cooldown = breaker_cooldown
+        self.max_workers = max_workers
+        self._hosts: dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+        self._pool: ThreadPoolExecutor | None = None
+
+    def _host(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.window)
+        return state
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="io")
+            return self._pool
+
+    def _derive_timeout(self, p95: float | None, max_timeout: float) -> float:
+        if p95 is None:
+            return max_timeout
+        return min(max_timeout, max(self.min_timeout, p95 * self.timeout_multiplier))
+
+    def timeout_for(self, host: str, max_timeout: float) -> float:
+        """The timeout the next request to `host` gets."""
+        with self._lock:
+            state = self._host(host)
+            p95 = state.p95() if len(state.latencies) >= self.min_samples else None
+        return self._derive_timeout(p95, max_timeout)
+
+    def _admit(self, host: str, hedge: bool = True) -> tuple[float | None, float | None, bool]:
+        """Check the breaker and return (trusted p95, hedge delay, is probe) for one call; raises when open."""
+        now = time.monotonic()
+        with self._lock:
+            state = self._host(host)
+            state.counters["requests"] += 1
+            current = state.state(now)
+            if current == "open" or (current == "half-open" and state.probing):
+                state.counters["short_circuits"] += 1
+                raise CircuitOpenError(f"{host} is failing; retry after the breaker cools down")
+            probe = current == "half-open"
+            if probe:
+                state.probing = True
+            trusted = len(state.latencies) >= self.min_samples
+            p95 = state.p95() if trusted else None
+            hedged_share = state.counters["hedges"] / state.counters["requests"]
+            hedge_delay = p95 if hedge and self.hedge and p95 is not None and hedged_share < self.hedge_budget else None
+        return p95, hedge_delay, probe
+
+    def _record(self, host: str, outcome: str, latency: float | None = None, hedge_won: bool = False) -> None:
+        with self._lock:
+            state = self._host(host)
+            if latency is not None:
+                state.latencies.append(latency)
+            if outcome == "success":
+                state.counters["successes"] += 1
+                state.counters["hedge_wins"] += hedge_won
+                state.consecutive_failures = 0
+                state.open_until = 0.0
+                state.probing = False
+                return
+            state.counters["failures"] += 1
+            state.counters["timeouts"] += outcome == "timeout"
+            state.consecutive_failures += 1
+            if state.probing or (not state.open_until and state.consecutive_failures >= self.breaker_failures):
+                state.counters["breaker_trips"] += 1
+                state.open_until = time.monotonic() + self.breaker_cooldown
+                state.probing = False
+                print(f"[IO] Circuit open for {host} ({state.consecutive_failures} failures in a row)")
+
+    def call(self, host: str, fn: Callable[[float], T], max_timeout: float, hedge: bool = True) -> T:
+        """Run `fn(timeout)` against `host` under the policy and return its result.
+
+        Pass `hedge=False` for requests too expensive to send twice.
+
+        Raises `CircuitOpenError` without calling `fn` while the host's breaker
+        is open, `TimeoutError` when no request answers within the derived
+        timeout, or the last request's own exception.
+        """
+        p95, hedge_delay, probe = self._admit(host, hedge)
+        timeout = self._derive_timeout(p95, max_timeout)
+
+        def timed() -> tuple[T, float]:
+            began = time.monotonic()
+            return fn(timeout), time.monotonic() - began
+
+        submitted = False
+        try:
+            pool = self._executor()
+            start = time.monotonic()
+            deadline = start + timeout
+            primary = pool.submit(timed)
+            submitted = True
+        finally:
+            if probe and not submitted:
+                # The probe never reached the host; let the next call probe instead
+                with self._lock:
+                    self._host(host).probing = False
+        pending = {primary}
+        hedge_sent = False
+        error: BaseException | None = None
+        while pending:
+            now = time.monotonic()
+            wait_for = deadline - now
+            if hedge_delay is not None and not hedge_sent:
+                wait_for = min(wait_for, start + hedge_delay - now)
+            done, pending = wait(pending, timeout=max(0.0, wait_for), return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result, latency = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                self._record(host, "success", latency, hedge_won=future is not primary)
+                return result
+            if time.monotonic() >= deadline and pending:
+                break
+            if hedge_delay is not None and not hedge_sent and pending and time.monotonic() >= start + hedge_delay:
+                hedge_sent = True
+                with self._lock:
+                    self._host(host).counters["hedges"] += 1
+                pending.add(pool.submit(timed))
+
+        if pending:
+            # Abandoned requests finish on their own (each has `timeout` of its own)
+            self._record(host, "timeout", latency=timeout)
+            raise TimeoutError(f"{host} did not answer within {timeout:.1f}s")
+        self._record(host, "failure")
+        assert error is not None
+        raise error
+
+    def metrics(self) -> dict:
+        """Counters, breaker state and current p95/timeout per host."""
+        now = time.monotonic()
+        with self._lock:
+            hosts = {}
+            for host, state in sorted(self._hosts.items()):
+                p95 = state.p95()
+                hosts[host] = {
+                    **state.counters,
+                    "state": state.state(now),
+                    "samples": len(state.latencies),
+                    "p95_ms": round(p95 * 1000) if p95 is not None else None,
+                }
+        return {"namespace": "io", "hosts": hosts}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hosts.clear()
+
+
+# Shared by the news fetcher and the yfinance helpers
+policy = IOPolicy()
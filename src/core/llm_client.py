@@ -0,0 +1,119 @@
+"""Process-wide registry of pooled OpenAI-compatible clients (sync and async).
+
+Every module that talks to the LLM goes through `get_client()` /
+`get_async_client()` so HTTP keep-alive connections and TLS sessions are
+reused instead of being rebuilt for each call.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DEFAULT_BASE_URL = "https://openrouter.ai/api/v1"
+
+# Pool limits and timeouts, tunable per deployment
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "10"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+
+_lock = threading.Lock()
+_sync_clients: dict[tuple[str, str], Any] = {}
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple[str, str], Any]]" = weakref.WeakKeyDictionary()
+_async_clients_no_loop: dict[tuple[str, str], Any] = {}
+
+
+def _credentials() -> tuple[str | None, str]:
+    # Only the OpenRouter key: an OpenAI key must not be sent to the OpenRouter default URL
+    api_key = os.getenv("OPENROUTER_API_KEY")
+    base_url = os.getenv("OPENAI_BASE_URL") or DEFAULT_BASE_URL
+    return api_key, base_url
+
+
+def _openai():
+    """Import openai on first use; callers already handle a missing client."""
+    try:
+        import openai
+    except Exception:
+        return None
+    return openai
+
+
+def _pool_settings(httpx) -> dict[str, Any]:
+    return {
+        "limits": httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_KEEPALIVE,
+            keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+        ),
+        "timeout": httpx.Timeout(LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+    }
+
+
+def get_client():
+    """Return the shared sync client, or None when no API key is configured."""
+    api_key, base_url = _credentials()
+    openai = _openai() if api_key else None
+    if openai is None:
+        return None
+
+    key = (api_key, base_url)
+    with _lock:
+        client = _sync_clients.get(key)
+        if client is None:
+            import httpx
+
+            http_client = httpx.Client(**_pool_settings(httpx))
+            client = openai.OpenAI(base_url=base_url, api_key=api_key, http_client=http_client)
+            _sync_clients[key] = client
+        return client
+
+
+def get_async_client():
+    """Return the shared `AsyncOpenAI` client for the running event loop.
+
+    Async connection pools are bound to the loop that created them, so one
+    client is kept per loop. Returns None when no API key is configured.
+    """
+    api_key, base_url = _credentials()
+    openai = _openai() if api_key else None
+    if openai is None:
+        return None
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    key = (api_key, base_url)
+    with _lock:
+        clients = _async_clients.setdefault(loop, {}) if loop is not None else _async_clients_no_loop
+        client = clients.get(key)
+        if client is None:
+            import httpx
+
+            http_client = httpx.AsyncClient(**_pool_settings(httpx))
+            client = openai.AsyncOpenAI(base_url=base_url, api_key=api_key, http_client=http_client)
+            clients[key] = client
+        return client
+
+
+def reset_clients() -> None:
+    """Close and forget every pooled client (e.g. after credentials change)."""
+    with _lock:
+        for client in _sync_clients.values():
+            try:
+                client.close()
+            except Exception:
+                pass
+        _sync_clients.clear()
+        _async_clients.clear()
+        _async_clients_no_loop.clear()
@@ -0,0 +1,128 @@
+"""Run blocking calls from async request handlers without stalling the event loop.
+
+Most of the pipeline is synchronous (yfinance, requests, psycopg, spaCy,
+the news summarizer), so async handlers hand those calls to a shared
+thread pool through `run(dependency, fn, ...)`. Each dependency has its own
+concurrency limit: calls beyond it wait on the event loop (holding no
+thread), so a burst of slow quote lookups cannot use up the threads the
+database or the LLM need. The pool has one thread per permitted call,
+which means a dependency at its limit never delays another one.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+# Concurrent blocking calls allowed per dependency
+DEPENDENCY_LIMITS = {
+    "yfinance": int(os.getenv("YF_CONCURRENCY", "8")),
+    "news": int(os.getenv("NEWS_CONCURRENCY", "4")),
+    "llm": int(os.getenv("LLM_CONCURRENCY", "8")),
+    "db": int(os.getenv("DB_CONCURRENCY", "4")),
+    "nlp": int(os.getenv("NLP_CONCURRENCY", "2")),
+    # Local SQLite caches and stores
+    "local": int(os.getenv("LOCAL_IO_CONCURRENCY", "4")),
+}
+
+_COUNTERS = ("calls", "active", "waiting", "peak_active")
+
+
+class Offloader:
+    """Thread pool plus one semaphore per dependency (per event loop, as asyncio requires)."""
+
+    def __init__(self, limits: dict[str, int] | None = None) -> None:
+        self.limits = dict(DEPENDENCY_LIMITS if limits is None else limits)
+        self._pool: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._counters = {name: dict.fromkeys(_COUNTERS, 0) for name in self.limits}
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                workers = max(1, sum(self.limits.values()))
+                self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="offload")
+            return self._pool
+
+    def _semaphore(self, dependency: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphores = self._semaphores.setdefault(loop, {})
+            semaphore = semaphores.get(dependency)
+            if semaphore is None:
+                semaphore = semaphores[dependency] = asyncio.Semaphore(max(1, self.limits[dependency]))
+            return semaphore
+
+    def _count(self, dependency: str, **deltas: int) -> None:
+        with self._lock:
+            counters = self._counters[dependency]
+            for name, delta in deltas.items():
+                counters[name] += delta
+            counters["peak_active"] = max(counters["peak_active"], counters["active"])
+
+    async def run(self, dependency: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Await `fn(*args, **kwargs)` on the pool once `dependency` has a free slot.
+
+        The slot is held until the call actually finishes, even when the
+        awaiting request is cancelled, so the limit holds for threads too.
+        """
+        if dependency not in self.limits:
+            raise KeyError(f"Unknown dependency {dependency!r}; expected one of {', '.join(self.limits)}")
+        semaphore = self._semaphore(dependency)
+        self._count(dependency, calls=1, waiting=1)
+        try:
+            await semaphore.acquire()
+        finally:
+            self._count(dependency, waiting=-1)
+
+        loop = asyncio.get_running_loop()
+
+        def release(_future) -> None:
+            self._count(dependency, active=-1)
+            try:
+                loop.call_soon_threadsafe(semaphore.release)
+            except RuntimeError:
+                pass  # the loop (and its semaphores) are gone
+
+        self._count(dependency, active=1)
+        try:
+            future = self._executor().submit(functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            self._count(dependency, active=-1)
+            semaphore.release()
+            raise
+        future.add_done_callback(release)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict:
+        """Limit and call counters per dependency."""
+        with self._lock:
+            return {
+                "namespace": "offload",
+                "dependencies": {
+                    name: {"limit": self.limits[name], **counters} for name, counters in self._counters.items()
+                },
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+offloader = Offloader()
+
+
+async def run(dependency: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking call for `dependency` ("yfinance", "news", "llm", "db", "nlp", "local") off the event loop."""
+    return await offloader.run(dependency, fn, *args, **kwargs)
@@ -1,11 +1,22 @@
+import inspect
 import json
+import re
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from src.core.cache import DEFAULT_CACHE_DIR, TwoTierCache, make_key
 from src.core.db import save_stock_snapshot
+from src.core.llm_client import get_async_client, get_client
+from src.core.stage_dag import Stage, run_stages
 from src.modules.extract_company_name import extract_company_name
-from src.modules.news_fetcher import get_news_content
-from src.modules.stock_info_formatter import get_stock_info
-from openai import OpenAI
+from src.modules.extract_company_name import warm_up as warm_up_extractor
+from src.modules.near_duplicates import drop_near_duplicates, is_near_duplicate
+from src.modules.news_fetcher import get_news_content, iter_news_content
+from src.modules.relevance import NEWS_TOP_K, is_relevant, select_articles
+from src.modules import indicators, quote_service
+from src.modules.stock_info_formatter import get_stock_info, snapshot_from_info
+from src.modules.text_chunker import CHARS_PER_TOKEN, approx_token_count, iter_chunks, pack_texts
+from src.modules.ticker_resolver import remember_ticker, resolve_ticker
 import os
-import yfinance as yf
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -18,6 +29,34 @@ load_dotenv()
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
 OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")
 
+# Upper bound on in-flight summarization calls; 1 restores the serial behaviour
+SUMMARY_MAX_WORKERS = int(os.getenv("SUMMARY_MAX_WORKERS", "8"))
+
+# Token budget per summarization chunk (~1500 characters of English prose)
+SUMMARY_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", "375"))
+
+SUMMARY_MODEL = "x-ai/grok-4.1-fast"
+# Bump whenever the summarization prompt changes so stale cache entries are ignored
+SUMMARY_PROMPT_VERSION = "1"
+SUMMARY_BATCH_PROMPT_VERSION = "batch-1"
+
+# "concurrent" summarizes each chunk separately; "batch" sends several articles per request;
+# "stream" starts summarizing each article as soon as it is downloaded
+SUMMARY_MODE = os.getenv("SUMMARY_MODE", "concurrent")
+# Token budget for the articles packed into one batch request
+SUMMARY_BATCH_TOKENS = int(os.getenv("SUMMARY_BATCH_TOKENS", "12000"))
+
+# Articles fetched per query; near-duplicates are collapsed before the top 5 are summarized
+NEWS_CANDIDATES = int(os.getenv("NEWS_CANDIDATES", "10"))
+
+# Summaries are shared across users, restarts and uvicorn workers
+summary_cache = TwoTierCache(
+    namespace="summaries",
+    path=os.getenv("SUMMARY_CACHE_PATH", str(DEFAULT_CACHE_DIR / "summaries.sqlite3")) or None,
+    ttl_seconds=float(os.getenv("SUMMARY_CACHE_TTL", str(7 * 24 * 3600))),
+    max_memory_bytes=int(os.getenv("SUMMARY_CACHE_MAX_BYTES", str(16 * 1024 * 1024))),
+)
+
 # Initialize summarizer
 def load_summarizer():
     """Load the summarization model."""
@@ -26,21 +65,23 @@ def load_summarizer():
     return None
 
 def get_openai_client():
-    """Return an OpenAI client configured with hardcoded API key (temporary).
+    """Return the shared, connection-pooled OpenAI client.
 
     Returns None when no API key is available.
     """
-    api_key = OPENROUTER_API_KEY
-    if not api_key:
-        return None
-    base_url = OPENAI_BASE_URL
-    return OpenAI(base_url=base_url, api_key=api_key)
+    return get_client()
 
 def summarize_with_grok(text: str, company_name: str | None = None) -> str:
     """Summarize `text` using the Grok model via the OpenAI client.
 
     Returns a summary string with detailed bullet points. On failure returns an explanatory message.
+    Successful summaries are cached by (text, company, model, prompt version).
     """
+    cache_key = make_key(text, company_name, SUMMARY_MODEL, SUMMARY_PROMPT_VERSION)
+    cached = summary_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
         client = get_openai_client()
         if client is None:
@@ -56,13 +97,16 @@ def summarize_with_grok(text: str, company_name: str | None = None) -> str:
         )
 
         response = client.chat.completions.create(
-            model="x-ai/grok-4.1-fast",
+            model=SUMMARY_MODEL,
             messages=[{"role": "user", "content": prompt}],
             max_tokens=800,
         )
 
         content = getattr(response.choices[0].message, 'content', None)
-        return content if isinstance(content, str) and content.strip() else "[No summary returned]"
+        if not (isinstance(content, str) and content.strip()):
+            return "[No summary returned]"
+        summary_cache.set(cache_key, content)
+        return content
     except Exception as e:
         return f"[Summary failed: {e}]"
 
@@ -78,64 +122,348 @@ def safe_summarize(summarizer, text, max_chars=1500):
     except Exception as e:
         return f"[Summary failed: {e}]"
 
-def chunk_text(text, max_chars=1500):
-    """Split text into chunks for summarization."""
-    chunks = []
-    words = text.split()
-    current = []
+def chunk_text(text, max_chars=None, max_tokens=None, count_tokens=approx_token_count):
+    """Split text into token-budgeted chunks for summarization.
 
-    for w in words:
-        if sum(len(x) for x in current) + len(w) + len(current) > max_chars:
-            chunks.append(" ".join(current))
-            current = []
-        current.append(w)
+    The budget defaults to SUMMARY_CHUNK_TOKENS. `max_chars` keeps its old
+    meaning and is converted at CHARS_PER_TOKEN; `max_tokens` sets tokens directly.
+    """
+    if max_tokens is not None:
+        budget = max_tokens
+    elif max_chars is not None:
+        budget = max(1, max_chars // CHARS_PER_TOKEN)
+    else:
+        budget = SUMMARY_CHUNK_TOKENS
+    return list(iter_chunks(text, budget, count_tokens))
+
+def _needs_reduce(combined):
+    """Only combined chunk summaries of meaningful length get a reduce pass."""
+    return len(combined) > 100
+
+def summarize_article(article_text):
+    """Summarize one article serially: every chunk, then a reduce pass."""
+    partial = [safe_summarize(None, c) for c in chunk_text(article_text)]
+    combined = " ".join([p for p in partial if p])
+    return safe_summarize(None, combined) if _needs_reduce(combined) else combined
+
+def _notify(on_summary, idx, summary):
+    """Report a finished summary to an optional progress callback."""
+    if on_summary is not None:
+        try:
+            on_summary(idx, summary)
+        except Exception as e:
+            print(f"[WARNING] Summary callback failed: {e}")
+
+def summarize_articles(articles, max_workers=None, on_summary=None, stop=None):
+    """Summarize `articles` concurrently and return summaries in input order.
+
+    Chunk calls for every article are fanned out on one shared pool capped at
+    `max_workers` (default SUMMARY_MAX_WORKERS); each article's reduce call is
+    submitted as soon as its own chunks have finished. `on_summary(idx, text)`
+    is called as each article completes. Once the `stop` event is set, calls
+    not yet started are dropped and unfinished summaries stay empty.
+    """
+    max_workers = SUMMARY_MAX_WORKERS if max_workers is None else max_workers
+    if max_workers <= 1 or not articles:
+        summaries = []
+        for idx, article_text in enumerate(articles):
+            if stop is not None and stop.is_set():
+                break
+            print(f"  - Summarizing article {idx + 1}/{len(articles)}...")
+            summaries.append(summarize_article(article_text))
+            _notify(on_summary, idx, summaries[-1])
+        return summaries
 
+    print(f"  - Summarizing {len(articles)} articles concurrently (max {max_workers} calls in flight)...")
+    summaries = [""] * len(articles)
+    partials = [chunk_text(text) for text in articles]
+    remaining = [len(chunks) for chunks in partials]
+    for idx, count in enumerate(remaining):
+        if count == 0:
+            _notify(on_summary, idx, "")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = {}
+        for idx, chunks in enumerate(partials):
+            for pos, chunk in enumerate(chunks):
+                pending[pool.submit(safe_summarize, None, chunk)] = ("chunk", idx, pos)
+
+        while pending:
+            if stop is not None and stop.is_set():
+                for future in pending:
+                    future.cancel()
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                kind, idx, pos = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = f"[Summary failed: {e}]"
+
+                if kind == "reduce":
+                    summaries[idx] = result
+                    _notify(on_summary, idx, result)
+                    continue
+
+                partials[idx][pos] = result
+                remaining[idx] -= 1
+                if remaining[idx] == 0:
+                    combined = " ".join([p for p in partials[idx] if p])
+                    if _needs_reduce(combined):
+                        pending[pool.submit(safe_summarize, None, combined)] = ("reduce", idx, None)
+                    else:
+                        summaries[idx] = combined
+                        _notify(on_summary, idx, combined)
+
+    return summaries
+
+def _parse_batch_summaries(raw, ids):
+    """Map article IDs to summaries from a batch response, dropping invalid entries."""
+    text = (raw or "").strip()
+    fenced = re.match(r"^```(?:json)?\s*(.*?)\s*```$", text, re.S)
+    if fenced:
+        text = fenced.group(1)
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return {}
+
+    items = data.get("summaries") if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        return {}
+
+    parsed = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        article_id = str(item.get("id", "")).strip()
+        summary = item.get("summary")
+        if article_id in ids and article_id not in parsed and isinstance(summary, str) and summary.strip():
+            parsed[article_id] = summary.strip()
+    return parsed
+
+def summarize_batch_with_grok(articles, company_name=None):
+    """Summarize several articles in one structured JSON request.
+
+    Returns one entry per article: the summary, or None when the model's
+    answer for that article was missing or did not validate.
+    """
+    results = [None] * len(articles)
+    keys = [make_key(text, company_name, SUMMARY_MODEL, SUMMARY_BATCH_PROMPT_VERSION) for text in articles]
+    todo = []
+    for idx, key in enumerate(keys):
+        cached = summary_cache.get(key)
+        if cached is not None:
+            results[idx] = cached
+        else:
+            todo.append(idx)
+    if not todo:
+        return results
+
+    client = get_openai_client()
+    if client is None:
+        return results
+
+    ids = {str(n): idx for n, idx in enumerate(todo, start=1)}
+    prompt_company = f" about {company_name}" if company_name else ""
+    body = "\n\n".join(f'<article id="{n}">\n{articles[idx]}\n</article>' for n, idx in ids.items())
+    prompt = (
+        f"You are a professional news summarizer. Summarize each of the following news articles{prompt_company}"
+        " separately in 4-6 detailed bullet points (300-400 words per article). Focus on key facts, developments,"
+        " and impact. Use proper bullet formatting with clear line breaks between points. Keep it factual and neutral.\n"
+        'Respond ONLY with JSON of the form {"summaries": [{"id": "<article id>", "summary": "<bullets>"}]}'
+        " containing exactly one entry per article id.\n\n"
+        f"{body}"
+    )
 
-    if current:
-        chunks.append(" ".join(current))
+    try:
+        response = client.chat.completions.create(
+            model=SUMMARY_MODEL,
+            messages=[
+                {"role": "system", "content": "Strict JSON only. No text."},
+                {"role": "user", "content": prompt},
+            ],
+            max_tokens=min(800 * len(todo), 8000),
+            response_format={"type": "json_object"},
+        )
+        raw = getattr(response.choices[0].message, "content", "") or ""
+    except Exception as e:
+        print(f"[NEWS] Batch summarization failed: {e}")
+        return results
+
+    for article_id, summary in _parse_batch_summaries(raw, ids).items():
+        idx = ids[article_id]
+        results[idx] = summary
+        summary_cache.set(keys[idx], summary)
+    return results
+
+def summarize_articles_batched(articles, company_name=None, max_tokens=None, max_workers=None, on_summary=None,
+                               stop=None):
+    """Summarize `articles` with as few LLM requests as possible, preserving order.
+
+    Articles that fit the SUMMARY_BATCH_TOKENS budget are packed into shared
+    batch requests; oversized articles and any entry that failed to parse fall
+    back to the per-article path.
+    """
+    budget = SUMMARY_BATCH_TOKENS if max_tokens is None else max_tokens
+    max_workers = SUMMARY_MAX_WORKERS if max_workers is None else max_workers
+    summaries = [None] * len(articles)
+
+    small = [idx for idx, text in enumerate(articles) if approx_token_count(text) <= budget]
+    batches = list(pack_texts([articles[idx] for idx in small], budget))
+    if batches:
+        print(f"  - Summarizing {len(small)} articles in {len(batches)} batch request(s)...")
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches)))) as pool:
+            futures = [pool.submit(summarize_batch_with_grok, [text for _, text in batch], company_name) for batch in batches]
+            for batch, future in zip(batches, futures):
+                for (pos, _), summary in zip(batch, future.result()):
+                    summaries[small[pos]] = summary
+                    if summary is not None:
+                        _notify(on_summary, small[pos], summary)
+
+    fallback = [idx for idx, summary in enumerate(summaries) if summary is None]
+    if fallback and not (stop is not None and stop.is_set()):
+        print(f"  - Falling back to per-article summarization for {len(fallback)} article(s)...")
+        remaining = summarize_articles(
+            [articles[i] for i in fallback],
+            max_workers,
+            on_summary=lambda pos, summary: _notify(on_summary, fallback[pos], summary),
+            stop=stop,
+        )
+        for idx, summary in zip(fallback, remaining):
+            summaries[idx] = summary
+    return summaries
 
-    return chunks
+def _summarize_async(pool, text, on_done):
+    """Submit one article's chunk calls to `pool` and call `on_done(summary)` when it is summarized.
 
-def fetch_news(company_name):
-    """Fetch and summarize news articles about the company."""
+    The reduce call is submitted from the last chunk's completion callback,
+    so the caller never blocks on this article.
+    """
+    chunks = chunk_text(text)
+    if not chunks:
+        on_done("")
+        return
+    partial = [""] * len(chunks)
+    remaining = [len(chunks)]
+    lock = threading.Lock()
+
+    def result_of(future):
+        try:
+            return future.result()
+        except Exception as e:
+            return f"[Summary failed: {e}]"
+
+    def chunk_done(pos, future):
+        with lock:
+            partial[pos] = result_of(future)
+            remaining[0] -= 1
+            if remaining[0]:
+                return
+        combined = " ".join([p for p in partial if p])
+        if _needs_reduce(combined):
+            pool.submit(safe_summarize, None, combined).add_done_callback(lambda f: on_done(result_of(f)))
+        else:
+            on_done(combined)
+
+    for pos, chunk in enumerate(chunks):
+        pool.submit(safe_summarize, None, chunk).add_done_callback(lambda f, pos=pos: chunk_done(pos, f))
+
+def fetch_news_streaming(company_name, on_summary=None, k=None, max_workers=None, buffer=None, stop=None):
+    """Fetch and summarize news with downloading and summarizing overlapped.
+
+    Each article is summarized as soon as it arrives, so total latency is
+    close to the slower of the two stages rather than their sum. Articles
+    that do not mention the company (name, alias or ticker) or nearly repeat
+    an earlier one are skipped, and the download is cancelled once `k`
+    (default NEWS_TOP_K) articles are being summarized; if none mention the
+    company, the first `k` that arrived are summarized instead. At most
+    `buffer` downloaded articles wait for the summarizer. Summaries are
+    returned in arrival order. Setting `stop` ends the download; articles
+    already being summarized still finish.
+    """
+    k = NEWS_TOP_K if k is None else k
+    max_workers = SUMMARY_MAX_WORKERS if max_workers is None else max_workers
+    accepted, others = [], []
+    summaries = []
+    outstanding = [0]
+    finished = threading.Condition()
+
+    def submit(pool, text):
+        idx = len(summaries)
+        summaries.append("")
+        with finished:
+            outstanding[0] += 1
+
+        def on_done(summary):
+            summaries[idx] = summary
+            _notify(on_summary, idx, summary)
+            with finished:
+                outstanding[0] -= 1
+                finished.notify_all()
+
+        print(f"  - Summarizing article {idx + 1} while the rest download...")
+        _summarize_async(pool, text, on_done)
+
+    news = iter_news_content(company_name, max_articles=NEWS_CANDIDATES, buffer=buffer)
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        try:
+            for text in news:
+                if stop is not None and stop.is_set():
+                    break
+                if is_near_duplicate(text, accepted + others):
+                    continue
+                if not is_relevant(text, company_name):
+                    others.append(text)
+                    continue
+                accepted.append(text)
+                submit(pool, text)
+                if len(accepted) >= k:
+                    break
+        finally:
+            news.close()
+        if not accepted and not (stop is not None and stop.is_set()):
+            for text in others[:k]:
+                submit(pool, text)
+        # Reduce calls are submitted from callbacks, so wait before the pool shuts down
+        with finished:
+            finished.wait_for(lambda: outstanding[0] == 0)
+
+    print(f"[NEWS] Summarized {len(summaries)} article(s) as they arrived.")
+    return summaries
+
+def fetch_news(company_name, on_summary=None, stop=None):
+    """Fetch and summarize news articles about the company.
+
+    `on_summary(idx, summary)` is called as each article's summary is ready.
+    Setting the `stop` event (e.g. when the client has gone away) stops
+    further summarization calls.
+    """
     print(f"\n[FETCHING NEWS] Searching for news about {company_name}...")
     try:
-        contents = get_news_content(company_name)
+        if SUMMARY_MODE == "stream":
+            return fetch_news_streaming(company_name, on_summary=on_summary, stop=stop)
+
+        contents = get_news_content(company_name, max_articles=NEWS_CANDIDATES)
         
         if not contents:
             print("[NEWS] No articles found.")
             return []
-        # Prefer articles that explicitly mention the company name (case-insensitive)
-        company_lower = (company_name or "").lower()
-        filtered = [c for c in contents if c and company_lower in c.lower()]
-
-        if filtered:
-            selected = filtered[:5]
-            print(f"[NEWS] Found {len(filtered)} company-specific articles; summarizing top {len(selected)}...")
-        else:
-            # Fallback: use the first few articles returned by the fetcher
-            selected = contents[:5]
-            print(f"[NEWS] No explicit company mentions found; summarizing top {len(selected)} returned articles...")
-
-        summaries = []
-        for idx, article_text in enumerate(selected, start=1):
-            print(f"  - Summarizing article {idx}/{len(selected)}...")
-            chunks = chunk_text(article_text)
-            partial = []
-
-            for c in chunks:
-                summary = safe_summarize(None, c)
-                partial.append(summary)
-
-            combined = " ".join([p for p in partial if p])
-            if len(combined) > 100:
-                final_summary = safe_summarize(None, combined)
-            else:
-                final_summary = combined
-
-            summaries.append(final_summary)
-
-        return summaries
+        if stop is not None and stop.is_set():
+            return []
+        # Collapse syndicated/updated copies of the same story before paying to summarize them
+        unique = drop_near_duplicates(contents)
+        if len(unique) < len(contents):
+            print(f"[NEWS] Dropped {len(contents) - len(unique)} near-duplicate article(s).")
+        contents = unique
+        # Rank candidates by BM25 against the company name, ticker and aliases
+        selected = select_articles(contents, company_name)
+        print(f"[NEWS] Summarizing the {len(selected)} most relevant of {len(contents)} articles...")
+
+        if SUMMARY_MODE == "batch":
+            return summarize_articles_batched(selected, company_name, on_summary=on_summary, stop=stop)
+        return summarize_articles(selected, on_summary=on_summary, stop=stop)
     except Exception as e:
         print(f"[ERROR] Error fetching news: {e}")
         return []
@@ -144,39 +472,22 @@ def fetch_news(company_name):
 def fetch_stock_info(company_name):
     print(f"[FETCHING STOCK INFO] Query received: {company_name}")
 
-    # Step 1: Ask LLM for ticker
-    ticker = get_stock_ticker(company_name)
+    # Resolve ticker (local index first, LLM only on a miss), falling back to the name
+    return fetch_stock_quote(report_ticker(company_name))
 
-    # Step 2: Validate
-    if not ticker or ticker == "NONE" or len(ticker) > 5:
-        print("[WARNING] LLM ticker seems invalid. Falling back to YFinance search.")
-        ticker = company_name
 
+def fetch_stock_quote(ticker):
+    """Snapshot (saved to the database) for an already resolved `ticker`, or None."""
     print(f"[INFO] Using ticker: {ticker}")
 
     try:
-        yf_obj = yf.Ticker(ticker)
-        info = yf_obj.info
+        info = quote_service.get_info(ticker)
 
         if not info or not info.get("symbol"):
             print(f"[WARNING] YFinance could not fetch info for {ticker}")
             return None
 
-        stock_data = {
-            "ticker": info.get('symbol', 'N/A'),
-            "longName": info.get('longName', 'N/A'),
-            "sector": info.get('sector', 'N/A'),
-            "industry": info.get('industry', 'N/A'),
-            "currentPrice": info.get('currentPrice', 'N/A'),
-            "marketCap": info.get('marketCap', 'N/A'),
-            "trailingPE": info.get('trailingPE', 'N/A'),
-            "dividendYield": info.get('dividendYield', 'N/A'),
-            "52WeekHigh": info.get('fiftyTwoWeekHigh', 'N/A'),
-            "52WeekLow": info.get('fiftyTwoWeekLow', 'N/A'),
-            "totalRevenue": info.get('totalRevenue', 'N/A'),
-            "freeCashflow": info.get('freeCashflow', 'N/A'),
-            "website": info.get('website', 'N/A'),
-        }
+        stock_data = snapshot_from_info(info)
 
         print("[STOCK] Data retrieved successfully.")
         save_stock_snapshot(stock_data)
@@ -230,46 +541,55 @@ def fetch_stock_info(company_name):
 #         print(f"[ERROR] Error fetching stock info: {e}")
 #         return None
 
-def aggregate_information(company_name, news_summaries, stock_info):
-    """Aggregate all information into a structured report."""
+def fetch_indicators(ticker):
+    """Technical indicators for `ticker` from its cached price history ({} when unavailable)."""
+    if not ticker or ticker == "N/A":
+        return {}
+    try:
+        return indicators.indicators_for([ticker]).get(ticker.strip().upper(), {})
+    except Exception as e:
+        print(f"[WARNING] Could not compute indicators for {ticker}: {e}")
+        return {}
+
+
+def aggregate_information(company_name, news_summaries, stock_info, technical_indicators=None):
+    """Aggregate all information into a structured report.
+
+    Indicators are computed from the stock's ticker unless already given.
+    """
     print("\n[AGGREGATING] Combining all information...")
+    if technical_indicators is None:
+        technical_indicators = fetch_indicators(stock_info.get("ticker") if isinstance(stock_info, dict) else None)
     
     report = {
         "company_name": company_name,
         "stock_information": stock_info,
+        "technical_indicators": technical_indicators,
         "news_summaries": news_summaries,
         "timestamp": datetime.now().isoformat()
     }
     
     return report
 
-def generate_detailed_report(company_name, report):
-    """Generate a detailed report using OpenAI API."""
-    print("\n[GENERATING REPORT] Creating detailed analysis with AI...")
-    
-    try:
-        # Use hardcoded API key (temporary)
-        api_key = OPENROUTER_API_KEY
-        if not api_key:
-            msg = "OpenAI API key not found. Please set OPENROUTER_API_KEY."
-            print(f"[ERROR] {msg}")
-            return f"Unable to generate detailed report: {msg}"
+def build_report_prompt(company_name, report):
+    """Build the analyst prompt for the detailed report."""
+    stock_info = report.get("stock_information", {})
+    news = report.get("news_summaries", [])
 
-        client = OpenAI(base_url=OPENAI_BASE_URL, api_key=api_key)
-        
-        # Prepare the prompt
-        stock_info = report.get("stock_information", {})
-        news = report.get("news_summaries", [])
-        
-        stock_summary = "\n".join([f"- {k}: {v}" for k, v in stock_info.items()]) if stock_info else "No stock data available"
-        news_summary = "\n".join([f"- Article {i+1}: {news[i][:200]}..." for i, _ in enumerate(news[:5])]) if news else "No news data available"
-        
-        prompt = f"""
+    stock_summary = "\n".join([f"- {k}: {v}" for k, v in stock_info.items()]) if stock_info else "No stock data available"
+    technicals = {k: v for k, v in (report.get("technical_indicators") or {}).items() if v is not None}
+    technical_summary = "\n".join([f"- {k}: {v}" for k, v in technicals.items()]) if technicals else "No price history available"
+    news_summary = "\n".join([f"- Article {i+1}: {news[i][:200]}..." for i, _ in enumerate(news[:5])]) if news else "No news data available"
+
+    return f"""
 You are a financial analyst. Create a comprehensive report about {company_name} based on the following data:
 
 STOCK INFORMATION:
 {stock_summary}
 
+TECHNICAL INDICATORS (returns, volatility and drawdowns are fractions; volatility is annualized):
+{technical_summary}
+
 RECENT NEWS SUMMARIES:
 {news_summary}
 
@@ -283,6 +603,24 @@ Please provide:
 
 Format the report professionally with clear sections and actionable insights.
 """
+
+def _report_content(response):
+    content = getattr(response.choices[0].message, 'content', None)
+    return content if isinstance(content, str) and content.strip() else "[No detailed report returned]"
+
+
+def generate_detailed_report(company_name, report):
+    """Generate a detailed report using OpenAI API."""
+    print("\n[GENERATING REPORT] Creating detailed analysis with AI...")
+    
+    try:
+        client = get_openai_client()
+        if client is None:
+            msg = "OpenAI API key not found. Please set OPENROUTER_API_KEY."
+            print(f"[ERROR] {msg}")
+            return f"Unable to generate detailed report: {msg}"
+        
+        prompt = build_report_prompt(company_name, report)
         
         response = client.chat.completions.create(
             model="x-ai/grok-4.1-fast",
@@ -294,8 +632,7 @@ Format the report professionally with clear sections and actionable insights.
             ]
         )
         
-        detailed_content = getattr(response.choices[0].message, 'content', None)
-        detailed_report = detailed_content if isinstance(detailed_content, str) and detailed_content.strip() else "[No detailed report returned]"
+        detailed_report = _report_content(response)
         print("[REPORT] Detailed report generated successfully.")
         return detailed_report
     
@@ -303,11 +640,83 @@ Format the report professionally with clear sections and actionable insights.
         print(f"[ERROR] Error generating detailed report: {e}")
         return f"Unable to generate detailed report: {e}"
 
+
+async def agenerate_detailed_report(company_name, report):
+    """`generate_detailed_report` on the pooled async client, for use inside the event loop."""
+    print("\n[GENERATING REPORT] Creating detailed analysis with AI (async)...")
+    client = get_async_client()
+    if client is None:
+        msg = "OpenAI API key not found. Please set OPENROUTER_API_KEY."
+        print(f"[ERROR] {msg}")
+        return f"Unable to generate detailed report: {msg}"
+    try:
+        response = await client.chat.completions.create(
+            model="x-ai/grok-4.1-fast",
+            messages=[{"role": "user", "content": build_report_prompt(company_name, report)}],
+        )
+        print("[REPORT] Detailed report generated successfully.")
+        return _report_content(response)
+    except Exception as e:
+        print(f"[ERROR] Error generating detailed report: {e}")
+        return f"Unable to generate detailed report: {e}"
+
+def stream_detailed_report(company_name, report):
+    """Yield the detailed report incrementally as the LLM streams tokens.
+
+    Error messages are yielded as a single piece, like the non-streaming
+    variant returns them.
+    """
+    print("\n[GENERATING REPORT] Streaming detailed analysis with AI...")
+    client = get_openai_client()
+    if client is None:
+        yield "Unable to generate detailed report: OpenAI API key not found. Please set OPENROUTER_API_KEY."
+        return
+
+    produced = False
+    try:
+        stream = client.chat.completions.create(
+            model="x-ai/grok-4.1-fast",
+            messages=[{"role": "user", "content": build_report_prompt(company_name, report)}],
+            stream=True,
+        )
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = getattr(chunk.choices[0].delta, "content", None)
+            if delta:
+                produced = True
+                yield delta
+    except Exception as e:
+        print(f"[ERROR] Error streaming detailed report: {e}")
+        yield f"\n\nUnable to generate detailed report: {e}"
+        return
+
+    if not produced:
+        yield "[No detailed report returned]"
+    print("[REPORT] Detailed report streamed successfully.")
+
 def get_stock_ticker(company_name: str) -> str:
+    """Resolve `company_name` to a ticker symbol.
+
+    The bundled symbol table (and tickers learned earlier) answer most lookups
+    locally; the LLM is asked only on a miss and its answer is remembered.
+    A fuzzy match is only a candidate: the LLM has the final say, and the
+    candidate is used as is only when no LLM client is configured.
+    """
+    match = resolve_ticker(company_name)
+    if match is not None and match.tier != "fuzzy":
+        print(f"[TICKER] Resolved '{company_name}' -> {match.symbol} ({match.tier})")
+        return match.symbol
+
     try:
         client = get_openai_client()
         if client is None:
+            if match is not None:
+                print(f"[TICKER] Unconfirmed fuzzy match '{company_name}' -> {match.symbol} (score {match.score})")
+                return match.symbol
             return "[Ticker unavailable: OPENROUTER_API_KEY not set]"
+        if match is not None:
+            print(f"[TICKER] Fuzzy candidate '{company_name}' -> {match.symbol}; asking the LLM to confirm")
 
         prompt = (
             f"Return ONLY the official stock ticker symbol for the company '{company_name}'. "
@@ -328,39 +737,104 @@ def get_stock_ticker(company_name: str) -> str:
         raw = getattr(response.choices[0].message, "content", "") or ""
         raw = raw.strip()
 
-        import json
-        ticker = json.loads(raw).get("ticker", "NONE")
-        return ticker.upper()
+        ticker = json.loads(raw).get("ticker", "NONE").upper()
+        if ticker != "NONE":
+            remember_ticker(company_name, ticker)
+        return ticker
 
     except Exception as e:
         return f"[Ticker lookup failed: {e}]"
 
-def run_pipeline(query):
-    
+def report_ticker(company_name):
+    """`get_stock_ticker`, or `company_name` itself when the answer is not a plausible symbol."""
+    ticker = get_stock_ticker(company_name)
+    if not ticker or ticker == "NONE" or len(ticker) > 5:
+        print("[WARNING] LLM ticker seems invalid. Falling back to YFinance search.")
+        return company_name
+    return ticker
+
+
+class CompanyNotFound(ValueError):
+    """The query does not mention a company the pipeline can report on."""
+
+
+def _extract_stage(query):
     company = extract_company_name(query)
-    
     if not company:
-        print("[ERROR] Could not extract company name from query.")
-        return
-    
+        raise CompanyNotFound("Could not extract company name from query")
     print(f"[SUCCESS] Detected company: {company}")
+    return company
+
+
+def report_stages(on_summary=None, report=None, stop=None):
+    """The report pipeline as a stage DAG, from the `query` input to the finished `report`.
+
+    Once the company is known, news and the ticker lookup run side by side,
+    and once the ticker is known so do the quote and the indicators;
+    aggregation waits for all of them. `report` replaces
+    `generate_detailed_report` (a coroutine function is awaited by
+    `arun_stages`); `stop` is handed to `fetch_news`.
+    """
+    def news(company):
+        options = {"on_summary": on_summary, "stop": stop}
+        return fetch_news(company, **{name: value for name, value in options.items() if value is not None})
+
+    report = report or generate_detailed_report
+    if inspect.iscoroutinefunction(report):
+        async def write_report(company, aggregate):
+            return await report(company, aggregate)
+    else:
+        def write_report(company, aggregate):
+            return report(company, aggregate)
+
+    return [
+        Stage("company", _extract_stage, ("query",), "nlp"),
+        Stage("news", news, ("company",), "news", fallback=[]),
+        Stage("ticker", lambda company: report_ticker(company), ("company",), "llm"),
+        Stage("stock", lambda ticker: fetch_stock_quote(ticker), ("ticker",), "yfinance", fallback=None),
+        Stage("indicators", lambda ticker: fetch_indicators(ticker), ("ticker",), "yfinance", fallback={}),
+        Stage(
+            "aggregate",
+            lambda company, news, stock, indicators: aggregate_information(company, news, stock, indicators),
+            ("company", "news", "stock", "indicators"),
+        ),
+        Stage("report", write_report, ("company", "aggregate"), "llm"),
+    ]
+
+
+def warm_up():
+    """Pay one-off import and model-loading costs before the first request.
+
+    Heavy dependencies (spaCy model, yfinance, requests/bs4, the LLM client)
+    are otherwise loaded lazily by whichever request needs them first.
+    """
+    print("[WARMUP] Loading spaCy model, symbol index and clients...")
+    warm_up_extractor()
+    resolve_ticker("Apple")
+    import yfinance  # noqa: F401
+    import requests  # noqa: F401
+    import bs4  # noqa: F401
+    get_openai_client()
+    print("[WARMUP] Done.")
+
+def run_pipeline(query):
     
-    # Step 2: Fetch news
-    news_summaries = fetch_news(company)
-    
-    ticker = get_stock_ticker(company)
-    print(f"[INFO] Detected ticker symbol: {ticker}")
-    
-    # Step 3: Fetch stock information
-    stock_info = fetch_stock_info(ticker)
-    
-    # Step 4: Aggregate information
-    aggregated_report = aggregate_information(company, news_summaries, stock_info)
-    
-    # Step 5: Generate detailed report
-    detailed_report = generate_detailed_report(company, aggregated_report)
+    # Extraction, news, ticker, stock, indicators and report as a DAG:
+    # independent stages run side by side
+    try:
+        run = run_stages(report_stages(), {"query": query})
+    except CompanyNotFound:
+        print("[ERROR] Could not extract company name from query.")
+        return
+    print(run.summary())
+
+    company = run.results["company"]
+    news_summaries = run.results["news"]
+    stock_info = run.results["stock"]
+    aggregated_report = run.results["aggregate"]
+    detailed_report = run.results["report"]
     
-    # Step 6: Display results
+    # Display results
     print("\n" + "=" * 80)
     print("DETAILED ANALYSIS REPORT")
     print("=" * 80)
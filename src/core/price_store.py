@@ -0,0 +1,224 @@
+"""Local store of daily OHLCV bars keyed by (ticker, date).
+
+Price history is append-mostly: once a session has closed its bar never
+changes, so a ticker only needs the bars after its last stored date. Each
+ticker also records the earliest date its history covers and when it was
+last synced, which lets readers decide whether a requested range can be
+served without the network. Like the other caches the file runs in WAL
+mode so the web app and the ingestion command can share it.
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+CREATE_PRICE_TABLES_SQL = """
+CREATE TABLE IF NOT EXISTS price_bars (
+    ticker TEXT NOT NULL,
+    date TEXT NOT NULL,
+    open REAL,
+    high REAL,
+    low REAL,
+    close REAL NOT NULL,
+    volume REAL,
+    PRIMARY KEY (ticker, date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS price_sync (
+    ticker TEXT PRIMARY KEY,
+    covered_from TEXT NOT NULL,
+    synced_at REAL NOT NULL
+);
+"""
+
+
+class PriceBar(NamedTuple):
+    date: str  # ISO yyyy-mm-dd, the session date in the exchange's time zone
+    open: float | None
+    high: float | None
+    low: float | None
+    close: float
+    volume: float | None
+
+
+class SyncState(NamedTuple):
+    covered_from: str
+    last_date: str | None
+    synced_at: float
+
+
+class PriceStore:
+    """Daily bars per ticker, upserted incrementally.
+
+    Pass `path=None` to disable the store (nothing is kept and every ticker
+    looks unsynced).
+    """
+
+    def __init__(self, path: str | Path | None) -> None:
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._disk_ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        assert self.path is not None
+        if not self._disk_ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=10, isolation_level=None)
+        with self._lock:
+            if not self._disk_ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(CREATE_PRICE_TABLES_SQL)
+                self._disk_ready = True
+        return conn
+
+    def sync_state(self, ticker: str) -> SyncState | None:
+        """Covered range and last sync time for `ticker`, or None if never synced."""
+        if self.path is None:
+            return None
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT s.covered_from, (SELECT MAX(date) FROM price_bars WHERE ticker = s.ticker), s.synced_at "
+                    "FROM price_sync AS s WHERE s.ticker = ?",
+                    (ticker,),
+                ).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error as exc:
+            print(f"[PRICE STORE] Lookup failed: {exc}")
+            return None
+        return SyncState(*row) if row is not None else None
+
+    def sync_states(self, tickers: Iterable[str]) -> dict[str, SyncState]:
+        """`sync_state` for many tickers in one query; tickers never synced are left out."""
+        tickers = list(tickers)
+        if self.path is None or not tickers:
+            return {}
+        try:
+            conn = self._connect()
+            try:
+                placeholders = ", ".join("?" * len(tickers))
+                rows = conn.execute(
+                    "SELECT s.ticker, s.covered_from, MAX(b.date), s.synced_at "
+                    "FROM price_sync AS s LEFT JOIN price_bars AS b ON b.ticker = s.ticker "
+                    f"WHERE s.ticker IN ({placeholders}) GROUP BY s.ticker",
+                    tickers,
+                ).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as exc:
+            print(f"[PRICE STORE] Lookup failed: {exc}")
+            return {}
+        return {ticker: SyncState(*rest) for ticker, *rest in rows}
+
+    def add(self, ticker: str, bars: Iterable[PriceBar], covered_from: str, replace: bool = False) -> int:
+        """Upsert `bars` for `ticker` and mark it synced now; returns how many bars were written.
+
+        `covered_from` is the first date the fetch asked for; the ticker's
+        covered range only ever grows backwards. With `replace=True` the
+        ticker's stored bars are dropped first and the range starts over at
+        `covered_from` (for a fresh download whose prices may be adjusted
+        differently from the stored ones).
+        """
+        if self.path is None:
+            return 0
+        bars = list(bars)
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                if replace:
+                    conn.execute("DELETE FROM price_bars WHERE ticker = ?", (ticker,))
+                    conn.execute("DELETE FROM price_sync WHERE ticker = ?", (ticker,))
+                conn.executemany(
+                    "INSERT OR REPLACE INTO price_bars (ticker, date, open, high, low, close, volume) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(ticker, *bar) for bar in bars],
+                )
+                conn.execute(
+                    "INSERT INTO price_sync (ticker, covered_from, synced_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT (ticker) DO UPDATE SET synced_at = excluded.synced_at, "
+                    "covered_from = MIN(covered_from, excluded.covered_from)",
+                    (ticker, covered_from, time.time()),
+                )
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+            finally:
+                conn.close()
+        except sqlite3.Error as exc:
+            print(f"[PRICE STORE] Write failed: {exc}")
+            return 0
+        return len(bars)
+
+    def bars(self, ticker: str, start: str | None = None) -> list[PriceBar]:
+        """Stored bars for `ticker` from `start` (inclusive, ISO date) onwards, oldest first."""
+        if self.path is None:
+            return []
+        try:
+            conn = self._connect()
+            try:
+                rows = conn.execute(
+                    "SELECT date, open, high, low, close, volume FROM price_bars "
+                    "WHERE ticker = ? AND date >= ? ORDER BY date",
+                    (ticker, start or ""),
+                ).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as exc:
+            print(f"[PRICE STORE] Read failed: {exc}")
+            return []
+        return [PriceBar(*row) for row in rows]
+
+    def closes(self, tickers: Iterable[str], start: str | None = None) -> list[tuple[str, str, float]]:
+        """(ticker, date, close) rows for many tickers from `start` on, in one query, by ticker then date."""
+        tickers = list(tickers)
+        if self.path is None or not tickers:
+            return []
+        try:
+            conn = self._connect()
+            try:
+                placeholders = ", ".join("?" * len(tickers))
+                rows = conn.execute(
+                    "SELECT ticker, date, close FROM price_bars "
+                    f"WHERE ticker IN ({placeholders}) AND date >= ? ORDER BY ticker, date",
+                    [*tickers, start or ""],
+                ).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as exc:
+            print(f"[PRICE STORE] Read failed: {exc}")
+            return []
+        return rows
+
+    def clear(self) -> None:
+        if self.path is None:
+            return
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM price_bars")
+                conn.execute("DELETE FROM price_sync")
+            finally:
+                conn.close()
+        except sqlite3.Error as exc:
+            print(f"[PRICE STORE] Clear failed: {exc}")
+
+    def stats(self) -> dict[str, int | str]:
+        """Return ticker and bar counts."""
+        tickers = bars = 0
+        if self.path is not None:
+            try:
+                conn = self._connect()
+                try:
+                    tickers = conn.execute("SELECT COUNT(*) FROM price_sync").fetchone()[0]
+                    bars = conn.execute("SELECT COUNT(*) FROM price_bars").fetchone()[0]
+                finally:
+                    conn.close()
+            except sqlite3.Error as exc:
+                print(f"[PRICE STORE] Stats failed: {exc}")
+        return {"namespace": "prices", "tickers": tickers, "bars": bars}
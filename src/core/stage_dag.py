@@ -0,0 +1,223 @@
+"""Run a pipeline as a DAG of stages, each starting as soon as its inputs exist.
+
+A stage names the earlier results it needs (`deps`) and receives them as
+keyword arguments; whatever it returns becomes the result other stages
+depend on. Independent stages run concurrently, so a run takes as long as
+its slowest chain of dependencies instead of the sum of all stages. Each
+run records when every stage started and finished, and which chain of
+stages set the total (the critical path).
+
+`run_stages` runs stages on threads; `arun_stages` runs them from an event
+loop, awaiting coroutine functions directly and handing blocking ones to
+`offload.run` under the stage's `dependency` limit.
+"""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, NamedTuple, Sequence
+
+from src.core import offload
+
+_REQUIRED = object()
+
+
+class Stage(NamedTuple):
+    name: str
+    fn: Callable[..., Any]
+    deps: tuple[str, ...] = ()
+    # offload limit the stage runs under in arun_stages
+    dependency: str = "local"
+    # Result used when fn raises; without one the whole run fails
+    fallback: Any = _REQUIRED
+
+
+class StageTiming(NamedTuple):
+    name: str
+    started: float  # seconds since the run began
+    finished: float
+    error: str | None = None
+
+    @property
+    def duration(self) -> float:
+        return self.finished - self.started
+
+
+class DagRun(NamedTuple):
+    results: dict[str, Any]
+    timings: dict[str, StageTiming]
+    critical_path: list[str]
+    elapsed: float
+
+    def summary(self) -> str:
+        ordered = sorted(self.timings.values(), key=lambda t: t.started)
+        stages = ", ".join(f"{t.name} {t.duration:.2f}s" for t in ordered)
+        return f"[DAG] {self.elapsed:.2f}s total ({stages}); critical path: {' -> '.join(self.critical_path)}"
+
+
+def plan(stages: Sequence[Stage], inputs: Iterable[str] = (), targets: Iterable[str] | None = None) -> list[Stage]:
+    """The stages needed for `targets` (default: all), in dependency order.
+
+    Raises ValueError for duplicate names, unknown dependencies or cycles.
+    """
+    inputs = set(inputs)
+    by_name: dict[str, Stage] = {}
+    for stage in stages:
+        if stage.name in by_name or stage.name in inputs:
+            raise ValueError(f"Duplicate stage name {stage.name!r}")
+        by_name[stage.name] = stage
+    for stage in stages:
+        unknown = [dep for dep in stage.deps if dep not in by_name and dep not in inputs]
+        if unknown:
+            raise ValueError(f"Stage {stage.name!r} depends on unknown {', '.join(unknown)}")
+
+    ordered: list[Stage] = []
+    state: dict[str, str] = {}
+
+    def visit(name: str) -> None:
+        if name in inputs or state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise ValueError(f"Stage dependencies form a cycle through {name!r}")
+        state[name] = "visiting"
+        for dep in by_name[name].deps:
+            visit(dep)
+        state[name] = "done"
+        ordered.append(by_name[name])
+
+    for name in (by_name if targets is None else targets):
+        if name not in by_name:
+            raise ValueError(f"Unknown target stage {name!r}")
+        visit(name)
+    return ordered
+
+
+def _critical_path(order: list[Stage], timings: dict[str, StageTiming]) -> list[str]:
+    """Walk back from the last stage to finish through whichever input finished last."""
+    if not timings:
+        return []
+    by_name = {stage.name: stage for stage in order}
+    name = max(timings, key=lambda n: timings[n].finished)
+    path = [name]
+    while True:
+        deps = [dep for dep in by_name[name].deps if dep in timings]
+        if not deps:
+            return path[::-1]
+        name = max(deps, key=lambda n: timings[n].finished)
+        path.append(name)
+
+
+def _failed(stage: Stage, exc: BaseException) -> Any:
+    if stage.fallback is _REQUIRED:
+        raise exc
+    print(f"[DAG] Stage {stage.name} failed, continuing with its fallback: {exc}")
+    return stage.fallback
+
+
+def run_stages(
+    stages: Sequence[Stage],
+    inputs: dict[str, Any] | None = None,
+    targets: Iterable[str] | None = None,
+    on_stage: Callable[[StageTiming, Any], None] | None = None,
+) -> DagRun:
+    """Run `stages` on threads, each once its dependencies are done.
+
+    `on_stage(timing, result)` is called (on the calling thread) as each
+    stage finishes. A failing stage without a fallback stops new stages
+    from starting; its exception is raised once the running ones finish.
+    """
+    results = dict(inputs or {})
+    order = plan(stages, results, targets)
+    pending = {stage.name: stage for stage in order}
+    timings: dict[str, StageTiming] = {}
+    start = time.perf_counter()
+    error: BaseException | None = None
+
+    def call(stage: Stage, kwargs: dict[str, Any]) -> tuple[float, Any, BaseException | None]:
+        began = time.perf_counter() - start
+        try:
+            return began, stage.fn(**kwargs), None
+        except Exception as exc:
+            return began, None, exc
+
+    with ThreadPoolExecutor(max_workers=max(1, len(order)), thread_name_prefix="stage") as pool:
+        running: dict[Any, Stage] = {}
+        while pending or running:
+            if error is None:
+                for name, stage in list(pending.items()):
+                    if all(dep in results for dep in stage.deps):
+                        del pending[name]
+                        running[pool.submit(call, stage, {dep: results[dep] for dep in stage.deps})] = stage
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                began, value, exc = future.result()
+                timing = StageTiming(stage.name, began, time.perf_counter() - start, None if exc is None else str(exc))
+                timings[stage.name] = timing
+                if exc is not None:
+                    try:
+                        value = _failed(stage, exc)
+                    except Exception as failure:
+                        error = error or failure
+                        continue
+                results[stage.name] = value
+                if on_stage is not None:
+                    on_stage(timing, value)
+
+    if error is not None:
+        raise error
+    return DagRun(results, timings, _critical_path(order, timings), time.perf_counter() - start)
+
+
+async def arun_stages(
+    stages: Sequence[Stage],
+    inputs: dict[str, Any] | None = None,
+    targets: Iterable[str] | None = None,
+    on_stage: Callable[[StageTiming, Any], None] | None = None,
+) -> DagRun:
+    """`run_stages` for async callers: no stage ever blocks the event loop.
+
+    A failing stage without a fallback cancels the stages still waiting on
+    the loop and its exception is raised.
+    """
+    results = dict(inputs or {})
+    order = plan(stages, results, targets)
+    timings: dict[str, StageTiming] = {}
+    start = time.perf_counter()
+    finished = {stage.name: asyncio.Event() for stage in order}
+
+    async def execute(stage: Stage) -> None:
+        for dep in stage.deps:
+            if dep in finished:
+                await finished[dep].wait()
+        kwargs = {dep: results[dep] for dep in stage.deps}
+        began = time.perf_counter() - start
+        value, error = None, None
+        try:
+            if inspect.iscoroutinefunction(stage.fn):
+                value = await stage.fn(**kwargs)
+            else:
+                value = await offload.run(stage.dependency, stage.fn, **kwargs)
+        except Exception as exc:
+            error = exc
+        timing = StageTiming(stage.name, began, time.perf_counter() - start, None if error is None else str(error))
+        timings[stage.name] = timing
+        value = value if error is None else _failed(stage, error)
+        results[stage.name] = value
+        if on_stage is not None:
+            on_stage(timing, value)
+        finished[stage.name].set()
+
+    tasks = [asyncio.ensure_future(execute(stage)) for stage in order]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    return DagRun(results, timings, _critical_path(order, timings), time.perf_counter() - start)
@@ -0,0 +1,104 @@
+"""Chart payloads built from price-history frames.
+
+A payload is a dict of parallel arrays (`dates`, `close`, and with
+`ohlcv=True` also `open`/`high`/`low`/`volume`) taken straight from the
+frame's NumPy columns. Daily bars can be rolled up to weekly or monthly
+bars, and long series are thinned with Largest-Triangle-Three-Buckets
+(LTTB), which keeps the points that shape the line (peaks, troughs,
+turns), so a multi-year chart stays a few hundred points.
+
+numpy and pandas are imported inside the functions that use them.
+"""
+from __future__ import annotations
+
+import os
+
+# Default point budget for chart series; 0 sends every bar
+CHART_MAX_POINTS = int(os.getenv("CHART_MAX_POINTS", "500"))
+
+# yfinance interval name -> pandas resample rule
+INTERVALS = {"1d": None, "1wk": "W-FRI", "1mo": "ME"}
+
+
+def resample(frame, interval: str = "1d"):
+    """Roll daily bars up to `interval` ("1d", "1wk" or "1mo").
+
+    Each bar is labelled with its last trading day, so the newest bar keeps
+    today's date instead of the end of the week or month.
+    """
+    if interval not in INTERVALS:
+        raise ValueError(f"Unsupported interval {interval!r}; expected one of {', '.join(INTERVALS)}")
+    rule = INTERVALS[interval]
+    if rule is None or frame is None or frame.empty:
+        return frame
+    aggregations = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+    frame = frame.assign(_last=frame.index)
+    bars = frame.resample(rule).agg({
+        **{name: how for name, how in aggregations.items() if name in frame.columns}, "_last": "last"
+    })
+    bars = bars.dropna(subset=["Close"])
+    return bars.set_index("_last").rename_axis(frame.index.name)
+
+
+def lttb_indices(x, y, threshold: int):
+    """Indices of the `threshold` points LTTB keeps from the series (x, y).
+
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previously
+    kept point and the average of the next bucket.
+    """
+    import numpy as np
+
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.floor(np.linspace(1, n - 1, threshold - 1)).astype(int)
+    edges[-1] = n - 1
+    kept = np.empty(threshold, dtype=int)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        kept[i + 1] = a
+    return kept
+
+
+def _column(values) -> list:
+    """JSON-safe list from a float column (NaN becomes None)."""
+    import numpy as np
+
+    return np.where(np.isnan(values), None, values).tolist()
+
+
+def chart_payload(frame, interval: str = "1d", max_points: int | None = None, ohlcv: bool = False) -> dict:
+    """Columnar chart data for a history frame, resampled to `interval` and thinned to `max_points`."""
+    import numpy as np
+
+    max_points = CHART_MAX_POINTS if max_points is None else max_points
+    empty = {"dates": [], "close": []}
+    if ohlcv:
+        empty.update(open=[], high=[], low=[], volume=[])
+    if frame is None or frame.empty:
+        return {**empty, "interval": interval, "total_points": 0}
+
+    bars = resample(frame, interval).dropna(subset=["Close"])
+    close = bars["Close"].to_numpy(dtype=float)
+    if max_points and len(close) > max_points:
+        # Trading days are unevenly spaced, so LTTB works on real time, not row number
+        x = bars.index.asi8
+        keep = lttb_indices(x, close, max_points)
+    else:
+        keep = np.arange(len(close))
+
+    payload = {"dates": bars.index[keep].strftime("%Y-%m-%d").tolist(), "close": close[keep].tolist()}
+    if ohlcv:
+        for name in ("Open", "High", "Low", "Volume"):
+            values = bars[name].to_numpy(dtype=float) if name in bars.columns else np.full(len(close), np.nan)
+            payload[name.lower()] = _column(values[keep])
+    return {**payload, "interval": interval, "total_points": len(close)}
@@ -1,29 +1,57 @@
-import spacy
 import re
 import unicodedata
+import csv
 import os
-from typing import Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple, Optional
 from difflib import SequenceMatcher
 from dotenv import load_dotenv
 
 # Load environment variables (.env must be in project root)
 load_dotenv()
 
-# Optional OpenAI client for AI-backed extraction
-try:
-    from openai import OpenAI
-except Exception:
-    OpenAI = None
+# Shared, connection-pooled client for AI-backed extraction
+from src.core.llm_client import get_client
+from src.modules.ticker_resolver import GENERIC_COMPANY_WORDS, known_company_keys, normalize_company
 
-# Load spaCy
-nlp = spacy.load("en_core_web_sm")
+SPACY_MODEL = "en_core_web_sm"
+
+COMPANIES_CSV = Path(__file__).resolve().parents[2] / "data" / "companies.csv"
+
+# Local results below this confidence are double-checked with the LLM
+EXTRACTION_CONFIDENCE_THRESHOLD = float(os.getenv("EXTRACTION_CONFIDENCE_THRESHOLD", "0.75"))
+
+# Longest company name (in words) the gazetteer scan will try to match
+MAX_NAME_WORDS = 5
 
 # Ignore words that are not company names
 GARBAGE = {
     "Tell", "Give", "Show", "Provide", "Explain",
     "Me", "Info", "Information", "Details", "About",
-    "Something", "Somthing", "Please", "Some", "Aomthing"
+    "Something", "Somthing", "Please", "Some", "Aomthing",
+    # Question words and auxiliaries, capitalized only because they start the query
+    "How", "Hows", "What", "Whats", "Which", "Who", "Why", "When", "Where",
+    "Is", "Are", "Was", "Were", "Do", "Does", "Did", "Can", "Could", "Should", "Would", "Will",
+    "Has", "Have", "Had",
 }
+_GARBAGE_LOWER = {w.lower() for w in GARBAGE}
+
+# Everyday words that are also (part of) a company name: "on" (ON Semiconductor),
+# "match" (Match Group), "block" (Block Inc.). On their own they are far more
+# often plain English, so they are left out of the gazetteer.
+COMMON_WORDS = {
+    "a", "an", "and", "any", "arch", "at", "ball", "bio", "block", "ch", "crown", "fair",
+    "fifth", "for", "gen", "globe", "in", "is", "it", "jack", "las", "match", "mid", "of",
+    "on", "or", "pool", "quest", "take", "the", "to", "union", "us", "waste",
+}
+
+
+class CompanyExtraction(NamedTuple):
+    name: str
+    confidence: float
+    tier: str
+
 
 def normalize_text(text: str) -> str:
     text = text.strip()
@@ -36,20 +64,108 @@ def clean_text(s):
     s = s.replace("\xa0", " ")
     return re.sub(r"[^a-zA-Z0-9\s.&-]", "", s).strip()
 
-# NOTE: removed CSV/company-list loading for simplicity. The extractor now
-# relies on spaCy NER, capitalization heuristics, and an optional AI fallback.
+@lru_cache(maxsize=1)
+def get_nlp():
+    """Load the spaCy model on first use (None when it is not installed).
 
-def extract_company_name(query):
-    api_key = (
-        os.environ.get("OPENAI_API_KEY")
-        or os.environ.get("OPENROUTER_API_KEY")
-    )
-    base_url = os.environ.get("OPENAI_BASE_URL", "https://openrouter.ai/api/v1")
+    Loading takes most of a second, so it is deferred until a query actually
+    reaches the spaCy tier or `warm_up()` is called.
+    """
+    try:
+        import spacy
+        return spacy.load(SPACY_MODEL)
+    except Exception as exc:
+        print(f"[EXTRACT] spaCy model '{SPACY_MODEL}' unavailable ({exc}); skipping NER tier.")
+        return None
+
+@lru_cache(maxsize=1)
+def _gazetteer() -> frozenset[str]:
+    """Normalized company names from data/companies.csv plus the symbol table.
+
+    Generic words ("news", "first", "american") and everyday words ("on",
+    "match") are dropped: on their own they say nothing about which company
+    a query means.
+    """
+    names = set(known_company_keys())
+    try:
+        with open(COMPANIES_CSV, newline="", encoding="utf-8") as f:
+            counts: dict[str, int] = {}
+            for row in csv.reader(f):
+                if row:
+                    key = normalize_company(row[0])
+                    counts[key] = counts.get(key, 0) + 1
+        # Entries shared by several companies ("American", "General") are too ambiguous
+        names.update(
+            key for key, count in counts.items()
+            if count == 1 and len(key) > 1
+        )
+    except OSError as exc:
+        print(f"[EXTRACT] Could not read {COMPANIES_CSV}: {exc}")
+    return frozenset(names - GENERIC_COMPANY_WORDS - COMMON_WORDS)
 
-    if not api_key or OpenAI is None:
+def _match_gazetteer(query: str) -> Optional[CompanyExtraction]:
+    """Return the best query span that is a known company name.
+
+    Capitalized spans win over lowercase ones, then spans of more words, then
+    longer names. A single lowercase word is never confident enough on its
+    own, so the LLM gets to double-check it.
+    """
+    tokens = clean_text(re.sub(r"['’]s\b", "", query)).split()
+    all_lower = not any(ch.isupper() for ch in query)
+    gazetteer = _gazetteer()
+    best: Optional[tuple[float, int, int, str]] = None
+    for size in range(min(MAX_NAME_WORDS, len(tokens)), 0, -1):
+        for start in range(len(tokens) - size + 1):
+            span = tokens[start:start + size]
+            if span[0].lower() in _GARBAGE_LOWER or span[-1].lower() in _GARBAGE_LOWER:
+                continue
+            if normalize_company(" ".join(span)) not in gazetteer:
+                continue
+            if any(t[:1].isupper() or t[:1].isdigit() for t in span):
+                confidence = 0.95
+            elif all_lower and size > 1:
+                # Nothing in the query is capitalized, so casing tells us nothing
+                confidence = 0.8
+            elif all_lower:
+                confidence = 0.7
+            else:
+                # Lowercase words in a cased query ("match", "on") are usually plain English
+                confidence = 0.6
+            name = normalize_text(" ".join(span))
+            if best is None or (confidence, size, len(name)) > best[:3]:
+                best = (confidence, size, len(name), name)
+    if best is None:
         return None
+    return CompanyExtraction(best[3], best[0], "gazetteer")
+
+def _match_spacy(query: str) -> Optional[CompanyExtraction]:
+    """Use spaCy ORG entities, then capitalized-word heuristics."""
+    nlp = get_nlp()
+    for ent in (nlp(query).ents if nlp is not None else ()):
+        if ent.label_ == "ORG":
+            words = [w for w in clean_text(ent.text).split() if w not in GARBAGE]
+            if words:
+                return CompanyExtraction(normalize_text(" ".join(words)), 0.8, "spacy")
 
-    client = OpenAI(base_url=base_url, api_key=api_key)
+    # No entity: take the longest run of capitalized, non-filler words
+    best: list[str] = []
+    run: list[str] = []
+    for word in clean_text(query).split() + [""]:
+        if word[:1].isupper() and word not in GARBAGE:
+            run.append(word)
+            continue
+        if len(run) > len(best):
+            best = run
+        run = []
+    if best:
+        return CompanyExtraction(normalize_text(" ".join(best)), 0.5, "heuristic")
+    return None
+
+def _extract_with_llm(query: str) -> Optional[str]:
+    """The LLM's company name, "" when it says there is none, None when it gave no answer."""
+    client = get_client()
+    if client is None:
+        return None
 
     prompt = (
         "Extract the company name from the query.\n"
@@ -73,7 +189,43 @@ def extract_company_name(query):
         return None
 
     if raw.upper() == "NONE":
+        return ""
+
+    return normalize_text(raw)
+
+def extract_company(query) -> Optional[CompanyExtraction]:
+    """Extract the company from `query` with the cheapest tier that is confident.
+
+    Tiers: gazetteer match (companies.csv + symbol table), spaCy ORG entities
+    with capitalization heuristics, then the LLM only when the best local
+    confidence is below EXTRACTION_CONFIDENCE_THRESHOLD.
+    """
+    if not query or not query.strip():
         return None
 
-    name = normalize_text(raw)
-    return name if name else None
+    local = _match_gazetteer(query)
+    if local is None or local.confidence < EXTRACTION_CONFIDENCE_THRESHOLD:
+        candidate = _match_spacy(query)
+        if candidate is not None and (local is None or candidate.confidence > local.confidence):
+            local = candidate
+    if local is not None and local.confidence >= EXTRACTION_CONFIDENCE_THRESHOLD:
+        return local
+
+    name = _extract_with_llm(query)
+    if name:
+        return CompanyExtraction(name, 0.9, "llm")
+    if name is not None:
+        # The LLM says the query names no company
+        return None
+    # LLM unavailable: a weak local guess beats nothing
+    return local
+
+def warm_up():
+    """Load the spaCy model and gazetteer ahead of the first query."""
+    get_nlp()
+    _gazetteer()
+
+def extract_company_name(query):
+    """Return just the extracted company name (or None)."""
+    result = extract_company(query)
+    return result.name if result else None
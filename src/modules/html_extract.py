@@ -0,0 +1,223 @@
+"""Link and paragraph extraction with a fast backend and an exact fallback.
+
+The reference behaviour is BeautifulSoup with the pure-Python `html.parser`
+over the whole page. The fast backends only look at the tags we need:
+
+- ``lxml``: libxml2's C parser, used automatically when lxml is installed;
+- ``strainer``: `html.parser` restricted with a `SoupStrainer`.
+
+Both can build a different tree than `html.parser` on malformed markup
+(an unclosed ``<p>`` before ``</div>``, block tags inside ``<p>``, unknown
+or unterminated entities, CR line endings, duplicate ``href`` attributes)
+and on raw-text elements such as ``<title>``, ``<textarea>`` or ``<template>``.
+A cheap scan of the relevant regions detects those cases and hands the page
+to the reference path, so every backend returns exactly the same strings.
+"""
+from __future__ import annotations
+
+import os
+import re
+from functools import lru_cache
+from html.entities import name2codepoint
+from typing import Callable
+
+# auto (lxml if installed, else strainer), lxml, strainer or soup
+HTML_EXTRACT_BACKEND = os.getenv("HTML_EXTRACT_BACKEND", "auto").lower()
+
+_VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+    "param", "source", "track", "wbr",
+}
+# Inline tags whose nesting libxml2 and html.parser treat the same way inside <p>
+_INLINE_TAGS = {
+    "a", "abbr", "b", "bdi", "bdo", "cite", "code", "data", "dfn", "em", "i", "kbd",
+    "mark", "q", "s", "samp", "small", "span", "strong", "sub", "sup", "time", "u", "var",
+} | _VOID_TAGS
+_KNOWN_ENTITIES = set(name2codepoint) | {"apos"}
+_ASCII_SPACES = str.maketrans("", "", " \n\t\x0c\r")
+# Whitespace is kept verbatim inside these, which changes the string rules above
+_PRESERVE_WHITESPACE = re.compile(r"<(pre|textarea)(?=[\s/>])", re.I)
+# html.parser parses markup inside these like anywhere else; libxml2 reads their
+# content as raw text and the strainer keeps what BeautifulSoup drops from <template>.
+# Plain-text content (a page <title>) parses the same everywhere
+_RAW_CONTENT = re.compile(r"<(template|title|textarea|noscript|xmp|plaintext|iframe|noembed|noframes)(?=[\s/>])", re.I)
+
+_P_BOUNDARY = re.compile(r"<(/?)p(?=[\s/>])", re.I)
+_TAG = re.compile(r"<(/?)([a-zA-Z][a-zA-Z0-9]*)[^>]*?(/?)>|<!--.*?-->|<!|<\?", re.S)
+_REF = re.compile(r"&(#[0-9]+;|#[xX][0-9a-fA-F]+;|([a-zA-Z][a-zA-Z0-9]*)(;?))")
+_A_TAG = re.compile(r"<a(?=[\s/>])[^>]*>", re.I)
+_HREF_ATTR = re.compile(r"[\s\"'/]href\s*=", re.I)
+
+
+def _refs_safe(text: str) -> bool:
+    """True when every character reference in `text` decodes the same in both parsers."""
+    for match in _REF.finditer(text):
+        name, semicolon = match.group(2), match.group(3)
+        if name is None:
+            continue  # numeric reference
+        if not semicolon:
+            # "&copy=2" is decoded by html.parser but not by libxml2
+            if any(name.startswith(entity) for entity in _KNOWN_ENTITIES):
+                return False
+        elif name not in _KNOWN_ENTITIES:
+            return False
+    return True
+
+
+def _raw_content_safe(html: str) -> bool:
+    """True when every raw-text element is closed and holds no markup."""
+    lowered = None
+    for tag in _RAW_CONTENT.finditer(html):
+        lowered = lowered or html.lower()
+        start = html.find(">", tag.end()) + 1
+        end = lowered.find(f"</{tag.group(1).lower()}", start) if start else -1
+        if end < 0 or "<" in html[start:end]:
+            return False
+    return True
+
+
+def _paragraphs_safe(html: str) -> bool:
+    """True when every <p> is closed and contains only text and balanced inline tags."""
+    if _PRESERVE_WHITESPACE.search(html) or not _raw_content_safe(html):
+        return False
+    pos = 0
+    while True:
+        start = _P_BOUNDARY.search(html, pos)
+        if start is None:
+            return True
+        if start.group(1):
+            return False  # </p> with no open <p>
+        end = _P_BOUNDARY.search(html, start.end())
+        if end is None or not end.group(1):
+            return False  # unclosed or nested <p>
+        region = html[start.end():end.start()]
+        if "\r" in region or "\x00" in region or not _refs_safe(region):
+            return False
+        stack: list[str] = []
+        for tag in _TAG.finditer(region, region.find(">") + 1):
+            name = tag.group(2)
+            if name is None:
+                if tag.group(0) in ("<!", "<?"):
+                    return False  # CDATA, doctype or processing instruction
+                continue  # comment
+            name = name.lower()
+            if name not in _INLINE_TAGS:
+                return False
+            if tag.group(1):
+                if not stack or stack.pop() != name:
+                    return False
+            elif not tag.group(3) and name not in _VOID_TAGS:
+                stack.append(name)
+        if stack:
+            return False
+        pos = end.end()
+
+
+def _links_safe(html: str) -> bool:
+    """True when no <a> tag has duplicate hrefs, NULs or ambiguous entities."""
+    if not _raw_content_safe(html):
+        return False
+    for tag in _A_TAG.finditer(html):
+        text = tag.group(0)
+        if "\x00" in text or len(_HREF_ATTR.findall(text)) > 1:
+            return False
+        if "&" in text and not _refs_safe(text):
+            return False
+    return True
+
+
+def _soup_links(html: str) -> list[str]:
+    from bs4 import BeautifulSoup # type: ignore
+
+    soup = BeautifulSoup(html, 'html.parser')
+    return [a.get('href') for a in soup.find_all('a') if a.get('href')]
+
+
+def _soup_paragraphs(html: str) -> list[str]:
+    from bs4 import BeautifulSoup # type: ignore
+
+    soup = BeautifulSoup(html, 'html.parser')
+    return [p.get_text().strip() for p in soup.find_all('p') if p.get_text().strip()]
+
+
+def _strainer_links(html: str) -> list[str]:
+    from bs4 import BeautifulSoup, SoupStrainer # type: ignore
+
+    soup = BeautifulSoup(html, 'html.parser', parse_only=SoupStrainer('a'))
+    return [a.get('href') for a in soup.find_all('a') if a.get('href')]
+
+
+def _strainer_paragraphs(html: str) -> list[str]:
+    from bs4 import BeautifulSoup, SoupStrainer # type: ignore
+
+    soup = BeautifulSoup(html, 'html.parser', parse_only=SoupStrainer('p'))
+    return [p.get_text().strip() for p in soup.find_all('p') if p.get_text().strip()]
+
+
+def _lxml_links(html: str) -> list[str]:
+    import lxml.html # type: ignore
+
+    return [a.get('href') for a in lxml.html.document_fromstring(html).iter('a') if a.get('href')]
+
+
+def _soup_string(text: str) -> str:
+    """BeautifulSoup collapses whitespace-only strings to a single newline or space."""
+    if text.translate(_ASCII_SPACES):
+        return text
+    return "\n" if "\n" in text else " "
+
+
+def _lxml_paragraphs(html: str) -> list[str]:
+    import lxml.html # type: ignore
+
+    texts = (
+        "".join(_soup_string(text) for text in p.itertext()).strip()
+        for p in lxml.html.document_fromstring(html).iter('p')
+    )
+    return [text for text in texts if text]
+
+
+@lru_cache(maxsize=1)
+def _has_lxml() -> bool:
+    try:
+        import lxml.html # type: ignore # noqa: F401
+    except Exception:
+        return False
+    return True
+
+
+def active_backend() -> str:
+    """Name of the backend `HTML_EXTRACT_BACKEND` resolves to."""
+    if HTML_EXTRACT_BACKEND in ("soup", "strainer"):
+        return HTML_EXTRACT_BACKEND
+    if HTML_EXTRACT_BACKEND in ("auto", "lxml") and _has_lxml():
+        return "lxml"
+    return "strainer"
+
+
+_BACKENDS: dict[str, tuple[Callable[[str], list[str]], Callable[[str], list[str]]]] = {
+    "lxml": (_lxml_links, _lxml_paragraphs),
+    "strainer": (_strainer_links, _strainer_paragraphs),
+}
+
+
+def extract_links(html: str, backend: str | None = None) -> list[str]:
+    """Non-empty href values of every <a> tag, in document order."""
+    backend = backend or active_backend()
+    if backend in _BACKENDS and _links_safe(html):
+        try:
+            return _BACKENDS[backend][0](html)
+        except Exception:
+            pass  # e.g. empty document or an encoding declaration; use the reference parser
+    return _soup_links(html)
+
+
+def extract_paragraphs(html: str, backend: str | None = None) -> list[str]:
+    """Stripped, non-empty text of every <p> element, in document order."""
+    backend = backend or active_backend()
+    if backend in _BACKENDS and _paragraphs_safe(html):
+        try:
+            return _BACKENDS[backend][1](html)
+        except Exception:
+            pass
+    return _soup_paragraphs(html)
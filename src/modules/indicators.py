@@ -0,0 +1,154 @@
+"""Technical indicators computed for many tickers at once.
+
+Close prices are laid out as a 2D array, one row per ticker and one column
+per trading day (aligned on dates, forward-filled, NaN before a ticker's
+first bar). Every indicator is a NumPy reduction along the day axis, so a
+whole universe costs about as much as one ticker; exponential averages
+use their closed form (a weighted sum over the days) instead of a
+per-day loop.
+
+Only the latest value of each indicator is returned; a value needing more
+history than a ticker has is None.
+
+numpy and pandas are imported inside the functions that use them.
+"""
+from __future__ import annotations
+
+import os
+from typing import Iterable
+
+from src.modules import quote_service
+
+# History the indicators are computed over; the report chart uses the same
+# period, so both share one cached download
+INDICATOR_PERIOD = os.getenv("INDICATOR_PERIOD", "1y")
+
+SMA_WINDOWS = (20, 50, 200)
+EMA_WINDOWS = (12, 26)
+RSI_PERIOD = 14
+VOLATILITY_WINDOWS = (20, 60)
+# Trading days per label
+RETURN_WINDOWS = {"1w": 5, "1m": 21, "3m": 63, "6m": 126}
+TRADING_DAYS = 252
+
+
+def close_matrix(frames: dict, rows: Iterable[tuple[str, str, float]] = ()):
+    """(symbols, dates, closes) from history frames and/or (symbol, date, close) rows, closes shaped (tickers, days).
+
+    Everything is aligned on dates; a ticker's gaps are forward-filled and
+    days before its first bar stay NaN.
+    """
+    import numpy as np
+    import pandas as pd
+
+    series = {
+        symbol: frame["Close"].set_axis(pd.DatetimeIndex(frame.index).tz_localize(None).normalize())
+        for symbol, frame in frames.items()
+        if frame is not None and not frame.empty
+    }
+    tables = [pd.concat(series, axis=1)] if series else []
+    rows = list(rows)
+    if rows:
+        stored = pd.DataFrame(rows, columns=["symbol", "date", "close"]).pivot(index="date", columns="symbol", values="close")
+        stored.index = pd.DatetimeIndex(stored.index)
+        tables.append(stored)
+    if not tables:
+        return [], [], np.empty((0, 0))
+    tables = [table[~table.index.duplicated(keep="last")] for table in tables]
+    table = pd.concat(tables, axis=1).sort_index().ffill()
+    return list(table.columns), list(table.index), table.to_numpy(dtype=float).T
+
+
+def _smoothed(values, alpha: float, seed: int):
+    """Last value of an exponential average along axis 1, seeded with the mean of the first `seed` values.
+
+    Same result as the recursion s_t = alpha * x_t + (1 - alpha) * s_{t-1}
+    started from that mean, written as one weighted sum per row.
+    """
+    import numpy as np
+
+    days = values.shape[1]
+    valid = ~np.isnan(values)
+    first = np.where(valid.any(axis=1), valid.argmax(axis=1), days)
+    seeded_at = first + seed - 1
+    cols = np.arange(days)
+    filled = np.nan_to_num(values)
+    in_seed = (cols >= first[:, None]) & (cols <= seeded_at[:, None])
+    seed_value = (filled * in_seed).sum(axis=1) / seed
+    after_seed = cols > seeded_at[:, None]
+    decay = (1 - alpha) ** (days - 1 - cols)
+    result = (seed_value * (1 - alpha) ** np.maximum(days - 1 - seeded_at, 0)
+              + (alpha * decay * filled * after_seed).sum(axis=1))
+    result[seeded_at > days - 1] = np.nan
+    return result
+
+
+def compute(closes) -> dict:
+    """Latest indicator values for every row of `closes` (tickers x days), as name -> 1D array."""
+    import numpy as np
+
+    closes = np.asarray(closes, dtype=float)
+    if closes.ndim != 2:
+        raise ValueError("closes must be a 2D array (tickers x days)")
+    rows, days = closes.shape
+    nan = np.full(rows, np.nan)
+    last = closes[:, -1] if days else nan
+    out = {}
+
+    for window in SMA_WINDOWS:
+        out[f"sma_{window}"] = closes[:, -window:].mean(axis=1) if days >= window else nan
+    for window in EMA_WINDOWS:
+        out[f"ema_{window}"] = _smoothed(closes, 2 / (window + 1), window) if days else nan
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        diffs = np.diff(closes, axis=1)
+        if diffs.shape[1]:
+            # Wilder's smoothing: an exponential average with alpha = 1 / period
+            gains = _smoothed(np.clip(diffs, 0, None), 1 / RSI_PERIOD, RSI_PERIOD)
+            losses = _smoothed(np.clip(-diffs, 0, None), 1 / RSI_PERIOD, RSI_PERIOD)
+            out[f"rsi_{RSI_PERIOD}"] = np.where(losses == 0, 100.0, 100 - 100 / (1 + gains / losses))
+        else:
+            out[f"rsi_{RSI_PERIOD}"] = nan
+
+        log_returns = np.diff(np.log(closes), axis=1)
+        for window in VOLATILITY_WINDOWS:
+            out[f"volatility_{window}d"] = (
+                log_returns[:, -window:].std(axis=1, ddof=1) * np.sqrt(TRADING_DAYS)
+                if log_returns.shape[1] >= window else nan
+            )
+
+        for label, window in RETURN_WINDOWS.items():
+            out[f"return_{label}"] = last / closes[:, -1 - window] - 1 if days > window else nan
+
+        peaks = np.fmax.accumulate(closes, axis=1) if days else closes
+        out["drawdown"] = last / peaks[:, -1] - 1 if days else nan
+        out["max_drawdown"] = np.nanmin(closes / peaks - 1, axis=1) if days else nan
+    return out
+
+
+def _as_float(value) -> float | None:
+    return None if value != value else round(float(value), 4)  # NaN -> None
+
+
+def indicators_for(symbols: Iterable[str], period: str | None = None) -> dict[str, dict[str, float | None]]:
+    """Indicators per symbol from the stored price history; symbols without history are left out.
+
+    Stale stored histories are refreshed first with multi-symbol downloads,
+    then every symbol the store can serve is read in one query and pivoted
+    into the close matrix. Only what is left goes through `get_history`.
+    """
+    period = INDICATOR_PERIOD if period is None else period
+    symbols = list(dict.fromkeys(s.strip().upper() for s in symbols))
+    quote_service.sync_stale_histories(symbols, period)
+    rows, missing = quote_service.stored_closes(symbols, period)
+    frames = {}
+    for symbol in missing:
+        try:
+            frames[symbol] = quote_service.get_history(symbol, period=period)
+        except Exception as e:
+            print(f"[INDICATORS] No history for {symbol}: {e}")
+    tickers, _dates, closes = close_matrix(frames, rows)
+    if not tickers:
+        return {}
+    values = compute(closes)
+    return {symbol: {name: _as_float(column[i]) for name, column in values.items()} for i, symbol in enumerate(tickers)}
@@ -0,0 +1,114 @@
+"""MinHash near-duplicate detection for fetched article text.
+
+Each article is reduced to the set of its word 3-shingles and a MinHash
+signature; two articles whose signatures agree on at least `threshold` of
+their positions (an estimate of the shingle-set Jaccard similarity) are
+treated as copies of the same story. Signatures and the all-pairs
+comparison are computed with NumPy, so a few dozen candidates cost well
+under a millisecond each.
+"""
+from __future__ import annotations
+
+import os
+import re
+import zlib
+from typing import Sequence
+
+# Estimated Jaccard similarity above which two articles count as the same story (0 disables)
+NEWS_DEDUP_THRESHOLD = float(os.getenv("NEWS_DEDUP_THRESHOLD", "0.8"))
+NUM_PERMUTATIONS = 128
+SHINGLE_WORDS = 3
+
+# Hash values are 32-bit, so anything from 2**32 up is free to use as a sentinel
+_SENTINEL = 1 << 32
+_WORD = re.compile(r"\w+")
+
+
+def shingles(text: str, size: int = SHINGLE_WORDS) -> set[int]:
+    """32-bit hashes of the lowercase word `size`-grams in `text`."""
+    words = _WORD.findall((text or "").lower())
+    if len(words) < size:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+    return {zlib.crc32(gram.encode("utf-8")) for gram in grams}
+
+
+def minhash_signatures(texts: Sequence[str], num_perm: int = NUM_PERMUTATIONS, seed: int = 1):
+    """Return an (len(texts), num_perm) uint64 array of MinHash signatures.
+
+    Texts without any words get a row of distinct sentinels so they never
+    match anything.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)  # odd
+    b = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64)
+
+    sets = [np.fromiter(shingles(text), dtype=np.uint64) for text in texts]
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint64)
+    filled = [row for row, hashes in enumerate(sets) if hashes.size]
+    for row in set(range(len(texts))) - set(filled):
+        signatures[row] = _SENTINEL + row
+    if filled:
+        # One pass over every shingle of every text, then a per-text minimum.
+        # Multiply-add-shift hashing: (a*x + b) mod 2**64, keeping the top 32 bits
+        hashes = np.concatenate([sets[row] for row in filled])
+        starts = np.cumsum([0] + [sets[row].size for row in filled[:-1]])
+        with np.errstate(over="ignore"):
+            permuted = (a[:, None] * hashes + b[:, None]) >> np.uint64(32)
+        signatures[filled] = np.minimum.reduceat(permuted, starts, axis=1).T
+    return signatures
+
+
+def similarity_matrix(texts: Sequence[str], num_perm: int = NUM_PERMUTATIONS):
+    """Pairwise estimated Jaccard similarity of the texts' shingle sets."""
+    signatures = minhash_signatures(texts, num_perm)
+    return (signatures[:, None, :] == signatures[None, :, :]).mean(axis=2)
+
+
+def near_duplicate_groups(texts: Sequence[str], threshold: float | None = None) -> list[list[int]]:
+    """Group indices of texts that are near-duplicates (transitively), in input order."""
+    threshold = NEWS_DEDUP_THRESHOLD if threshold is None else threshold
+    if len(texts) < 2 or threshold <= 0:
+        return [[i] for i in range(len(texts))]
+
+    import numpy as np
+
+    similar = similarity_matrix(texts) >= threshold
+    parent = list(range(len(texts)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in zip(*np.nonzero(np.triu(similar, k=1))):
+        parent[find(int(j))] = find(int(i))
+
+    groups: dict[int, list[int]] = {}
+    for i in range(len(texts)):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
+
+
+def is_near_duplicate(text: str, others: Sequence[str], threshold: float | None = None) -> bool:
+    """True when `text` is a near-duplicate of any of `others` (for texts arriving one at a time)."""
+    threshold = NEWS_DEDUP_THRESHOLD if threshold is None else threshold
+    if not others or threshold <= 0:
+        return False
+    return bool((similarity_matrix([text, *others])[0, 1:] >= threshold).any())
+
+
+def drop_near_duplicates(texts: Sequence[str], threshold: float | None = None) -> list[str]:
+    """Collapse near-duplicate texts, keeping the most complete (longest) copy of each.
+
+    Survivors keep the position of the first copy in the input.
+    """
+    keep = []
+    for group in near_duplicate_groups(texts, threshold):
+        best = max(group, key=lambda i: (len(texts[i]), -i))
+        keep.append((group[0], texts[best]))
+    return [text for _, text in sorted(keep)]
@@ -1,98 +1,291 @@
-import feedparser # type: ignore
-from newspaper import Article # type: ignore
+import os
+import threading
 import urllib.parse
-import requests # type: ignore
-from bs4 import BeautifulSoup # type: ignore
 import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from src.core.article_store import ArticleStore
+from src.core.cache import DEFAULT_CACHE_DIR
+from src.core import latency
+from src.core.http_cache import HttpCache
+from src.modules import html_extract
+
+# requests, bs4 and lxml are imported inside the functions that use them so that
+# importing this module (and the app) stays cheap until news is requested.
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# Fetch-layer knobs: total parallel downloads, parallel downloads per host, timeouts
+# (NEWS_TIMEOUT is the ceiling; latency.policy shortens it once a host's p95 is known)
+NEWS_MAX_WORKERS = int(os.getenv("NEWS_MAX_WORKERS", "8"))
+NEWS_PER_HOST_LIMIT = int(os.getenv("NEWS_PER_HOST_LIMIT", "4"))
+NEWS_TIMEOUT = float(os.getenv("NEWS_TIMEOUT", "10"))
+NEWS_CONNECT_TIMEOUT = float(os.getenv("NEWS_CONNECT_TIMEOUT", "5"))
+
+# Search results change quickly; article bodies almost never change after publication
+NEWS_SEARCH_TTL = float(os.getenv("NEWS_SEARCH_TTL", str(15 * 60)))
+NEWS_ARTICLE_TTL = float(os.getenv("NEWS_ARTICLE_TTL", str(7 * 24 * 3600)))
+
+# Raw pages on disk, revalidated with ETag/Last-Modified once past their TTL
+http_cache = HttpCache(
+    path=os.getenv("HTTP_CACHE_PATH", str(DEFAULT_CACHE_DIR / "http.sqlite3")) or None,
+    max_bytes=int(os.getenv("HTTP_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+)
+
+# Crawled articles with a full-text index; a topic crawled within NEWS_STORE_TTL
+# seconds is answered from the store without touching the network
+NEWS_STORE_TTL = float(os.getenv("NEWS_STORE_TTL", str(30 * 60)))
+article_store = ArticleStore(
+    path=os.getenv("NEWS_STORE_PATH", str(DEFAULT_CACHE_DIR / "news.sqlite3")) or None,
+    max_age=float(os.getenv("NEWS_STORE_MAX_AGE", str(7 * 24 * 3600))),
+)
+
+# Articles shorter than this are treated as failed extractions
+MIN_ARTICLE_CHARS = 50
+
+_session = None
+_session_lock = threading.Lock()
+_host_limits: dict[str, threading.BoundedSemaphore] = {}
+
+
+def get_session():
+    """Return the shared, connection-pooled requests session."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests # type: ignore
+            from requests.adapters import HTTPAdapter # type: ignore
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=NEWS_MAX_WORKERS, pool_maxsize=NEWS_MAX_WORKERS)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update(HEADERS)
+            _session = session
+        return _session
+
+
+def _host_limit(url):
+    host = urllib.parse.urlsplit(url).netloc.lower()
+    with _session_lock:
+        limit = _host_limits.get(host)
+        if limit is None:
+            limit = _host_limits[host] = threading.BoundedSemaphore(NEWS_PER_HOST_LIMIT)
+        return limit
+
+
+def fetch_html(url, ttl=NEWS_ARTICLE_TTL):
+    """Return the HTML for `url`, from the HTTP cache when it is younger than `ttl` seconds.
+
+    Stale entries are revalidated with a conditional request, and served as-is
+    if the network fails. Downloads go through the shared session, at most
+    NEWS_PER_HOST_LIMIT per host at a time, under `latency.policy` (adaptive
+    timeout, hedged retry of slow requests, per-host circuit breaker).
+    """
+    cached = http_cache.lookup(url)
+    if cached is not None and cached.is_fresh(ttl):
+        http_cache.record("hits")
+        return cached.body
+
+    def get(timeout):
+        with _host_limit(url):
+            response = get_session().get(
+                url,
+                headers=cached.validators() if cached is not None else None,
+                timeout=(min(NEWS_CONNECT_TIMEOUT, timeout), timeout),
+            )
+        if response.status_code >= 500:
+            response.raise_for_status()  # counts against the host's circuit breaker
+        return response
 
-def get_bbc_news_content(topic, max_results=5):
-    """Fetches news articles from BBC News search and extracts full content."""
     try:
-        search_url = f"https://www.bbc.com/search?q={urllib.parse.quote_plus(topic)}"
-        response = requests.get(search_url, timeout=10)
+        response = latency.policy.call(urllib.parse.urlsplit(url).netloc.lower(), get, NEWS_TIMEOUT)
+        if cached is not None and response.status_code == 304:
+            http_cache.refresh(url)
+            http_cache.record("revalidated")
+            return cached.body
         response.raise_for_status()
-        return search_url
     except Exception as e:
-        print(f"Error fetching BBC news search: {e}")
-        return None
+        if cached is None:
+            raise
+        print(f"[NEWS] Serving stale copy of {url}: {e}")
+        http_cache.record("hits")
+        return cached.body
 
+    http_cache.record("misses")
+    http_cache.store(
+        url,
+        response.text,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+    )
+    return response.text
 
-def extract_hrefs(url):
-    """Extract article links from BBC search results."""
-    if not url:
-        return []
-    
+
+def search_url_for(topic):
+    return f"https://www.bbc.com/search?q={urllib.parse.quote_plus(topic)}"
+
+
+def fetch_search_page(topic):
+    """Download the BBC search page once; returns (url, html) or (None, None)."""
+    search_url = search_url_for(topic)
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
+        return search_url, fetch_html(search_url, ttl=NEWS_SEARCH_TTL)
+    except Exception as e:
+        print(f"Error fetching BBC news search: {e}")
+        return None, None
+
+
+def parse_hrefs(html):
+    """Article links found in a BBC search results page."""
+    hrefs = html_extract.extract_links(html)
+
+    # Filter hrefs containing "/news/articles/" or "/news/"
+    filtered_hrefs = [href for href in hrefs if "/news/" in href and "article" in href.lower()]
+
+    # Prepend "https://www.bbc.com/" to relative links
+    full_links = ["https://www.bbc.com" + href if href.startswith("/") else href for href in filtered_hrefs]
+
+    # Remove duplicates, keeping page order
+    full_links = list(dict.fromkeys(full_links))
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-        hrefs = [a.get('href') for a in soup.find_all('a') if a.get('href')]
+    return full_links[:10]  # Return max 10 links
 
-        # Filter hrefs containing "/news/articles/" or "/news/"
-        filtered_hrefs = [href for href in hrefs if "/news/" in href and "article" in href.lower()]
 
-        # Prepend "https://www.bbc.com/" to relative links
-        full_links = ["https://www.bbc.com" + href if href.startswith("/") else href for href in filtered_hrefs]
-        
-        # Remove duplicates
-        full_links = list(set(full_links))
+def extract_hrefs(url, html=None):
+    """Extract article links from BBC search results.
 
-        return full_links[:10]  # Return max 10 links
-    except requests.exceptions.RequestException as e:
+    Pass the already downloaded `html` to avoid fetching the page again.
+    """
+    if not url:
+        return []
+
+    try:
+        if html is None:
+            html = fetch_html(url, ttl=NEWS_SEARCH_TTL)
+        return parse_hrefs(html)
+    except Exception as e:
         print(f"Error fetching the URL: {e}")
         return []
 
 
+def parse_paragraphs(html):
+    """Join the text of every non-empty <p> element."""
+    # Only the <p> elements are parsed (see html_extract for the backends)
+    content = "\n".join(html_extract.extract_paragraphs(html))
+
+    return content if content else "[No content extracted]"
+
+
 def extract_paragraphs(url):
     """Extract paragraphs from an article."""
     if not url:
         return ""
-    
+
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        # Parse the HTML content
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Extract all <p> elements and return their text as a single string
-        paragraphs = [p.get_text().strip() for p in soup.find_all('p') if p.get_text().strip()]
-        content = "\n".join(paragraphs)
-        
-        return content if content else "[No content extracted]"
-    except requests.exceptions.RequestException as e:
+        return parse_paragraphs(fetch_html(url))
+    except Exception as e:
         print(f"Error fetching URL: {e}")
         return ""
 
 
-def get_news_content(topic):
-    """Main function to fetch news content for a topic."""
+def iter_articles(links, max_workers=None):
+    """Download `links` concurrently, yielding (idx, link, text) as each one completes.
+
+    Closing the generator cancels downloads that have not started yet; ones
+    already running finish in the background and are discarded.
+    """
+    max_workers = NEWS_MAX_WORKERS if max_workers is None else max_workers
+    if not links:
+        return
+    pool = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    try:
+        pending = {pool.submit(extract_paragraphs, link): idx for idx, link in enumerate(links)}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                idx = pending.pop(future)
+                yield idx, links[idx], future.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def is_meaningful(text):
+    return bool(text) and len(text) > MIN_ARTICLE_CHARS
+
+
+def search_phrases(topic):
+    """The topic plus the aliases of its ticker, used to search the article store."""
+    from src.modules.ticker_resolver import company_aliases, resolve_ticker
+
+    phrases = [topic]
+    match = resolve_ticker(topic) if topic else None
+    if match is not None and match.tier != "fuzzy":
+        phrases.extend(company_aliases(match.symbol))
+    return phrases
+
+
+def crawl_topic(topic, max_articles=5):
+    """Fetch articles for `topic` from every news source and add them to the article store."""
+    from src.modules.news_sources import canonical_url, collect_articles, default_sources
+
+    articles = collect_articles(topic, default_sources(), limit=max_articles)
+    if articles:
+        added = article_store.add(topic, articles, url_key=canonical_url)
+        print(f"[NEWS] Stored {added} new of {len(articles)} articles for {topic}")
+    return articles
+
+
+def iter_news_content(topic, max_articles=5, buffer=None):
+    """Yield the text of up to `max_articles` articles about `topic` as each one is ready.
+
+    Same sources and store as `get_news_content`, but the caller can start
+    working on the first article while the rest are still downloading, and
+    closing the generator stops the remaining downloads. At most `buffer`
+    articles (default NEWS_STREAM_BUFFER) are fetched ahead of the caller.
+    """
+    from src.modules.news_sources import canonical_url, default_sources, stream_articles
+
+    stored = article_store.search(search_phrases(topic), limit=max_articles)
+    if stored and article_store.is_fresh(topic, NEWS_STORE_TTL):
+        print(f"[NEWS] Serving {len(stored)} stored articles for {topic}")
+        for article in stored:
+            yield article.text
+        return
+
+    articles = []
+    stream = stream_articles(topic, default_sources(), limit=max_articles, buffer=buffer)
+    try:
+        for article in stream:
+            articles.append(article)
+            yield article.text
+    finally:
+        stream.close()
+        if articles:
+            added = article_store.add(topic, articles, url_key=canonical_url)
+            print(f"[NEWS] Stored {added} new of {len(articles)} articles for {topic}")
+
+    if not articles and stored:
+        print(f"[NEWS] No fresh articles for {topic}; serving {len(stored)} stored ones")
+        for article in stored:
+            yield article.text
+    elif not articles:
+        print(f"No news articles found for {topic}")
+
+
+def get_news_content(topic, max_articles=5):
+    """Main function to fetch news content for a topic.
+
+    Answers from the local article store when the topic was crawled within
+    NEWS_STORE_TTL (e.g. by the prefetcher). Otherwise queries every
+    configured news source (see `news_sources.default_sources`) concurrently
+    and returns the text of up to `max_articles` articles, preferring ones
+    that mention the topic; stored articles are the fallback if that fails.
+    """
     try:
-        news_url = get_bbc_news_content(topic)
-        if not news_url:
-            return []
-        
-        links = extract_hrefs(news_url)
-        
-        if not links:
-            print(f"No news articles found for {topic}")
-            return []
-        
-        content_list = []  # List to store extracted news content
-        
-        for link in links[:5]:  # Limit to 5 articles
-            information = extract_paragraphs(link)
-            if information and len(information) > 50:  # Only add if meaningful content
-                content_list.append(information)
-        
-        return content_list
+        return list(iter_news_content(topic, max_articles, buffer=1 << 16))
     except Exception as e:
         print(f"Error in get_news_content: {e}")
         return []
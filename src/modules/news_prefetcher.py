@@ -0,0 +1,156 @@
+"""Background crawler that keeps the article store warm for a watchlist.
+
+Every NEWS_PREFETCH_INTERVAL seconds the worker crawls each watchlist
+company whose stored news is older than NEWS_STORE_TTL, a few at a time,
+so reports for those companies are served from the local store instead of
+waiting on the network. Run it inside the app (NEWS_PREFETCH=1) or on its
+own:
+
+    python -m src.modules.news_prefetcher [--once] [--watchlist companies.csv]
+
+The default watchlist is every company in the bundled symbol table, named
+the way users ask about them ("Apple", not "Apple Inc."), so the crawled
+topics are the ones reports look up.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from src.modules import news_fetcher
+from src.modules.ticker_resolver import normalize_company, tracked_symbols
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Set NEWS_PREFETCH=1 to run the prefetcher in the web app
+NEWS_PREFETCH = os.getenv("NEWS_PREFETCH", "0") == "1"
+# CSV of company names; unset means every company in data/symbols.csv
+NEWS_PREFETCH_WATCHLIST = os.getenv("NEWS_PREFETCH_WATCHLIST", "")
+NEWS_PREFETCH_INTERVAL = float(os.getenv("NEWS_PREFETCH_INTERVAL", str(20 * 60)))
+# Companies crawled at once; each crawl already fans out across the news sources
+NEWS_PREFETCH_WORKERS = int(os.getenv("NEWS_PREFETCH_WORKERS", "2"))
+NEWS_PREFETCH_ARTICLES = int(os.getenv("NEWS_PREFETCH_ARTICLES", "10"))
+
+
+def short_company_name(name: str) -> str:
+    """`name` without share-class notes and corporate suffixes, case kept ("Tesla, Inc." -> "Tesla")."""
+    words = re.sub(r"\(.*?\)", " ", name).replace(",", " ").split()
+    while len(words) > 1 and normalize_company(" ".join(words[:-1])) == normalize_company(" ".join(words)):
+        words.pop()
+    return " ".join(words)
+
+
+def tracked_companies() -> list[str]:
+    """Short names of every company in the bundled symbol table."""
+    return list(dict.fromkeys(short_company_name(name) for name in tracked_symbols().values()))
+
+
+def load_watchlist(path: str | Path | None = NEWS_PREFETCH_WATCHLIST) -> list[str]:
+    """Company names from the first column of a CSV file (one per line, no header).
+
+    Without a path the watchlist is every tracked company.
+    """
+    if not path:
+        return tracked_companies()
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            names = [row[0].strip() for row in csv.reader(f) if row and row[0].strip()]
+    except OSError as exc:
+        print(f"[PREFETCH] Cannot read watchlist {path}: {exc}")
+        return []
+    return list(dict.fromkeys(names))
+
+
+def stale_companies(companies: list[str], ttl_seconds: float | None = None) -> list[str]:
+    """The companies whose stored news is older than `ttl_seconds`, least recently crawled first."""
+    ttl_seconds = news_fetcher.NEWS_STORE_TTL if ttl_seconds is None else ttl_seconds
+    now = time.time()
+    crawled = {name: news_fetcher.article_store.crawled_at(name) for name in companies}
+    stale = [name for name in companies if crawled[name] is None or now - crawled[name] > ttl_seconds]
+    return sorted(stale, key=lambda name: crawled[name] or 0.0)
+
+
+def prefetch_once(
+    companies: list[str],
+    max_workers: int | None = None,
+    stop: threading.Event | None = None,
+) -> int:
+    """Crawl every stale company in `companies`; returns how many were crawled."""
+    max_workers = NEWS_PREFETCH_WORKERS if max_workers is None else max_workers
+    stop = stop or threading.Event()
+    pending = stale_companies(companies)
+    start = time.monotonic()
+
+    def crawl(name: str) -> bool:
+        if stop.is_set():
+            return False
+        try:
+            news_fetcher.crawl_topic(name, max_articles=NEWS_PREFETCH_ARTICLES)
+        except Exception as e:
+            print(f"[PREFETCH] Crawl for {name} failed: {e}")
+        return True
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        crawled = sum(pool.map(crawl, pending))
+    print(f"[PREFETCH] Crawled {crawled} of {len(companies)} watchlist companies "
+          f"in {time.monotonic() - start:.1f}s")
+    return crawled
+
+
+class NewsPrefetcher:
+    """Daemon thread running `prefetch_once` over a watchlist every `interval` seconds."""
+
+    def __init__(self, companies: list[str] | None = None, interval: float | None = None) -> None:
+        self.companies = load_watchlist() if companies is None else companies
+        self.interval = NEWS_PREFETCH_INTERVAL if interval is None else interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            prefetch_once(self.companies, stop=self._stop)
+            self._stop.wait(self.interval)
+
+    def start(self) -> "NewsPrefetcher":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="news-prefetcher", daemon=True)
+            self._thread.start()
+            print(f"[PREFETCH] Watching {len(self.companies)} companies every {self.interval:g}s")
+        return self
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop after the crawls already in progress; queued companies are skipped."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prefetch news for a watchlist into the local article store.")
+    parser.add_argument("--watchlist", default=NEWS_PREFETCH_WATCHLIST,
+                        help="CSV file of company names (default: every tracked company)")
+    parser.add_argument("--once", action="store_true", help="crawl stale companies once and exit")
+    parser.add_argument("--interval", type=float, default=NEWS_PREFETCH_INTERVAL, help="seconds between passes")
+    args = parser.parse_args()
+
+    companies = load_watchlist(args.watchlist)
+    if args.once:
+        prefetch_once(companies)
+        return
+    prefetcher = NewsPrefetcher(companies, args.interval).start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        prefetcher.stop()
+
+
+if __name__ == "__main__":
+    main()
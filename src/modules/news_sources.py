@@ -0,0 +1,296 @@
+"""Pluggable news sources and the engine that fans a query out across them.
+
+A source is any object with a `name`, a `timeout` in seconds and an
+`iter_articles(topic)` generator yielding `Article`s as they become
+available. `stream_articles` runs every source on its own thread, merges
+their output, drops duplicates by canonical URL and stops as soon as enough
+relevant articles are in; `collect_articles` gathers its output in a list. A source that misses its deadline is abandoned
+without holding up the others.
+"""
+from __future__ import annotations
+
+import html
+import json
+import os
+import queue
+import re
+import threading
+import time
+import urllib.parse
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, NamedTuple
+
+from src.modules import news_fetcher
+from src.modules.ticker_resolver import resolve_ticker
+
+# Comma-separated source names used by get_news_content: bbc, rss, local
+NEWS_SOURCES = os.getenv("NEWS_SOURCES", "bbc,rss")
+# Comma-separated feed URL templates; {query} is the topic, {ticker} its resolved symbol
+NEWS_RSS_FEEDS = os.getenv(
+    "NEWS_RSS_FEEDS",
+    "https://feeds.finance.yahoo.com/rss/2.0/headline?s={ticker}&region=US&lang=en-US",
+)
+# Directory of saved articles for the "local" source
+NEWS_LOCAL_DIR = os.getenv("NEWS_LOCAL_DIR", "")
+NEWS_SOURCE_TIMEOUT = float(os.getenv("NEWS_SOURCE_TIMEOUT", "8"))
+RSS_MAX_ENTRIES = int(os.getenv("RSS_MAX_ENTRIES", "10"))
+# Articles that may wait between the sources and a streaming consumer
+NEWS_STREAM_BUFFER = int(os.getenv("NEWS_STREAM_BUFFER", "4"))
+
+# Query parameters that only track where a click came from
+_TRACKING_PARAMS = re.compile(r"^(utm_|at_|ocid$|fbclid$|gclid$|cmpid$|ref$|src$)")
+_TAGS = re.compile(r"<[^>]+>")
+
+
+class Article(NamedTuple):
+    url: str
+    title: str
+    text: str
+    source: str
+
+
+def canonical_url(url: str) -> str:
+    """Normalize `url` so the same story reached through different links compares equal."""
+    parts = urllib.parse.urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    host = re.sub(r":(80|443)$", "", host)
+    query = urllib.parse.urlencode(sorted(
+        (k, v) for k, v in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        if not _TRACKING_PARAMS.match(k.lower())
+    ))
+    path = re.sub(r"/(amp/?)?$", "", parts.path) or "/"
+    return urllib.parse.urlunsplit(("https", host, path, query, ""))
+
+
+def mentions(topic: str) -> Callable[[Article], bool]:
+    """Relevance test: the article title or text mentions `topic` (case-insensitive)."""
+    needle = (topic or "").lower()
+    return lambda article: needle in article.title.lower() or needle in article.text.lower()
+
+
+def strip_html(text: str) -> str:
+    return html.unescape(_TAGS.sub(" ", text or "")).strip()
+
+
+class BBCSource:
+    """Scrape BBC News search results and the linked article pages."""
+
+    name = "bbc"
+
+    def __init__(self, timeout: float | None = None) -> None:
+        self.timeout = NEWS_SOURCE_TIMEOUT if timeout is None else timeout
+
+    def iter_articles(self, topic: str) -> Iterator[Article]:
+        search_url, page = news_fetcher.fetch_search_page(topic)
+        if not search_url:
+            return
+        links = news_fetcher.extract_hrefs(search_url, html=page)
+        downloads = news_fetcher.iter_articles(links)
+        try:
+            for _, link, text in downloads:
+                if news_fetcher.is_meaningful(text):
+                    yield Article(link, "", text, self.name)
+        finally:
+            downloads.close()
+
+
+class RSSSource:
+    """Any RSS/Atom feed whose URL can be built from the topic or its ticker.
+
+    Entries are expanded to the full article text when the page can be
+    scraped, otherwise the feed's own title and summary are used.
+    """
+
+    def __init__(self, url_template: str, name: str | None = None, timeout: float | None = None) -> None:
+        self.url_template = url_template
+        self.name = name or f"rss:{urllib.parse.urlsplit(url_template).netloc}"
+        self.timeout = NEWS_SOURCE_TIMEOUT if timeout is None else timeout
+
+    def feed_url(self, topic: str) -> str | None:
+        fields = {"query": urllib.parse.quote_plus(topic)}
+        if "{ticker}" in self.url_template:
+            match = resolve_ticker(topic)
+            if match is None or match.tier == "fuzzy":
+                return None  # a fuzzy guess may be another company's feed
+            fields["ticker"] = urllib.parse.quote_plus(match.symbol)
+        return self.url_template.format(**fields)
+
+    def iter_articles(self, topic: str) -> Iterator[Article]:
+        try:
+            import feedparser # type: ignore
+        except Exception:
+            print(f"[NEWS] feedparser is not installed; skipping {self.name}")
+            return
+        url = self.feed_url(topic)
+        if not url:
+            return
+
+        feed = feedparser.parse(news_fetcher.fetch_html(url, ttl=news_fetcher.NEWS_SEARCH_TTL))
+        entries = {}
+        for entry in feed.entries:
+            link = entry.get("link")
+            if link and link not in entries:
+                entries[link] = entry
+            if len(entries) >= RSS_MAX_ENTRIES:
+                break
+
+        downloads = news_fetcher.iter_articles(list(entries))
+        try:
+            for _, link, text in downloads:
+                entry = entries[link]
+                title = strip_html(entry.get("title", ""))
+                if not news_fetcher.is_meaningful(text):
+                    text = "\n".join(filter(None, [title, strip_html(entry.get("summary", ""))]))
+                if news_fetcher.is_meaningful(text):
+                    yield Article(link, title, text, self.name)
+        finally:
+            downloads.close()
+
+
+class LocalFileSource:
+    """Articles saved as JSON files (one object or a list of {url, title, text}) in a directory.
+
+    Useful for tests and offline demos; only articles mentioning the topic are returned.
+    """
+
+    name = "local"
+
+    def __init__(self, directory: str | Path, timeout: float | None = None) -> None:
+        self.directory = Path(directory)
+        self.timeout = NEWS_SOURCE_TIMEOUT if timeout is None else timeout
+
+    def iter_articles(self, topic: str) -> Iterator[Article]:
+        relevant = mentions(topic)
+        for path in sorted(self.directory.glob("*.json")):
+            try:
+                records = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                print(f"[NEWS] Skipping {path}: {exc}")
+                continue
+            for record in records if isinstance(records, list) else [records]:
+                article = Article(record.get("url", str(path)), record.get("title", ""), record.get("text", ""), self.name)
+                if relevant(article):
+                    yield article
+
+
+def default_sources() -> list:
+    """Build the sources named in NEWS_SOURCES."""
+    sources = []
+    for name in (n.strip().lower() for n in NEWS_SOURCES.split(",")):
+        if name == "bbc":
+            sources.append(BBCSource())
+        elif name == "rss":
+            sources.extend(RSSSource(t.strip()) for t in NEWS_RSS_FEEDS.split(",") if t.strip())
+        elif name == "local" and NEWS_LOCAL_DIR:
+            sources.append(LocalFileSource(NEWS_LOCAL_DIR))
+        elif name:
+            print(f"[NEWS] Unknown or unconfigured news source '{name}'")
+    return sources
+
+
+def stream_articles(
+    topic: str,
+    sources: Iterable,
+    limit: int = 5,
+    is_relevant: Callable[[Article], bool] | None = None,
+    buffer: int | None = None,
+) -> Iterator[Article]:
+    """Query `sources` concurrently, yielding up to `limit` unique articles as they arrive.
+
+    Relevant articles (default: ones mentioning `topic`) are yielded as soon
+    as a source produces them; other articles are held back and yielded at
+    the end to pad the result when there are too few relevant ones. At most
+    `buffer` articles wait between the sources and the caller, so sources
+    pause while the caller is busy. Collection stops once `limit` relevant
+    articles are out or every source has finished or run past its own
+    `timeout`; closing the generator early stops the sources as well.
+    """
+    is_relevant = is_relevant or mentions(topic)
+    buffer = NEWS_STREAM_BUFFER if buffer is None else buffer
+    sources = list(sources)
+    stop = threading.Event()
+    events: queue.Queue = queue.Queue(maxsize=max(1, buffer))
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                events.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(source, deadline):
+        items = source.iter_articles(topic)
+        try:
+            for article in items:
+                if stop.is_set() or time.monotonic() > deadline or not put((source, article)):
+                    break
+        except Exception as e:
+            print(f"[NEWS] Source {source.name} failed: {e}")
+        finally:
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()
+            put((source, None))
+
+    start = time.monotonic()
+    deadlines = {}
+    for source in sources:
+        deadlines[source] = start + source.timeout
+        threading.Thread(target=run, args=(source, deadlines[source]), daemon=True).start()
+
+    running = set(sources)
+    seen: set[str] = set()
+    relevant = 0
+    others: list[Article] = []
+    try:
+        while running and relevant < limit:
+            now = time.monotonic()
+            for source in [s for s in running if deadlines[s] <= now]:
+                print(f"[NEWS] Source {source.name} timed out after {source.timeout:g}s")
+                running.discard(source)
+            if not running:
+                break
+            try:
+                source, article = events.get(timeout=min(deadlines[s] for s in running) - now)
+            except queue.Empty:
+                continue
+            if article is None:
+                running.discard(source)
+                continue
+            if source not in running:
+                continue  # late result from a source that already timed out
+            key = canonical_url(article.url)
+            if key in seen:
+                continue
+            seen.add(key)
+            if is_relevant(article):
+                relevant += 1
+                yield article
+            else:
+                others.append(article)
+    finally:
+        stop.set()
+
+    print(f"[NEWS] Collected {relevant} relevant / {len(others)} other articles "
+          f"from {len(sources)} source(s) in {time.monotonic() - start:.2f}s")
+    yield from others[:max(0, limit - relevant)]
+
+
+def collect_articles(
+    topic: str,
+    sources: Iterable,
+    limit: int = 5,
+    is_relevant: Callable[[Article], bool] | None = None,
+) -> list[Article]:
+    """Query `sources` concurrently and return up to `limit` unique articles.
+
+    Relevant articles (default: ones mentioning `topic`) come first, in
+    arrival order, padded with other articles when there are too few.
+    See `stream_articles` for the deadlines.
+    """
+    # Unbounded buffer: nothing is consumed until the list is complete anyway
+    return list(stream_articles(topic, sources, limit, is_relevant, buffer=1 << 16))
@@ -0,0 +1,166 @@
+"""Bulk stock-snapshot ingestion for every tracked ticker.
+
+Keeps `stock_snapshots` (and the Analysis dashboards built on it) fresh for
+the whole universe without going through the chatbot one company at a time.
+Symbols are processed in batches. One multi-symbol `yf.download` call
+refreshes a year of daily bars for the whole batch in the local price store
+(so charts and indicators for the universe are served without the network)
+and gives each batch's last close and 52-week range for symbols whose info
+lacks them; the per-symbol fundamentals, which have no multi-symbol API,
+are fetched on a bounded worker pool, and each batch is written with a
+single bulk insert.
+
+    python -m src.modules.quote_ingest [--watchlist data/companies.csv] [--batch-size 50] [--workers 8] [--dry-run]
+
+Without `--watchlist` every ticker in the bundled symbol table is ingested.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, NamedTuple, Sequence
+
+from src.core.db import save_stock_snapshots
+from src.modules import quote_service
+from src.modules.quote_service import fetch_info
+from src.modules.stock_info_formatter import snapshot_from_info
+from src.modules.ticker_resolver import resolve_ticker, tracked_symbols
+
+QUOTE_BATCH_SIZE = int(os.getenv("QUOTE_BATCH_SIZE", "50"))
+QUOTE_INGEST_WORKERS = int(os.getenv("QUOTE_INGEST_WORKERS", "8"))
+
+
+class IngestReport(NamedTuple):
+    symbols: int
+    fetched: int
+    stored: int
+    failed: list[str]
+    elapsed: float
+
+    @property
+    def symbols_per_second(self) -> float:
+        return self.symbols / self.elapsed if self.elapsed else 0.0
+
+
+def resolve_symbols(companies: Sequence[str] | None = None) -> tuple[list[str], list[str]]:
+    """Symbols to ingest plus the company names that could not be resolved.
+
+    With no `companies`, every bundled ticker. Names are resolved with the
+    local symbol table only; fuzzy guesses are treated as unresolved.
+    """
+    if companies is None:
+        return list(tracked_symbols()), []
+    symbols, unresolved = [], []
+    for name in companies:
+        match = resolve_ticker(name)
+        if match is None or match.tier == "fuzzy":
+            unresolved.append(name)
+        else:
+            symbols.append(match.symbol)
+    return list(dict.fromkeys(symbols)), unresolved
+
+
+def price_summary(symbols: Sequence[str], threads: int = QUOTE_INGEST_WORKERS) -> dict[str, dict[str, float]]:
+    """Last close and 52-week high/low per symbol from one multi-symbol download.
+
+    The download also refreshes the symbols' stored daily history.
+    """
+    frames = quote_service.sync_histories(symbols, period="1y", threads=threads)
+    return {
+        symbol: {
+            "currentPrice": float(frame["Close"].iloc[-1]),
+            "52WeekHigh": float(frame["High"].max()),
+            "52WeekLow": float(frame["Low"].min()),
+        }
+        for symbol, frame in frames.items()
+    }
+
+
+def _info_or_none(symbol: str) -> dict | None:
+    try:
+        return fetch_info(symbol)
+    except Exception as e:
+        print(f"[INGEST] {symbol}: {e}")
+        return None
+
+
+def build_snapshot(info: dict | None, prices: dict[str, float] | None) -> dict | None:
+    """Snapshot from a symbol's info, with price fields the info lacks taken from the batch download."""
+    if not info or not info.get("symbol"):
+        return None
+    snapshot = snapshot_from_info(info)
+    for key, value in (prices or {}).items():
+        if snapshot.get(key) in (None, "N/A"):
+            snapshot[key] = value
+    return snapshot
+
+
+def ingest_quotes(
+    symbols: Sequence[str],
+    batch_size: int | None = None,
+    max_workers: int | None = None,
+    save: Callable[[list[dict]], int] = save_stock_snapshots,
+) -> IngestReport:
+    """Fetch and store snapshots for `symbols`, `batch_size` at a time; one `save` call per batch."""
+    batch_size = QUOTE_BATCH_SIZE if batch_size is None else batch_size
+    max_workers = QUOTE_INGEST_WORKERS if max_workers is None else max_workers
+    batches = [list(symbols[i:i + batch_size]) for i in range(0, len(symbols), max(1, batch_size))]
+    fetched = stored = 0
+    failed: list[str] = []
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        for n, batch in enumerate(batches, start=1):
+            began = time.perf_counter()
+            infos = pool.map(_info_or_none, batch)
+            try:
+                prices = price_summary(batch, threads=max_workers)
+            except Exception as e:
+                print(f"[INGEST] Batch download failed: {e}")
+                prices = {}
+            snapshots = []
+            for symbol, info in zip(batch, infos):
+                snapshot = build_snapshot(info, prices.get(symbol))
+                if snapshot is None:
+                    failed.append(symbol)
+                else:
+                    snapshots.append(snapshot)
+            written = save(snapshots) if snapshots else 0
+            fetched += len(snapshots)
+            stored += written
+            took = time.perf_counter() - began
+            print(f"[INGEST] Batch {n}/{len(batches)}: {len(snapshots)}/{len(batch)} quotes, "
+                  f"{written} stored in {took:.1f}s ({len(batch) / took if took else 0:.1f} symbols/s)")
+
+    return IngestReport(len(symbols), fetched, stored, failed, time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Snapshot quotes for every tracked ticker into stock_snapshots.")
+    parser.add_argument("--watchlist", help="CSV of company names to ingest instead of the bundled symbol table")
+    parser.add_argument("--batch-size", type=int, default=QUOTE_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=QUOTE_INGEST_WORKERS)
+    parser.add_argument("--dry-run", action="store_true", help="fetch but do not write to the database")
+    args = parser.parse_args()
+
+    companies = None
+    if args.watchlist:
+        from src.modules.news_prefetcher import load_watchlist
+
+        companies = load_watchlist(args.watchlist)
+    symbols, unresolved = resolve_symbols(companies)
+    if unresolved:
+        print(f"[INGEST] Could not resolve {len(unresolved)} companies: {', '.join(unresolved[:10])}...")
+
+    save = (lambda rows: 0) if args.dry_run else save_stock_snapshots
+    report = ingest_quotes(symbols, args.batch_size, args.workers, save)
+    print(f"[INGEST] {report.fetched}/{report.symbols} quotes fetched, {report.stored} stored, "
+          f"{len(report.failed)} failed in {report.elapsed:.1f}s ({report.symbols_per_second:.1f} symbols/s)")
+    if report.failed:
+        print(f"[INGEST] Failed: {', '.join(report.failed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,469 @@
+"""Shared yfinance access: one cached, coalesced lookup per ticker.
+
+Every call site (pipeline, formatter, the API's history and report paths)
+goes through `get_info` / `get_history`, so a report makes at most one info
+call and one history call per ticker, and concurrent requests for the same
+ticker share a single in-flight download. Entries live for QUOTE_TTL_OPEN
+seconds while the US market is open and QUOTE_TTL_CLOSED when it is not.
+
+Daily history is also kept on disk in `price_store`: a ticker seen before
+only downloads the bars after its last stored date (nothing at all once it
+has been synced since the last close), and every period is served from the
+stored bars. Stored bars are split- and dividend-adjusted like yfinance's
+own history, so a new split or dividend replaces the ticker's stored bars.
+
+Cached values are shared between callers and must not be mutated.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import date, datetime, time as clock, timedelta, timezone
+from typing import Any, Callable
+from zoneinfo import ZoneInfo
+
+from src.core import latency
+from src.core.cache import DEFAULT_CACHE_DIR
+from src.core.price_store import PriceBar, PriceStore, SyncState
+
+# Ceiling for one yfinance request; latency.policy shortens it once the p95 is known
+YF_TIMEOUT = float(os.getenv("YF_TIMEOUT", "15"))
+# Ceiling for one multi-symbol download
+YF_BULK_TIMEOUT = float(os.getenv("YF_BULK_TIMEOUT", "60"))
+# Symbols per multi-symbol download when many stored histories are stale
+HISTORY_BATCH_SIZE = int(os.getenv("HISTORY_BATCH_SIZE", "100"))
+QUOTE_TTL_OPEN = float(os.getenv("QUOTE_TTL_OPEN", "60"))
+QUOTE_TTL_CLOSED = float(os.getenv("QUOTE_TTL_CLOSED", str(30 * 60)))
+QUOTE_CACHE_MAX_ENTRIES = int(os.getenv("QUOTE_CACHE_MAX_ENTRIES", "512"))
+
+# Daily OHLCV bars on disk, topped up incrementally
+price_store = PriceStore(os.getenv("PRICE_STORE_PATH", str(DEFAULT_CACHE_DIR / "prices.sqlite3")) or None)
+
+_EXCHANGE_TZ = ZoneInfo("America/New_York")
+_MARKET_OPEN, _MARKET_CLOSE = clock(9, 30), clock(16, 0)
+# Daily-bar periods served from price_store; other periods and intervals go straight to yfinance
+_PERIOD_DAYS = {"1mo": 31, "3mo": 92, "6mo": 183, "1y": 366, "2y": 731, "5y": 1827, "10y": 3653}
+
+
+_call_deadline = threading.local()
+_session = None
+_session_lock = threading.Lock()
+
+
+def _request_timeout(requested):
+    """`requested` shortened to what is left of the calling thread's deadline, if it has one."""
+    deadline = getattr(_call_deadline, "at", None)
+    if deadline is None:
+        return requested
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError("yfinance call ran past its deadline")
+    return min(requested, remaining) if isinstance(requested, (int, float)) else remaining
+
+
+def yf_session():
+    """The HTTP session every yfinance call uses; no request outlives its call's deadline.
+
+    yfinance does not take a timeout for `.info`, so the session applies
+    the deadline set by `deadline()` to each request it sends, and a call
+    the policy abandons stops soon after instead of holding a thread.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            try:
+                from curl_cffi import requests as http
+
+                session = http.Session(impersonate="chrome")
+            except ImportError:
+                import requests as http
+
+                session = http.Session()
+            send = session.request
+
+            def request(method, url, *args, **kwargs):
+                kwargs["timeout"] = _request_timeout(kwargs.get("timeout"))
+                return send(method, url, *args, **kwargs)
+
+            session.request = request
+            _session = session
+        return _session
+
+
+@contextmanager
+def deadline(timeout: float):
+    """yfinance requests made on this thread inside the block must finish within `timeout` seconds.
+
+    Blocks nest: an inner deadline never extends an outer one, and the
+    outer one applies again when the inner block exits.
+    """
+    outer = getattr(_call_deadline, "at", None)
+    at = time.monotonic() + timeout
+    _call_deadline.at = at if outer is None else min(at, outer)
+    try:
+        yield
+    finally:
+        _call_deadline.at = outer
+
+
+def fetch_info(symbol):
+    """`yf.Ticker(symbol).info` under the I/O policy (deadline, hedging, breaker); uncached."""
+    import yfinance as yf
+
+    def call(timeout):
+        with deadline(timeout):
+            return yf.Ticker(symbol, session=yf_session()).info
+
+    return latency.policy.call("yfinance.info", call, YF_TIMEOUT)
+
+
+def fetch_history(symbol, **kwargs):
+    """`yf.Ticker(symbol).history(**kwargs)` under the I/O policy; uncached."""
+    import yfinance as yf
+
+    def call(timeout):
+        with deadline(timeout):
+            return yf.Ticker(symbol, session=yf_session()).history(timeout=timeout, **kwargs)
+
+    return latency.policy.call("yfinance.history", call, YF_TIMEOUT)
+
+
+def fetch_histories(symbols, period: str = "1y", threads: int = 8) -> dict:
+    """Unadjusted daily bars for many symbols from one multi-symbol `yf.download`, as symbol -> frame.
+
+    Frames have Open/High/Low/Close/Adj Close/Volume; symbols without bars
+    are left out. The download is tracked as its own policy host and never
+    hedged: a second copy of a large download costs more than waiting.
+    """
+    import yfinance as yf
+
+    symbols = list(symbols)
+
+    def call(timeout):
+        with deadline(timeout):
+            return yf.download(
+                symbols, period=period, interval="1d", group_by="ticker", auto_adjust=False,
+                threads=max(1, threads), progress=False, timeout=timeout, session=yf_session(),
+            )
+
+    frame = latency.policy.call("yfinance.download", call, YF_BULK_TIMEOUT, hedge=False)
+    if frame is None or frame.empty:
+        return {}
+    frames = {}
+    for symbol in dict.fromkeys(frame.columns.get_level_values(0)):
+        bars = frame[symbol].dropna(subset=["Close"])
+        if not bars.empty:
+            frames[symbol] = bars
+    return frames
+
+
+def adjusted_frame(frame):
+    """Split- and dividend-adjusted prices from an unadjusted frame, as `fetch_history` returns them."""
+    if "Adj Close" not in frame.columns:
+        return frame
+    ratio = frame["Adj Close"] / frame["Close"]
+    adjusted = frame.drop(columns=["Adj Close"])
+    for name in ("Open", "High", "Low", "Close"):
+        if name in adjusted.columns:
+            adjusted[name] = frame[name] * ratio
+    return adjusted
+
+
+def sync_histories(symbols, period: str = "1y", threads: int = 8) -> dict:
+    """Download `period` of daily bars for `symbols` in one call and store them; returns the unadjusted frames.
+
+    Each symbol's stored history is replaced by the fresh download, so
+    every stored bar shares one adjustment basis.
+    """
+    frames = fetch_histories(symbols, period, threads)
+    today = datetime.now(timezone.utc).astimezone(_EXCHANGE_TZ).date()
+    start = (period_start(period, today) or today).isoformat()
+    for symbol, frame in frames.items():
+        price_store.add(symbol, bars_from_frame(adjusted_frame(frame)), covered_from=start, replace=True)
+    return frames
+
+
+def _stale_histories(symbols: list[str], start_iso: str) -> list[str]:
+    """The symbols whose stored history cannot serve bars from `start_iso` on as it is."""
+    states = price_store.sync_states(symbols)
+    return [
+        symbol for symbol in symbols
+        if symbol not in states
+        or states[symbol].last_date is None
+        or states[symbol].covered_from > start_iso
+        or not history_is_current(states[symbol])
+    ]
+
+
+def sync_stale_histories(symbols, period: str = "1y", batch_size: int | None = None) -> int:
+    """Refresh, with multi-symbol downloads, every stored history that cannot serve `period` as it is.
+
+    Lets a caller about to read many histories pay one download per
+    `batch_size` symbols instead of one per symbol; returns how many symbols
+    were downloaded. A single stale symbol is left to `load_history`'s
+    cheaper incremental top-up, and a failed batch to the per-symbol path.
+    """
+    today = datetime.now(timezone.utc).astimezone(_EXCHANGE_TZ).date()
+    start = period_start(period, today)
+    if start is None or price_store.path is None:
+        return 0
+    stale = _stale_histories(list(dict.fromkeys(symbols)), start.isoformat())
+    if len(stale) < 2:
+        return 0
+    batch_size = HISTORY_BATCH_SIZE if batch_size is None else max(1, batch_size)
+    synced = 0
+    for i in range(0, len(stale), batch_size):
+        try:
+            synced += len(sync_histories(stale[i:i + batch_size], period))
+        except Exception as e:
+            print(f"[QUOTES] Batch history download failed: {e}")
+    return synced
+
+
+def stored_closes(symbols, period: str = "1y") -> tuple[list[tuple[str, str, float]], list[str]]:
+    """Closing prices for many symbols read from `price_store` in one query.
+
+    Returns the (symbol, ISO date, close) rows for every symbol the store
+    can serve `period` for as it is, plus the symbols it cannot (stale, never
+    synced, or a period the store does not keep), which callers load with
+    `get_history` instead.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    today = datetime.now(timezone.utc).astimezone(_EXCHANGE_TZ).date()
+    start = period_start(period, today)
+    if start is None or price_store.path is None:
+        return [], symbols
+    start_iso = start.isoformat()
+    missing = _stale_histories(symbols, start_iso)
+    skip = set(missing)
+    return price_store.closes([symbol for symbol in symbols if symbol not in skip], start_iso), missing
+
+
+def market_is_open(now: datetime | None = None) -> bool:
+    """True during NYSE regular hours (09:30-16:00 New York time, Monday-Friday; holidays ignored)."""
+    local = (now or datetime.now(timezone.utc)).astimezone(_EXCHANGE_TZ)
+    return local.weekday() < 5 and _MARKET_OPEN <= local.time() < _MARKET_CLOSE
+
+
+def last_close(now: datetime | None = None) -> datetime:
+    """The most recent weekday 16:00 New York time at or before `now` (holidays ignored)."""
+    local = (now or datetime.now(timezone.utc)).astimezone(_EXCHANGE_TZ)
+    close = datetime.combine(local.date(), _MARKET_CLOSE, tzinfo=_EXCHANGE_TZ)
+    if local < close:
+        close -= timedelta(days=1)
+    while close.weekday() >= 5:
+        close -= timedelta(days=1)
+    return close
+
+
+def period_start(period: str, today: date) -> date | None:
+    """First calendar date of a yfinance `period` ending `today`, or None if not served from the store."""
+    if period == "ytd":
+        return date(today.year, 1, 1)
+    days = _PERIOD_DAYS.get(period)
+    return today - timedelta(days=days) if days else None
+
+
+def history_is_current(state: SyncState, now: datetime | None = None) -> bool:
+    """True when stored bars cannot be missing anything the network would return.
+
+    While the market is open today's bar keeps changing, so the sync is
+    trusted for QUOTE_TTL_OPEN seconds; otherwise a sync after the last
+    close is final.
+    """
+    now = now or datetime.now(timezone.utc)
+    if market_is_open(now):
+        return now.timestamp() - state.synced_at <= QUOTE_TTL_OPEN
+    return state.synced_at >= last_close(now).timestamp()
+
+
+def bars_from_frame(frame) -> list[PriceBar]:
+    """Daily bars from a yfinance history frame (rows without a close are dropped)."""
+    if frame is None or frame.empty:
+        return []
+    frame = frame.dropna(subset=["Close"])
+    columns = [
+        frame[name].astype(float).tolist() if name in frame.columns else [None] * len(frame)
+        for name in ("Open", "High", "Low", "Close", "Volume")
+    ]
+    return [PriceBar(_session_date(ts), *values) for ts, *values in zip(frame.index, *columns)]
+
+
+def _session_date(ts) -> str:
+    try:
+        return ts.date().isoformat()
+    except AttributeError:
+        return str(ts)[:10]
+
+
+def has_corporate_action(frame, after: str) -> bool:
+    """True when `frame` reports a dividend or split on a session after `after` (ISO date).
+
+    yfinance adjusts all earlier prices for these, so bars stored before
+    one no longer match bars downloaded after it.
+    """
+    if frame is None or frame.empty:
+        return False
+    columns = [name for name in ("Dividends", "Stock Splits") if name in frame.columns]
+    if not columns:
+        return False
+    newer = [_session_date(ts) > after for ts in frame.index]
+    return bool((frame.loc[newer, columns].fillna(0) != 0).to_numpy().any())
+
+
+def frame_from_bars(bars: list[PriceBar]):
+    """A history frame shaped like yfinance's (Date index; Open/High/Low/Close/Volume)."""
+    import pandas as pd
+
+    frame = pd.DataFrame(
+        [bar[1:] for bar in bars], columns=["Open", "High", "Low", "Close", "Volume"], dtype=float
+    )
+    frame.index = pd.DatetimeIndex([bar.date for bar in bars], name="Date")
+    return frame
+
+
+def load_history(symbol: str, period: str = "1y", interval: str = "1d"):
+    """History for `symbol`, served from `price_store` when the period is a daily one.
+
+    A first request (or one reaching further back than the stored range)
+    downloads the whole period; later ones download only the bars from the
+    last stored date on, and none at all when `history_is_current`. A top-up
+    that brings a split or dividend re-downloads the whole stored range
+    instead, since yfinance re-adjusts every earlier bar for it. If the
+    top-up fails the stored bars are served as they are.
+    """
+    today = datetime.now(timezone.utc).astimezone(_EXCHANGE_TZ).date()
+    start = period_start(period, today) if interval == "1d" else None
+    if start is None or price_store.path is None:
+        return fetch_history(symbol, period=period, interval=interval)
+
+    start_iso = start.isoformat()
+    state = price_store.sync_state(symbol)
+    if state is None or state.last_date is None or state.covered_from > start_iso:
+        frame = fetch_history(symbol, period=period, interval="1d")
+        bars = bars_from_frame(frame)
+        if not bars:
+            return frame
+        price_store.add(symbol, bars, covered_from=start_iso)
+    elif not history_is_current(state):
+        try:
+            frame = fetch_history(symbol, start=state.last_date, interval="1d")
+            if has_corporate_action(frame, after=state.last_date):
+                print(f"[QUOTES] {symbol} had a split or dividend; re-downloading its stored history")
+                bars = bars_from_frame(fetch_history(symbol, start=state.covered_from, interval="1d"))
+                if bars:
+                    price_store.add(symbol, bars, covered_from=state.covered_from, replace=True)
+            else:
+                price_store.add(symbol, bars_from_frame(frame), covered_from=state.covered_from)
+        except Exception as e:
+            print(f"[QUOTES] Could not top up {symbol} history, serving stored bars: {e}")
+    return frame_from_bars(price_store.bars(symbol, start_iso))
+
+
+def _cacheable(value: Any) -> bool:
+    """Empty results (unknown ticker, rate-limited response) are not cached."""
+    return value is not None and not getattr(value, "empty", False) and (not isinstance(value, dict) or bool(value))
+
+
+class QuoteService:
+    """In-memory TTL cache with single-flight loading, keyed by (kind, symbol, params)."""
+
+    def __init__(
+        self,
+        ttl_open: float = QUOTE_TTL_OPEN,
+        ttl_closed: float = QUOTE_TTL_CLOSED,
+        max_entries: int = QUOTE_CACHE_MAX_ENTRIES,
+        is_open: Callable[[], bool] = market_is_open,
+    ) -> None:
+        self.ttl_open = ttl_open
+        self.ttl_closed = ttl_closed
+        self.max_entries = max_entries
+        self.is_open = is_open
+        self._entries: OrderedDict[tuple, tuple[Any, float]] = OrderedDict()
+        self._inflight: dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def ttl(self) -> float:
+        return self.ttl_open if self.is_open() else self.ttl_closed
+
+    def _get(self, key: tuple, load: Callable[[], Any]) -> Any:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not owner:
+            return future.result()
+
+        try:
+            value = load()
+        except BaseException as exc:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            del self._inflight[key]
+            if _cacheable(value):
+                self._entries[key] = (value, time.time() + self.ttl())
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        future.set_result(value)
+        return value
+
+    def get_info(self, symbol: str):
+        symbol = symbol.strip().upper()
+        return self._get(("info", symbol), lambda: fetch_info(symbol))
+
+    def get_history(self, symbol: str, period: str = "1y", interval: str = "1d"):
+        symbol = symbol.strip().upper()
+        return self._get(
+            ("history", symbol, period, interval), lambda: load_history(symbol, period, interval)
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int | str | bool]:
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "namespace": "quotes",
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_rate_pct": round(100 * (self.hits + self.coalesced) / lookups) if lookups else 0,
+                "entries": len(self._entries),
+                "market_open": self.is_open(),
+            }
+
+
+service = QuoteService()
+
+
+def get_info(symbol: str):
+    """Cached `yf.Ticker(symbol).info`."""
+    return service.get_info(symbol)
+
+
+def get_history(symbol: str, period: str = "1y", interval: str = "1d"):
+    """Cached `yf.Ticker(symbol).history(period=..., interval=...)`."""
+    return service.get_history(symbol, period, interval)
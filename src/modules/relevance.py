@@ -0,0 +1,178 @@
+"""BM25 ranking of candidate articles against a company query.
+
+The query is expanded from the company name to its ticker and the aliases
+in the bundled symbol table, each with its own weight; multi-word names are
+matched as phrases. Scores for every candidate are computed at once with
+NumPy, and per-article tokenization is cached so re-ranking the same
+candidates (another company, a retry) does not tokenize them again.
+"""
+from __future__ import annotations
+
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import NamedTuple, Sequence
+
+from src.modules.ticker_resolver import GENERIC_COMPANY_WORDS, company_aliases, normalize_company, resolve_ticker
+
+# Articles summarized per report
+NEWS_TOP_K = int(os.getenv("NEWS_TOP_K", "5"))
+# Drop candidates scoring below this fraction of the best one
+NEWS_MIN_RELATIVE_SCORE = float(os.getenv("NEWS_MIN_RELATIVE_SCORE", "0.2"))
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+NAME_WEIGHT = 2.0
+TICKER_WEIGHT = 1.5
+ALIAS_WEIGHT = 1.0
+WORD_WEIGHT = 0.5
+
+_STOPWORDS = {"a", "an", "and", "for", "in", "of", "on", "the", "to", "with"}
+_POSSESSIVE = re.compile(r"['’]s\b")
+_JOINERS = re.compile(r"(?<=\w)[.'’&](?=\w)")
+_WORD = re.compile(r"\w+")
+
+
+class QueryTerm(NamedTuple):
+    tokens: tuple[str, ...]
+    weight: float
+
+
+class RankedArticle(NamedTuple):
+    index: int
+    score: float
+
+
+def tokenize(text: str) -> tuple[str, ...]:
+    """Lowercase word tokens, folding "AT&T" -> "att" and dropping possessive 's."""
+    text = _JOINERS.sub("", _POSSESSIVE.sub("", (text or "").lower()))
+    return tuple(_WORD.findall(text))
+
+
+class _DocIndex(NamedTuple):
+    length: int
+    counts: Counter
+    positions: dict[str, list[int]]
+
+
+@lru_cache(maxsize=512)
+def _index(text: str) -> _DocIndex:
+    tokens = tokenize(text)
+    positions: dict[str, list[int]] = {}
+    for pos, token in enumerate(tokens):
+        positions.setdefault(token, []).append(pos)
+    return _DocIndex(len(tokens), Counter(tokens), positions)
+
+
+def _phrase_count(doc: _DocIndex, tokens: tuple[str, ...]) -> int:
+    if len(tokens) == 1:
+        return doc.counts.get(tokens[0], 0)
+    starts = doc.positions.get(tokens[0], ())
+    if not starts:
+        return 0
+    following = [set(doc.positions.get(token, ())) for token in tokens[1:]]
+    return sum(all(pos + offset in seen for offset, seen in enumerate(following, start=1)) for pos in starts)
+
+
+def query_terms(company_name: str) -> tuple[list[QueryTerm], str | None]:
+    """Weighted phrases for `company_name` plus its ticker (None when unknown)."""
+    terms: dict[tuple[str, ...], float] = {}
+
+    def add(phrase: str, weight: float) -> None:
+        tokens = tokenize(phrase)
+        if tokens and weight > terms.get(tokens, 0.0):
+            terms[tokens] = weight
+
+    name = normalize_company(company_name or "")
+    add(name, NAME_WEIGHT)
+
+    ticker = None
+    match = resolve_ticker(company_name) if company_name else None
+    if match is not None and match.tier != "fuzzy":
+        ticker = match.symbol
+        for alias in company_aliases(ticker):
+            add(alias, ALIAS_WEIGHT)
+
+    # Distinctive single words of a multi-word name ("sachs" in "goldman sachs")
+    words = tokenize(name)
+    for word in words if len(words) > 1 else ():
+        if word not in _STOPWORDS and word not in GENERIC_COMPANY_WORDS and len(word) > 2:
+            add(word, WORD_WEIGHT)
+
+    return [QueryTerm(tokens, weight) for tokens, weight in terms.items()], ticker
+
+
+def _ticker_counts(texts: Sequence[str], ticker: str) -> list[int]:
+    """Case-sensitive mentions of the ticker ("AAPL", "$AAPL", "NASDAQ:AAPL")."""
+    if len(ticker) < 2:
+        return [0] * len(texts)
+    pattern = re.compile(rf"(?<![\w.-])\$?{re.escape(ticker)}(?![\w-])")
+    return [len(pattern.findall(text or "")) for text in texts]
+
+
+def is_relevant(text: str, company_name: str) -> bool:
+    """True when `text` mentions the company by name, alias or ticker.
+
+    Needs no other candidates, so articles can be judged one at a time as
+    they arrive.
+    """
+    terms, ticker = query_terms(company_name)
+    doc = _index(text or "")
+    if any(_phrase_count(doc, term.tokens) for term in terms):
+        return True
+    return bool(ticker) and _ticker_counts([text], ticker)[0] > 0
+
+
+def rank_articles(texts: Sequence[str], company_name: str) -> list[RankedArticle]:
+    """Score every text with BM25 over the company's weighted query; best first."""
+    import numpy as np
+
+    if not texts:
+        return []
+    terms, ticker = query_terms(company_name)
+    docs = [_index(text or "") for text in texts]
+
+    columns = [[_phrase_count(doc, term.tokens) for doc in docs] for term in terms]
+    weights = [term.weight for term in terms]
+    if ticker:
+        columns.append(_ticker_counts(texts, ticker))
+        weights.append(TICKER_WEIGHT)
+    if not columns:
+        return [RankedArticle(i, 0.0) for i in range(len(texts))]
+
+    tf = np.array(columns, dtype=float).T  # (docs, terms)
+    lengths = np.array([doc.length for doc in docs], dtype=float)
+    avg_length = lengths.mean() or 1.0
+
+    n_docs = len(texts)
+    doc_freq = (tf > 0).sum(axis=0)
+    idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / avg_length)
+    saturated = tf * (BM25_K1 + 1) / (tf + norm[:, None])
+    scores = saturated @ (idf * np.array(weights))
+
+    order = sorted(range(n_docs), key=lambda i: (-scores[i], i))
+    return [RankedArticle(i, float(scores[i])) for i in order]
+
+
+def select_articles(
+    texts: Sequence[str],
+    company_name: str,
+    k: int | None = None,
+    min_relative_score: float | None = None,
+) -> list[str]:
+    """Return the `k` most relevant texts, best first.
+
+    Texts scoring below `min_relative_score` of the best are dropped so weak
+    matches are not summarized; if nothing matches at all, the first `k`
+    texts are returned in their original order.
+    """
+    k = NEWS_TOP_K if k is None else k
+    min_relative_score = NEWS_MIN_RELATIVE_SCORE if min_relative_score is None else min_relative_score
+    ranked = rank_articles(texts, company_name)
+    if not ranked or ranked[0].score <= 0:
+        return list(texts[:k])
+    cutoff = ranked[0].score * min_relative_score
+    return [texts[r.index] for r in ranked[:k] if r.score >= cutoff and r.score > 0]
@@ -1,10 +1,29 @@
-import yfinance as yf
+from src.modules import quote_service
+
+
+def snapshot_from_info(info):
+    """The stock snapshot fields used by the pipeline and `stock_snapshots` from a yfinance info dict."""
+    return {
+        "ticker": info.get('symbol', 'N/A'),
+        "longName": info.get('longName', 'N/A'),
+        "sector": info.get('sector', 'N/A'),
+        "industry": info.get('industry', 'N/A'),
+        "currentPrice": info.get('currentPrice', 'N/A'),
+        "marketCap": info.get('marketCap', 'N/A'),
+        "trailingPE": info.get('trailingPE', 'N/A'),
+        "dividendYield": info.get('dividendYield', 'N/A'),
+        "52WeekHigh": info.get('fiftyTwoWeekHigh', 'N/A'),
+        "52WeekLow": info.get('fiftyTwoWeekLow', 'N/A'),
+        "totalRevenue": info.get('totalRevenue', 'N/A'),
+        "freeCashflow": info.get('freeCashflow', 'N/A'),
+        "website": info.get('website', 'N/A'),
+    }
+
 
 def get_stock_info(ticker):
     """Fetch and return stock information as a dictionary."""
     try:
-        t = yf.Ticker(ticker)
-        info = t.info
+        info = quote_service.get_info(ticker)
         
         sections = {
             "Company Info": ["longName", "shortName", "symbol", "industry", "sector", "website"],
@@ -0,0 +1,176 @@
+"""Linear-time, token-budgeted text chunking for LLM summarization.
+
+The text is cut into the fewest chunks a greedy word-by-word fill needs,
+and within that count each cut is placed at the coarsest boundary it can
+move to: a paragraph break, then a sentence end, and only then a plain
+word gap. Every word is measured once, so chunking is O(n) in the text
+length. Token counts come from a pluggable `count_tokens` callable; the
+default is a fast characters-per-token approximation, applied to the
+chunk's total length rather than to each piece.
+"""
+from __future__ import annotations
+
+import re
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Callable, Iterable, Iterator
+
+TokenCounter = Callable[[str], int]
+
+# Rough average for English prose with GPT-style BPE tokenizers
+CHARS_PER_TOKEN = 4
+
+_PARAGRAPH_SPLIT = re.compile(r"\n+")
+_GAP = re.compile(r"[ \n]")
+_SENTENCE_ENDS = (". ", "! ", "? ")
+
+
+def approx_token_count(text: str) -> int:
+    """Cheap token estimate: one token per CHARS_PER_TOKEN characters."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def tiktoken_counter(encoding: str = "o200k_base") -> TokenCounter | None:
+    """Return an exact counter backed by tiktoken, or None if it is not installed."""
+    try:
+        import tiktoken
+    except Exception:
+        return None
+    enc = tiktoken.get_encoding(encoding)
+    return lambda text: len(enc.encode(text, disallowed_special=()))
+
+
+def _cost_model(max_tokens: int, count_tokens: TokenCounter) -> tuple[TokenCounter, int, int]:
+    """Return (cost, separator_cost, budget) in the units pieces are summed in.
+
+    With the default estimate, pieces are summed in characters (separators
+    included) against max_tokens * CHARS_PER_TOKEN, so rounding happens once
+    per chunk instead of once per piece.
+    """
+    if count_tokens is approx_token_count:
+        return len, 1, max_tokens * CHARS_PER_TOKEN
+    return count_tokens, 0, max_tokens
+
+
+def _find_gap(text: str, lo: int, hi: int) -> int:
+    """Offset of the first separator in text[lo:hi], or -1."""
+    found = [at for at in (text.find(" ", lo, hi), text.find("\n", lo, hi)) if at >= 0]
+    return min(found) if found else -1
+
+
+def _rfind_gap(text: str, lo: int, hi: int) -> int:
+    """Offset of the last separator in text[lo:hi], or -1."""
+    return max(text.rfind(" ", lo, hi), text.rfind("\n", lo, hi))
+
+
+def _char_bounds(text: str, budget: int) -> tuple[Callable[[int], int], Callable[[int], int]]:
+    """Cut finders for a character budget, using only string searches."""
+    size = len(text)
+
+    def reach(cut: int) -> int:
+        start = cut + 1
+        if size - start <= budget:
+            return size
+        end = _rfind_gap(text, start, start + budget + 1)
+        if end < 0:
+            end = _find_gap(text, start, size)
+        return size if end < 0 else end
+
+    def back(cut: int) -> int:
+        if cut <= budget:
+            return -1
+        start = _find_gap(text, cut - budget - 1, cut)
+        return start if start >= 0 else _rfind_gap(text, 0, cut)
+
+    return reach, back
+
+
+def _token_bounds(text: str, budget: int, count_tokens: TokenCounter) -> tuple[Callable[[int], int], Callable[[int], int]]:
+    """Cut finders for a token budget, summing a per-word count."""
+    # gaps[i]: offset of the separator after word i (the last one is the end of text)
+    gaps = [m.start() for m in _GAP.finditer(text)]
+    gaps.append(len(text))
+    prefix = list(accumulate(map(count_tokens, text.split()), initial=0))
+
+    def reach(cut: int) -> int:
+        first = bisect_right(gaps, cut)
+        return gaps[max(first + 1, bisect_right(prefix, prefix[first] + budget) - 1) - 1]
+
+    def back(cut: int) -> int:
+        end = bisect_left(gaps, cut) + 1
+        first = min(end - 1, bisect_left(prefix, prefix[end] - budget))
+        return gaps[first - 1] if first else -1
+
+    return reach, back
+
+
+def _last_break(text: str, lo: int, hi: int) -> int:
+    """Offset of the last paragraph break, else sentence end, in text[lo:hi + 1]; -1 if none."""
+    at = text.rfind("\n", lo, hi + 1)
+    if at >= 0:
+        return at
+    return max(text.rfind(end, lo - 1, hi + 1) for end in _SENTENCE_ENDS) + 1 or -1
+
+
+def iter_chunks(
+    text: str,
+    max_tokens: int,
+    count_tokens: TokenCounter = approx_token_count,
+) -> Iterator[str]:
+    """Yield chunks of `text` of at most `max_tokens`, cut at the coarsest boundary that fits.
+
+    The number of chunks is the same as a greedy word-by-word fill gives;
+    boundary preference only decides where each cut goes inside that slack.
+    Whitespace is normalized to single spaces and newlines, and a single
+    word larger than the budget becomes a chunk of its own.
+    """
+    text = "\n".join(" ".join(p.split()) for p in _PARAGRAPH_SPLIT.split(text or "") if p.strip())
+    if not text:
+        return
+    # A cut is the offset of the separator a chunk ends on; -1 and len(text) bracket the text
+    cost, _, budget = _cost_model(max_tokens, count_tokens)
+    reach, back = _char_bounds(text, budget) if cost is len else _token_bounds(text, budget, cost)
+
+    # tails[k]: earliest cut after which the rest of the text fits in k chunks
+    tails = [len(text)]
+    while tails[-1] >= 0:
+        tails.append(back(tails[-1]))
+
+    prev = -1
+    for left in range(len(tails) - 2, -1, -1):
+        # any cut in [tails[left], reach(prev)] keeps the chunk count at its minimum
+        cut = reach(prev)
+        if cut < len(text):
+            at = _last_break(text, tails[left], cut)
+            if at >= 0:
+                cut = at
+        yield text[prev + 1:cut]
+        prev = cut
+
+
+def pack_texts(
+    texts: Iterable[str],
+    max_tokens: int,
+    count_tokens: TokenCounter = approx_token_count,
+) -> Iterator[list[tuple[int, str]]]:
+    """Group several texts into request-sized batches of (index, text) pairs.
+
+    Small texts are packed together in order; a text larger than the budget
+    is chunked and each of its chunks becomes a batch of its own.
+    """
+    cost, sep, budget = _cost_model(max_tokens, count_tokens)
+    batch: list[tuple[int, str]] = []
+    total = 0
+    for idx, text in enumerate(texts):
+        size = cost(text)
+        if size > budget:
+            for chunk in iter_chunks(text, max_tokens, count_tokens):
+                yield [(idx, chunk)]
+            continue
+        if batch and total + sep + size > budget:
+            yield batch
+            batch, total = [], 0
+        total += size + (sep if batch else 0)
+        batch.append((idx, text))
+    if batch:
+        yield batch
@@ -0,0 +1,224 @@
+"""Local company-name -> ticker resolution backed by the bundled symbol table.
+
+Lookups try, in order: an input that already is a ticker, exact company
+name, alias, and a trigram fuzzy match. A fuzzy match is a candidate the
+pipeline still has the LLM confirm. Answers obtained elsewhere (the
+LLM fallback in the pipeline) are written back with `remember_ticker` so
+the next lookup for the same name is local as well.
+"""
+from __future__ import annotations
+
+import csv
+import os
+import re
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+from src.core.cache import DEFAULT_CACHE_DIR, TwoTierCache, make_key
+
+DATA_DIR = Path(__file__).resolve().parents[2] / "data"
+SYMBOLS_CSV = DATA_DIR / "symbols.csv"
+
+FUZZY_THRESHOLD = float(os.getenv("TICKER_FUZZY_THRESHOLD", "0.6"))
+# Short names share only a few trigrams with anything, so a fuzzy score means
+# little ("amc" scores 0.6 against "amcor"); they need a much closer match
+SHORT_NAME_CHARS = 5
+SHORT_FUZZY_THRESHOLD = float(os.getenv("TICKER_SHORT_FUZZY_THRESHOLD", "0.85"))
+
+# Persistent store for answers the local table could not provide
+ticker_cache = TwoTierCache(
+    namespace="tickers",
+    path=os.getenv("TICKER_CACHE_PATH", str(DEFAULT_CACHE_DIR / "tickers.sqlite3")) or None,
+    ttl_seconds=float(os.getenv("TICKER_CACHE_TTL", str(30 * 24 * 3600))),
+    max_memory_bytes=1024 * 1024,
+)
+
+# Corporate suffixes that do not help tell companies apart
+_SUFFIXES = {
+    "inc", "incorporated", "corp", "corporation", "company", "companies", "co",
+    "plc", "ltd", "limited", "llc", "holdings", "group", "the",
+}
+
+# Words too generic to identify a company on their own
+GENERIC_COMPANY_WORDS = {
+    "air", "american", "applied", "advanced", "bank", "best", "digital", "equity",
+    "extra", "federal", "first", "general", "global", "home", "host", "international",
+    "iron", "live", "news", "old", "public", "royal", "southern", "state", "steel",
+    "trade", "united", "universal", "west", "western",
+}
+
+_SYMBOL_RE = re.compile(r"^[A-Z]{1,5}([.-][A-Z])?$")
+
+
+class TickerMatch(NamedTuple):
+    symbol: str
+    tier: str
+    score: float
+
+
+def normalize_company(name: str) -> str:
+    """Lowercase, strip accents/punctuation and trailing corporate suffixes."""
+    text = unicodedata.normalize("NFKD", name)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    text = re.sub(r"\(.*?\)", " ", text)
+    text = re.sub(r"[.'’&]", "", text)
+    text = re.sub(r"[^a-z0-9]+", " ", text)
+    tokens = text.split()
+    while tokens and tokens[0] == "the":
+        tokens.pop(0)
+    while len(tokens) > 1 and tokens[-1] in _SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _SymbolIndex:
+    """In-memory lookup tables built once from the bundled CSV."""
+
+    def __init__(self, rows: list[dict[str, str]]) -> None:
+        self.names: dict[str, str] = {}
+        self.aliases: dict[str, str] = {}
+        self.symbols: dict[str, str] = {}
+        self.keys_by_symbol: dict[str, list[str]] = {}
+        self.keys: list[tuple[str, str, int]] = []
+        self.grams: dict[str, set[int]] = {}
+
+        first_words: dict[str, set[str]] = {}
+        for row in rows:
+            symbol = row["symbol"].strip().upper()
+            self.symbols[symbol] = row["name"]
+            name_key = normalize_company(row["name"])
+            self.names.setdefault(name_key, symbol)
+            self._add_key(name_key, symbol)
+            for alias in filter(None, (row.get("aliases") or "").split(";")):
+                alias_key = normalize_company(alias)
+                self.aliases.setdefault(alias_key, symbol)
+                self._add_key(alias_key, symbol)
+            first = name_key.split(" ", 1)[0]
+            first_words.setdefault(first, set()).add(symbol)
+
+        # A distinctive first word ("Goldman", "Lockheed") is an alias by itself
+        for word, symbols in first_words.items():
+            if len(symbols) == 1 and len(word) >= 3 and word not in GENERIC_COMPANY_WORDS:
+                symbol = next(iter(symbols))
+                self.aliases.setdefault(word, symbol)
+                if word not in self.keys_by_symbol[symbol]:
+                    self.keys_by_symbol[symbol].append(word)
+
+    def _add_key(self, key: str, symbol: str) -> None:
+        names = self.keys_by_symbol.setdefault(symbol, [])
+        if key not in names:
+            names.append(key)
+        idx = len(self.keys)
+        grams = _trigrams(key)
+        self.keys.append((key, symbol, len(grams)))
+        for gram in grams:
+            self.grams.setdefault(gram, set()).add(idx)
+
+    def fuzzy(self, key: str, threshold: float) -> TickerMatch | None:
+        """Return the best Dice-coefficient trigram match above `threshold`."""
+        query = _trigrams(key)
+        overlap: dict[int, int] = {}
+        for gram in query:
+            for idx in self.grams.get(gram, ()):
+                overlap[idx] = overlap.get(idx, 0) + 1
+
+        best: TickerMatch | None = None
+        for idx, shared in overlap.items():
+            _, symbol, size = self.keys[idx]
+            score = 2 * shared / (len(query) + size)
+            if score >= threshold and (best is None or score > best.score):
+                best = TickerMatch(symbol, "fuzzy", round(score, 3))
+        return best
+
+
+@lru_cache(maxsize=1)
+def _load_index() -> _SymbolIndex:
+    rows: list[dict[str, str]] = []
+    try:
+        with open(SYMBOLS_CSV, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+    except OSError as exc:
+        print(f"[TICKER] Could not read symbol table {SYMBOLS_CSV}: {exc}")
+    return _SymbolIndex(rows)
+
+
+def tracked_symbols() -> dict[str, str]:
+    """Every bundled ticker with its company name, in symbol-table order."""
+    return dict(_load_index().symbols)
+
+
+def _canonical_symbol(text: str) -> str:
+    return text.strip().upper().replace(".", "-")
+
+
+def is_known_symbol(text: str) -> bool:
+    """True when `text` is a bundled ticker or one previously learned via the LLM."""
+    symbol = _canonical_symbol(text)
+    if not _SYMBOL_RE.match(symbol):
+        return False
+    if symbol in _load_index().symbols:
+        return True
+    return ticker_cache.get(make_key("symbol", symbol)) is not None
+
+
+def resolve_ticker(name: str, fuzzy_threshold: float | None = None) -> TickerMatch | None:
+    """Resolve `name` to a ticker without any network call, or return None."""
+    if not name or not name.strip():
+        return None
+    index = _load_index()
+    raw = name.strip()
+
+    # Already a ticker symbol (e.g. the pipeline passing a resolved ticker back in)
+    if raw.upper() == raw and is_known_symbol(raw):
+        return TickerMatch(_canonical_symbol(raw), "symbol", 1.0)
+
+    key = normalize_company(raw)
+    if not key:
+        return None
+    if key in index.names:
+        return TickerMatch(index.names[key], "exact", 1.0)
+    if key in index.aliases:
+        return TickerMatch(index.aliases[key], "alias", 1.0)
+
+    cached = ticker_cache.get(make_key("name", key))
+    if cached is not None:
+        return TickerMatch(cached, "cache", 1.0)
+
+    if " " not in raw and is_known_symbol(raw):
+        return TickerMatch(_canonical_symbol(raw), "symbol", 1.0)
+
+    if key in GENERIC_COMPANY_WORDS:
+        return None
+    threshold = FUZZY_THRESHOLD if fuzzy_threshold is None else fuzzy_threshold
+    if len(key) <= SHORT_NAME_CHARS:
+        threshold = max(threshold, SHORT_FUZZY_THRESHOLD)
+    return index.fuzzy(key, threshold)
+
+
+@lru_cache(maxsize=1)
+def known_company_keys() -> frozenset[str]:
+    """Normalized names and aliases of every company in the bundled table."""
+    index = _load_index()
+    return frozenset(index.names) | frozenset(index.aliases)
+
+
+def company_aliases(symbol: str) -> list[str]:
+    """Normalized name and aliases the bundled table knows for `symbol` (name first)."""
+    return list(_load_index().keys_by_symbol.get(_canonical_symbol(symbol), []))
+
+
+def remember_ticker(name: str, symbol: str) -> None:
+    """Persist an externally resolved ticker so future lookups stay local."""
+    symbol = _canonical_symbol(symbol)
+    key = normalize_company(name)
+    if not key or not _SYMBOL_RE.match(symbol):
+        return
+    ticker_cache.set(make_key("name", key), symbol)
+    ticker_cache.set(make_key("symbol", symbol), symbol)
@@ -0,0 +1,123 @@
+"""Tests for the local article store and the watchlist prefetcher."""
+from __future__ import annotations
+
+import sqlite3
+import time
+from contextlib import closing
+
+from src.core.article_store import ArticleStore, match_expression
+from src.modules import news_fetcher, news_prefetcher
+from src.modules.news_sources import Article, canonical_url
+
+BODY = " Shares moved as investors weighed the quarter's results and guidance." * 3
+
+
+def _article(i, company="Apple", url=None):
+    return Article(url or f"https://www.bbc.com/news/articles/{company.lower()}{i}", f"{company} story {i}",
+                   f"{company} news number {i}." + BODY, "bbc")
+
+
+def test_search_ranks_matches_and_skips_duplicates(tmp_path):
+    store = ArticleStore(tmp_path / "news.sqlite3")
+    apple = _article(1)
+    repost = apple._replace(url=apple.url + "?utm_source=rss")
+    copy = apple._replace(url="https://example.com/copy")
+
+    added = store.add("Apple", [apple, repost, copy, _article(2, "Microsoft")], url_key=canonical_url)
+
+    assert added == 2
+    assert [a.url for a in store.search(["apple"])] == [apple.url]
+    assert [a.title for a in store.search(["alphabet", "microsoft"])] == ["Microsoft story 2"]
+    assert store.search(['"unbalanced (query']) == []
+    assert store.stats()["articles"] == 2
+
+
+def test_topics_go_stale_and_old_articles_are_pruned(tmp_path):
+    store = ArticleStore(tmp_path / "news.sqlite3", max_age=60)
+    store.add("Apple Inc.", [_article(1)])
+
+    assert store.is_fresh("apple inc", ttl_seconds=60)
+    assert not store.is_fresh("apple inc", ttl_seconds=-1)
+    assert not store.is_fresh("Tesla", ttl_seconds=60)
+    assert store.search(["apple"], max_age=-1) == []
+
+    store.max_age = -1
+    store.add("Tesla", [_article(1, "Tesla")])
+    assert store.stats()["articles"] == 0
+
+
+def test_recrawled_articles_are_refreshed_not_duplicated(tmp_path):
+    store = ArticleStore(tmp_path / "news.sqlite3", max_age=3600)
+    apple = _article(1)
+    store.add("Apple", [apple])
+    with closing(sqlite3.connect(tmp_path / "news.sqlite3")) as conn, conn:
+        conn.execute("UPDATE articles SET fetched_at = ?", (time.time() - 600,))
+    assert store.search(["apple"], max_age=60) == []
+
+    assert store.add("Apple", [apple._replace(url=apple.url + "?at_medium=RSS")], url_key=canonical_url) == 0
+    assert [a.url for a in store.search(["apple"], max_age=60)] == [apple.url]
+    assert store.stats()["articles"] == 1
+
+
+def test_match_expression_quotes_phrases():
+    assert match_expression(["Goldman Sachs", "goldman-sachs", 'a "b"', ""]) == '"goldman sachs" OR "a b"'
+
+
+def test_get_news_content_reads_fresh_store_before_network(tmp_path, monkeypatch):
+    store = ArticleStore(tmp_path / "news.sqlite3")
+    monkeypatch.setattr(news_fetcher, "article_store", store)
+    crawls = []
+
+    def fake_stream(topic, sources, limit=5, is_relevant=None, buffer=None):
+        crawls.append(topic)
+        yield from (_article(i) for i in range(3))
+
+    monkeypatch.setattr("src.modules.news_sources.stream_articles", fake_stream)
+    monkeypatch.setattr("src.modules.news_sources.default_sources", lambda: [])
+
+    first = news_fetcher.get_news_content("Apple", max_articles=3)
+    second = news_fetcher.get_news_content("Apple", max_articles=3)
+
+    assert crawls == ["Apple"]
+    assert sorted(first) == sorted(second)
+
+    monkeypatch.setattr(news_fetcher, "NEWS_STORE_TTL", -1)
+    monkeypatch.setattr("src.modules.news_sources.stream_articles", lambda *a, **k: (a for a in ()))
+    assert sorted(news_fetcher.get_news_content("Apple", max_articles=3)) == sorted(first)
+
+
+def test_prefetch_crawls_only_stale_companies(tmp_path, monkeypatch):
+    watchlist = tmp_path / "companies.csv"
+    watchlist.write_text("Apple\nTesla\n\nApple\nNvidia\n", encoding="utf-8")
+    store = ArticleStore(tmp_path / "news.sqlite3")
+    store.add("Tesla", [_article(1, "Tesla")])
+    monkeypatch.setattr(news_fetcher, "article_store", store)
+    crawled = []
+    monkeypatch.setattr(news_fetcher, "crawl_topic", lambda topic, max_articles=5: crawled.append(topic))
+
+    companies = news_prefetcher.load_watchlist(watchlist)
+    count = news_prefetcher.prefetch_once(companies, max_workers=1)
+
+    assert companies == ["Apple", "Tesla", "Nvidia"]
+    assert count == 2
+    assert crawled == ["Apple", "Nvidia"]
+
+
+def test_default_watchlist_is_every_tracked_company():
+    companies = news_prefetcher.load_watchlist(None)
+
+    assert {"Apple", "Tesla", "Alphabet", "JPMorgan Chase", "ON Semiconductor"} <= set(companies)
+    assert "on" not in companies and len(companies) == len(set(companies))
+    assert news_prefetcher.short_company_name("Tesla, Inc.") == "Tesla"
+
+
+def test_prefetcher_thread_runs_and_stops(monkeypatch):
+    passes = []
+    monkeypatch.setattr(news_prefetcher, "prefetch_once", lambda companies, stop=None: passes.append(companies))
+
+    prefetcher = news_prefetcher.NewsPrefetcher(["Apple"], interval=0.01).start()
+    time.sleep(0.1)
+    prefetcher.stop(timeout=1)
+
+    assert passes and passes[0] == ["Apple"]
+    assert not prefetcher._thread.is_alive()
@@ -0,0 +1,73 @@
+"""Tests for the two-tier summary cache."""
+from __future__ import annotations
+
+import sqlite3
+import time
+
+import pytest
+
+from src.core.cache import TwoTierCache, make_key
+
+
+def test_disk_tier_survives_new_instance(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    key = make_key("article text", "Apple", "model", "1")
+
+    first = TwoTierCache("summaries", path, ttl_seconds=60)
+    assert first.get(key) is None
+    first.set(key, "cached summary")
+
+    second = TwoTierCache("summaries", path, ttl_seconds=60)
+    assert second.get(key) == "cached summary"
+    assert second.get(key) == "cached summary"
+    assert second.stats()["disk_hits"] == 1
+    assert second.stats()["memory_hits"] == 1
+    assert first.stats()["misses"] == 1
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = TwoTierCache("summaries", None, ttl_seconds=60, max_memory_bytes=10)
+    cache.set("a", "12345")
+    cache.set("b", "12345")
+    cache.get("a")
+    cache.set("c", "12345")
+
+    assert cache.get("a") == "12345"
+    assert cache.get("b") is None
+    assert cache.stats()["memory_bytes"] <= 10
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = TwoTierCache("summaries", tmp_path / "cache.sqlite3", ttl_seconds=0.05)
+    cache.set("k", "v")
+    time.sleep(0.1)
+    assert cache.get("k") is None
+
+
+def test_key_depends_on_every_part():
+    assert make_key("text", "Apple", "m", "1") != make_key("text", "Apple", "m", "2")
+    assert make_key("text", None) == make_key("text", "")
+
+
+def test_memory_budget_counts_utf8_bytes():
+    cache = TwoTierCache("summaries", None, ttl_seconds=60, max_memory_bytes=10)
+    cache.set("a", "€€€")  # 3 characters, 9 bytes
+    cache.set("b", "12")
+
+    assert cache.get("a") is None
+    assert cache.stats()["memory_bytes"] == 2
+
+
+def test_disk_connections_are_closed(tmp_path):
+    cache = TwoTierCache("summaries", tmp_path / "cache.sqlite3", ttl_seconds=60)
+    opened = []
+    connect = cache._connect
+    cache._connect = lambda: opened.append(connect()) or opened[-1]
+    cache.set("k", "v")
+    cache.get("missing")
+    cache.clear()
+
+    assert len(opened) == 3
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
@@ -0,0 +1,98 @@
+"""Tests for columnar, resampled and downsampled chart payloads."""
+from __future__ import annotations
+
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from src.modules import quote_service
+from src.modules.chart_data import chart_payload, lttb_indices, resample
+
+
+def _daily(days: int, tz: str | None = "America/New_York"):
+    index = pd.bdate_range("2023-01-02", periods=days, tz=tz, name="Date")
+    close = 100 + 10 * np.sin(np.arange(days) / 15)
+    return pd.DataFrame(
+        {"Open": close - 1, "High": close + 2, "Low": close - 2, "Close": close, "Volume": 1000.0}, index=index
+    )
+
+
+def test_weekly_and_monthly_bars_roll_up_ohlcv():
+    frame = _daily(10)  # Mon 2023-01-02 .. Fri 2023-01-13
+    weekly = resample(frame, "1wk")
+    assert [str(ts.date()) for ts in weekly.index] == ["2023-01-06", "2023-01-13"]
+    first_week = frame.iloc[:5]
+    assert weekly["Open"].iloc[0] == first_week["Open"].iloc[0]
+    assert weekly["High"].iloc[0] == first_week["High"].max()
+    assert weekly["Low"].iloc[0] == first_week["Low"].min()
+    assert weekly["Close"].iloc[0] == first_week["Close"].iloc[-1]
+    assert weekly["Volume"].iloc[0] == 5000.0
+
+    monthly = resample(_daily(30), "1mo")
+    # The open month is labelled with its last trading day so far, not the month end
+    assert [str(ts.date()) for ts in monthly.index] == ["2023-01-31", "2023-02-10"]
+
+    with pytest.raises(ValueError):
+        resample(frame, "5m")
+
+
+def test_lttb_keeps_endpoints_and_extremes():
+    x = np.arange(1000, dtype=float)
+    y = np.zeros(1000)
+    y[400], y[700] = 50.0, -50.0
+    kept = lttb_indices(x, y, 20)
+    assert len(kept) == 20
+    assert kept[0] == 0 and kept[-1] == 999
+    assert list(kept) == sorted(kept)
+    assert {400, 700} <= set(kept.tolist())
+    assert len(lttb_indices(x, y, 2000)) == 1000
+
+
+def test_payload_is_columnar_and_bounded():
+    frame = _daily(1300)
+    payload = chart_payload(frame, max_points=200)
+    assert payload["total_points"] == 1300
+    assert len(payload["dates"]) == len(payload["close"]) == 200
+    assert payload["dates"][0] == "2023-01-02" and payload["dates"][-1] == str(frame.index[-1].date())
+    assert "open" not in payload
+
+    full = chart_payload(frame, max_points=0)
+    assert len(full["close"]) == 1300
+
+
+def test_ohlcv_payload_replaces_missing_values_with_none():
+    frame = _daily(5, tz=None)
+    frame.loc[frame.index[2], "Volume"] = np.nan
+    payload = chart_payload(frame, ohlcv=True)
+    assert payload["volume"][2] is None
+    assert payload["high"] == [c + 2 for c in payload["close"]]
+    assert not any(isinstance(v, float) and math.isnan(v) for v in payload["open"])
+
+    assert chart_payload(None, ohlcv=True)["volume"] == []
+
+
+def test_history_endpoint_accepts_period_interval_and_max_points(monkeypatch):
+    pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+
+    import frontend.app as app_module
+
+    requested = []
+
+    def fake_history(symbol, period="1y", interval="1d"):
+        requested.append(period)
+        return _daily(1300)
+
+    monkeypatch.setattr(quote_service, "get_history", fake_history)
+    client = TestClient(app_module.app)
+
+    body = client.post("/api/stock/history", json={"company": "AAPL", "period": "5y", "interval": "1wk",
+                                                   "max_points": 100}).json()["history"]
+    assert requested == ["5y"]
+    assert body["interval"] == "1wk" and len(body["dates"]) == 100 and body["total_points"] == 260
+
+    response = client.post("/api/stock/history", json={"company": "AAPL", "interval": "15m"})
+    assert response.status_code == 400
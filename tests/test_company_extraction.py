@@ -0,0 +1,83 @@
+"""Offline tests for the tiered company-name extractor."""
+from __future__ import annotations
+
+import pytest
+
+from src.modules import extract_company_name as extractor
+
+
+@pytest.fixture(autouse=True)
+def no_llm(monkeypatch):
+    calls: list[str] = []
+    monkeypatch.setattr(extractor, "_extract_with_llm", lambda q: calls.append(q) or None)
+    return calls
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("Tell me about Apple", "Apple"),
+        ("Show me info on Microsoft", "Microsoft"),
+        ("Apple's latest earnings", "Apple"),
+        ("How is Goldman Sachs doing?", "Goldman Sachs"),
+        ("Give me details about Bank of America", "Bank of America"),
+        ("tell me about jp morgan chase", "jp morgan chase"),
+    ],
+)
+def test_gazetteer_resolves_without_llm(query, expected, no_llm):
+    result = extractor.extract_company(query)
+
+    assert result is not None
+    assert (result.name, result.tier) == (expected, "gazetteer")
+    assert result.confidence >= extractor.EXTRACTION_CONFIDENCE_THRESHOLD
+    assert no_llm == []
+
+
+@pytest.fixture
+def weak_local_guess(monkeypatch):
+    guess = extractor.CompanyExtraction("Acme Widgets", 0.5, "heuristic")
+    monkeypatch.setattr(extractor, "_match_spacy", lambda q: guess)
+    return guess
+
+
+def test_unknown_company_falls_back_to_llm_then_local_guess(no_llm, weak_local_guess):
+    result = extractor.extract_company("Tell me about Acme Widgets")
+
+    assert no_llm == ["Tell me about Acme Widgets"]
+    assert result == weak_local_guess
+
+
+def test_llm_answer_is_used_below_threshold(monkeypatch, weak_local_guess):
+    monkeypatch.setattr(extractor, "_extract_with_llm", lambda q: "Acme Corp")
+
+    result = extractor.extract_company("Tell me about Acme Widgets")
+    assert result == extractor.CompanyExtraction("Acme Corp", 0.9, "llm")
+
+
+def test_extract_company_name_keeps_string_api():
+    assert extractor.extract_company_name("Stock info for Tesla") == "Tesla"
+    assert extractor.extract_company_name("   ") is None
+
+
+@pytest.mark.parametrize("query", ["any news on nvidia", "show me the latest on tesla"])
+def test_everyday_words_do_not_match_and_lowercase_words_are_checked(query, no_llm):
+    result = extractor.extract_company(query)
+
+    assert result is not None
+    assert result.name == query.rsplit(" ", 1)[-1]
+    assert no_llm == [query]
+
+
+def test_llm_none_overrides_the_local_guess(monkeypatch, weak_local_guess):
+    monkeypatch.setattr(extractor, "_extract_with_llm", lambda q: "")
+
+    assert extractor.extract_company("What is the weather today?") is None
+
+
+@pytest.mark.parametrize("query", ["How is Block doing", "What does Block report?", "Is Block a buy"])
+def test_question_words_are_not_taken_for_the_company(query, no_llm, monkeypatch):
+    monkeypatch.setattr(extractor, "get_nlp", lambda: None)
+
+    result = extractor.extract_company(query)
+    assert result == extractor.CompanyExtraction("Block", 0.5, "heuristic")
+    assert no_llm == [query]
@@ -0,0 +1,80 @@
+"""The fast extraction backends must match the html.parser reference exactly."""
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import pytest
+
+from src.modules import html_extract, news_fetcher
+
+pytest.importorskip("bs4")
+
+FIXTURES = sorted((Path(__file__).parent / "fixtures" / "html").glob("*.html"))
+BACKENDS = ["strainer"] + (["lxml"] if html_extract._has_lxml() else [])
+
+
+def _read(path: Path) -> str:
+    with open(path, encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("fixture", FIXTURES, ids=lambda p: p.name)
+def test_backends_match_reference_on_fixtures(fixture, backend):
+    page = _read(fixture)
+    assert html_extract.extract_links(page, backend) == html_extract._soup_links(page)
+    assert html_extract.extract_paragraphs(page, backend) == html_extract._soup_paragraphs(page)
+
+
+def test_well_formed_fixtures_take_the_fast_path():
+    for fixture in FIXTURES:
+        page = _read(fixture)
+        expected = fixture.name != "malformed.html"
+        assert html_extract._paragraphs_safe(page) is expected
+        assert html_extract._links_safe(page) is expected
+
+
+def test_news_fetcher_parsers_use_the_extractor():
+    page = _read(FIXTURES[0].parent / "bbc_search.html")
+    links = news_fetcher.parse_hrefs(page)
+    assert len(links) == 10
+    assert all(link.startswith("https://www.bbc.com/news/") for link in links)
+    article = news_fetcher.parse_paragraphs(_read(FIXTURES[0].parent / "bbc_article.html"))
+    assert "Apple's boss, Tim Cook" in article
+
+
+_PIECES = [
+    "text", " ", "\n", "\t", "\r\n", "&amp;", "&nbsp;", "&copy", "&foo;", "&#8217;", "&rsquo;",
+    "<b>", "</b>", "<span class='x'>", "</span>", "<br>", "<br/>", "<!-- c -->", "<![CDATA[x]]>",
+    "<a href='/news/articles/a1'>", "<a href=\"/x?a=1&copy=2\">", "<a href='/d' href='/e'>", "</a>",
+    "<p>", "<p class='c'>", "</p>", "<p/>", "<div>", "</div>", "<ul><li>", "</li></ul>", "<pre>", "</pre>",
+    "<script>var s='<p>x</p>';</script>",
+    "<template>", "</template>", "<title>", "</title>", "<textarea>", "</textarea>", "<noscript>", "</noscript>",
+    "<xmp>", "</xmp>", "<plaintext>", "<iframe>", "</iframe>",
+]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backends_match_reference_on_random_markup(backend):
+    rng = random.Random(13)
+    for _ in range(300):
+        page = "<html><body>" + "".join(rng.choice(_PIECES) for _ in range(rng.randint(1, 30))) + "</body></html>"
+        assert html_extract.extract_links(page, backend) == html_extract._soup_links(page), page
+        assert html_extract.extract_paragraphs(page, backend) == html_extract._soup_paragraphs(page), page
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("page", [
+    "<template><p>t</p></template>",
+    "<title><p>tt</p></title><p>b</p>",
+    "<textarea><p>t</p><a href='/x'>x</a></textarea><p>b</p>",
+    "<noscript><p>n</p></noscript><p>b</p>",
+    "<xmp><a href='/x'>x</a></xmp><p>b</p>",
+    "<plaintext><p>p</p>",
+])
+def test_raw_text_elements_use_the_reference_parser(page, backend):
+    page = f"<html><body>{page}</body></html>"
+    assert not html_extract._paragraphs_safe(page) and not html_extract._links_safe(page)
+    assert html_extract.extract_links(page, backend) == html_extract._soup_links(page)
+    assert html_extract.extract_paragraphs(page, backend) == html_extract._soup_paragraphs(page)
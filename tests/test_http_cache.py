@@ -0,0 +1,99 @@
+"""Tests for the disk HTTP cache and the conditional fetch path in news_fetcher."""
+from __future__ import annotations
+
+import multiprocessing
+import time
+from types import SimpleNamespace
+
+from src.core.http_cache import HttpCache
+from src.modules import news_fetcher
+
+
+class _FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append((url, dict(headers or {})))
+        status, text, response_headers = self.responses.pop(0)
+        return SimpleNamespace(status_code=status, text=text, headers=response_headers, raise_for_status=lambda: None)
+
+
+def _use(monkeypatch, cache, session):
+    monkeypatch.setattr(news_fetcher, "http_cache", cache)
+    monkeypatch.setattr(news_fetcher, "get_session", lambda: session)
+
+
+def test_fresh_entry_skips_network(monkeypatch, tmp_path):
+    session = _FakeSession([(200, "<p>body</p>", {"ETag": '"v1"'})])
+    _use(monkeypatch, HttpCache(tmp_path / "http.sqlite3"), session)
+
+    assert news_fetcher.fetch_html("https://www.bbc.com/news/articles/a") == "<p>body</p>"
+    assert news_fetcher.fetch_html("https://www.bbc.com/news/articles/a") == "<p>body</p>"
+    assert len(session.requests) == 1
+
+
+def test_stale_entry_is_revalidated_with_validators(monkeypatch, tmp_path):
+    cache = HttpCache(tmp_path / "http.sqlite3")
+    session = _FakeSession([
+        (200, "<p>search</p>", {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+        (304, "", {}),
+    ])
+    _use(monkeypatch, cache, session)
+    url = "https://www.bbc.com/search?q=apple"
+
+    news_fetcher.fetch_html(url, ttl=0)
+    time.sleep(0.01)
+    assert news_fetcher.fetch_html(url, ttl=0) == "<p>search</p>"
+
+    assert session.requests[1][1] == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_stale_copy_served_when_network_fails(monkeypatch, tmp_path):
+    cache = HttpCache(tmp_path / "http.sqlite3")
+    cache.store("https://example.com/a", "<p>old</p>")
+
+    class Down:
+        def get(self, *args, **kwargs):
+            raise ConnectionError("offline")
+
+    _use(monkeypatch, cache, Down())
+    assert news_fetcher.fetch_html("https://example.com/a", ttl=0) == "<p>old</p>"
+
+
+def test_size_cap_evicts_least_recently_used(tmp_path):
+    cache = HttpCache(tmp_path / "http.sqlite3", max_bytes=250)
+    cache.store("a", "x" * 100)
+    time.sleep(0.01)
+    cache.store("b", "y" * 100)
+    time.sleep(0.01)
+    assert cache.lookup("a") is not None  # "a" is now more recent than "b"
+    time.sleep(0.01)
+    cache.store("c", "z" * 100)
+
+    assert cache.lookup("b") is None
+    assert cache.lookup("a") is not None and cache.lookup("c") is not None
+    assert cache.stats()["disk_bytes"] <= 250
+
+
+def _writer(path, prefix):
+    cache = HttpCache(path, max_bytes=10_000)
+    for i in range(40):
+        cache.store(f"{prefix}{i}", "v" * 100)
+
+
+def test_concurrent_processes_share_the_file(tmp_path):
+    path = tmp_path / "http.sqlite3"
+    HttpCache(path).clear()  # create the schema up front
+    procs = [multiprocessing.Process(target=_writer, args=(path, p)) for p in "ab"]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join(30)
+
+    assert all(proc.exitcode == 0 for proc in procs)
+    stats = HttpCache(path).stats()
+    assert 0 < stats["disk_entries"] <= 80
+    assert stats["disk_bytes"] <= 10_000
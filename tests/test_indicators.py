@@ -0,0 +1,156 @@
+"""Tests for the vectorized technical-indicator engine."""
+from __future__ import annotations
+
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from src.core import pipeline
+from src.core.price_store import PriceBar, PriceStore
+from src.modules import indicators, quote_service, ticker_resolver
+
+
+def _walk(days: int, seed: int):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.02, days)))
+
+
+def _seeded_average(values, alpha, seed):
+    """Reference: the textbook per-day recursion."""
+    state = float(np.mean(values[:seed]))
+    for value in values[seed:]:
+        state = alpha * value + (1 - alpha) * state
+    return state
+
+
+def test_indicators_match_the_per_day_definitions():
+    closes = _walk(300, seed=1)
+    values = {name: column[0] for name, column in indicators.compute(closes[None, :]).items()}
+    series = pd.Series(closes)
+
+    assert values["sma_50"] == pytest.approx(series.tail(50).mean())
+    assert values["ema_12"] == pytest.approx(_seeded_average(closes, 2 / 13, 12))
+    diffs = np.diff(closes)
+    gain = _seeded_average(np.clip(diffs, 0, None), 1 / 14, 14)
+    loss = _seeded_average(np.clip(-diffs, 0, None), 1 / 14, 14)
+    assert values["rsi_14"] == pytest.approx(100 - 100 / (1 + gain / loss))
+    log_returns = np.diff(np.log(closes))
+    assert values["volatility_20d"] == pytest.approx(log_returns[-20:].std(ddof=1) * np.sqrt(252))
+    assert values["return_1m"] == pytest.approx(closes[-1] / closes[-22] - 1)
+    assert values["drawdown"] == pytest.approx(closes[-1] / closes.max() - 1)
+    assert values["max_drawdown"] == pytest.approx((series / series.cummax() - 1).min())
+
+
+def test_rows_are_independent_and_short_histories_give_nan():
+    long, short = _walk(260, seed=2), _walk(30, seed=3)
+    matrix = np.vstack([long, np.concatenate([np.full(230, np.nan), short])])
+    together = indicators.compute(matrix)
+    alone = indicators.compute(short[None, :])
+
+    for name in ("ema_12", "rsi_14", "volatility_20d", "return_1w", "max_drawdown"):
+        assert together[name][1] == pytest.approx(alone[name][0])
+    assert together["sma_200"][0] == pytest.approx(long[-200:].mean())
+    assert np.isnan(together["sma_200"][1]) and np.isnan(together["return_3m"][1])
+
+
+def test_whole_universe_is_fast():
+    closes = np.vstack([_walk(252, seed) for seed in range(500)])
+    start = time.perf_counter()
+    values = indicators.compute(closes)
+    assert time.perf_counter() - start < 0.5
+    assert all(column.shape == (500,) for column in values.values())
+
+
+def test_indicators_for_aligns_histories_and_feeds_the_report(monkeypatch):
+    dates = pd.bdate_range("2024-01-01", periods=60, name="Date")
+    frames = {
+        "AAPL": pd.DataFrame({"Close": _walk(60, seed=4)}, index=dates.tz_localize("America/New_York")),
+        "MSFT": pd.DataFrame({"Close": _walk(40, seed=5)}, index=dates[20:]),
+    }
+
+    def fake_history(symbol, period="1y", interval="1d"):
+        if symbol not in frames:
+            raise LookupError(symbol)
+        return frames[symbol]
+
+    monkeypatch.setattr(quote_service, "price_store", PriceStore(None))
+    monkeypatch.setattr(quote_service, "get_history", fake_history)
+    synced = []
+    monkeypatch.setattr(quote_service, "sync_stale_histories", lambda symbols, period: synced.append(symbols))
+    result = indicators.indicators_for(["aapl", "MSFT", "NOPE"])
+    assert synced == [["AAPL", "MSFT", "NOPE"]]
+    assert set(result) == {"AAPL", "MSFT"}
+    assert result["AAPL"]["sma_50"] is not None and result["MSFT"]["sma_50"] is None
+    assert result["MSFT"]["return_1m"] == pytest.approx(
+        frames["MSFT"]["Close"].iloc[-1] / frames["MSFT"]["Close"].iloc[-22] - 1, abs=1e-4
+    )
+
+    report = pipeline.aggregate_information("Apple", [], {"ticker": "AAPL"})
+    assert report["technical_indicators"] == result["AAPL"]
+    assert "rsi_14" in pipeline.build_report_prompt("Apple", report)
+
+
+def test_indicators_endpoint(monkeypatch):
+    pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+
+    import frontend.app as app_module
+
+    frame = pd.DataFrame({"Close": _walk(60, seed=6)}, index=pd.bdate_range("2024-01-01", periods=60))
+    monkeypatch.setattr(quote_service, "price_store", PriceStore(None))
+    monkeypatch.setattr(quote_service, "get_history", lambda symbol, period="1y", interval="1d": frame)
+    monkeypatch.setattr(quote_service, "sync_stale_histories", lambda symbols, period: 0)
+    client = TestClient(app_module.app)
+    body = client.post("/api/stock/indicators", json={"tickers": ["AAPL", "Microsoft", "Nonexistent Widgets Ltd"]}).json()
+
+    assert set(body["indicators"]) == {"AAPL", "MSFT"}
+    assert body["unresolved"] == ["Nonexistent Widgets Ltd"]
+    assert body["period"] == "1y"
+
+    requested = []
+    monkeypatch.setattr(indicators, "indicators_for", lambda symbols, period=None: requested.extend(symbols) or {})
+    client.post("/api/stock/indicators", json={})
+    assert len(requested) == len(ticker_resolver.tracked_symbols())
+
+
+def test_stale_histories_are_refreshed_in_multi_symbol_batches(tmp_path, monkeypatch):
+    from datetime import date
+
+    store = PriceStore(tmp_path / "prices.sqlite3")
+    store.add("FRESH", [PriceBar(date.today().isoformat(), 1, 1, 1, 1.0, 1)], "2000-01-01")
+    monkeypatch.setattr(quote_service, "price_store", store)
+    monkeypatch.setattr(quote_service, "history_is_current", lambda state: True)
+    batches = []
+    monkeypatch.setattr(quote_service, "sync_histories", lambda batch, period: batches.append(batch) or dict.fromkeys(batch))
+
+    assert quote_service.sync_stale_histories(["FRESH", "A", "B", "C"], "1y", batch_size=2) == 3
+    assert batches == [["A", "B"], ["C"]]
+    # One stale symbol is left to the incremental per-symbol top-up
+    assert quote_service.sync_stale_histories(["FRESH", "A"], "1y") == 0
+
+
+def test_whole_universe_from_the_store_is_fast(tmp_path, monkeypatch):
+    store = PriceStore(tmp_path / "prices.sqlite3")
+    dates = [day.date().isoformat() for day in pd.bdate_range(end=pd.Timestamp.today(), periods=260)]
+    symbols = list(ticker_resolver.tracked_symbols())
+    for seed, symbol in enumerate(symbols):
+        store.add(symbol, [PriceBar(day, None, None, None, close, None) for day, close in zip(dates, _walk(260, seed))],
+                  covered_from="2000-01-01")
+    monkeypatch.setattr(quote_service, "price_store", store)
+    monkeypatch.setattr(quote_service, "history_is_current", lambda state: True)
+
+    def offline(*args, **kwargs):
+        raise AssertionError("served from the store")
+
+    monkeypatch.setattr(quote_service, "fetch_history", offline)
+    monkeypatch.setattr(quote_service, "sync_histories", offline)
+    monkeypatch.setattr(quote_service, "get_history", offline)
+
+    start = time.perf_counter()
+    result = indicators.indicators_for(symbols)
+    assert time.perf_counter() - start < 1.0
+    assert set(result) == {symbol.upper() for symbol in symbols}
+    assert result[symbols[0]]["sma_20"] is not None
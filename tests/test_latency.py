@@ -0,0 +1,147 @@
+"""Tests for the adaptive-timeout / hedging / circuit-breaker I/O policy."""
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.core import latency
+from src.core.http_cache import HttpCache
+from src.core.latency import CircuitOpenError, IOPolicy
+from src.modules import news_fetcher
+
+
+def _warm(policy, host, seconds=0.01, n=5):
+    for _ in range(n):
+        policy.call(host, lambda timeout: time.sleep(seconds), max_timeout=5)
+
+
+def test_timeout_follows_the_hosts_p95():
+    policy = IOPolicy(min_samples=5, timeout_multiplier=3, min_timeout=0.05, hedge=False)
+
+    assert policy.timeout_for("fast", 10) == 10  # not enough samples yet
+    _warm(policy, "fast", 0.02)
+
+    assert 0.05 <= policy.timeout_for("fast", 10) < 0.2
+    assert policy.metrics()["hosts"]["fast"]["samples"] == 5
+
+
+def test_slow_request_is_abandoned_at_the_derived_timeout():
+    policy = IOPolicy(min_samples=5, timeout_multiplier=3, min_timeout=0.05, hedge=False)
+    _warm(policy, "host")
+    release = threading.Event()
+
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        policy.call("host", lambda timeout: release.wait(5), max_timeout=10)
+    release.set()
+
+    assert time.perf_counter() - start < 0.5
+    assert policy.metrics()["hosts"]["host"]["timeouts"] == 1
+
+
+def test_hedged_request_wins_when_the_first_stalls():
+    policy = IOPolicy(min_samples=5, min_timeout=2, hedge_budget=1.0)
+    _warm(policy, "host")
+    calls = []
+    release = threading.Event()
+
+    def fn(timeout):
+        calls.append(timeout)
+        if len(calls) == 1:
+            release.wait(2)  # the first request stalls
+            return "slow"
+        return "fast"
+
+    start = time.perf_counter()
+    assert policy.call("host", fn, max_timeout=5) == "fast"
+    release.set()
+
+    assert time.perf_counter() - start < 0.5
+    stats = policy.metrics()["hosts"]["host"]
+    assert (stats["hedges"], stats["hedge_wins"]) == (1, 1)
+
+
+def test_hedges_stay_within_budget():
+    policy = IOPolicy(min_samples=1, min_timeout=1, hedge_budget=0.0)
+    _warm(policy, "host", n=1)
+
+    assert policy.call("host", lambda timeout: time.sleep(0.05) or "ok", max_timeout=1) == "ok"
+    assert policy.metrics()["hosts"]["host"]["hedges"] == 0
+
+
+def test_unhedged_calls_never_send_a_second_request():
+    policy = IOPolicy(min_samples=5, min_timeout=1, hedge_budget=1.0)
+    _warm(policy, "bulk")
+    calls = []
+
+    assert policy.call("bulk", lambda timeout: calls.append(timeout) or time.sleep(0.1) or "ok", 5, hedge=False) == "ok"
+    assert len(calls) == 1 and policy.metrics()["hosts"]["bulk"]["hedges"] == 0
+
+
+def test_breaker_opens_after_repeated_failures_and_probes_after_cooldown():
+    policy = IOPolicy(breaker_failures=3, breaker_cooldown=0.1)
+    calls = []
+
+    def failing(timeout):
+        calls.append(timeout)
+        raise ConnectionError("down")
+
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            policy.call("host", failing, max_timeout=1)
+    with pytest.raises(CircuitOpenError):
+        policy.call("host", failing, max_timeout=1)
+
+    assert len(calls) == 3
+    stats = policy.metrics()["hosts"]["host"]
+    assert (stats["state"], stats["breaker_trips"], stats["short_circuits"]) == ("open", 1, 1)
+
+    time.sleep(0.12)
+    assert policy.call("host", lambda timeout: "back", max_timeout=1) == "back"
+    assert policy.metrics()["hosts"]["host"]["state"] == "closed"
+
+
+def test_fetch_html_serves_stale_copy_while_breaker_is_open(tmp_path, monkeypatch):
+    cache = HttpCache(tmp_path / "http.sqlite3")
+    cache.store("https://slow.example/a", "<p>old</p>")
+    monkeypatch.setattr(news_fetcher, "http_cache", cache)
+    monkeypatch.setattr(latency, "policy", IOPolicy(breaker_failures=1, breaker_cooldown=60))
+    calls = []
+
+    class FailingSession:
+        def get(self, url, headers=None, timeout=None):
+            calls.append(url)
+            return SimpleNamespace(status_code=503, text="", headers={}, raise_for_status=_raise)
+
+    monkeypatch.setattr(news_fetcher, "get_session", lambda: FailingSession())
+
+    assert news_fetcher.fetch_html("https://slow.example/a", ttl=0) == "<p>old</p>"
+    assert news_fetcher.fetch_html("https://slow.example/a", ttl=0) == "<p>old</p>"
+    assert len(calls) == 1
+    assert latency.policy.metrics()["hosts"]["slow.example"]["short_circuits"] == 1
+
+
+def _raise():
+    raise RuntimeError("503 Service Unavailable")
+
+
+def test_probe_is_released_when_the_call_never_starts(monkeypatch):
+    policy = IOPolicy(min_samples=5, hedge=False, breaker_failures=1, breaker_cooldown=0.05)
+    with pytest.raises(RuntimeError):
+        policy.call("host", lambda timeout: (_ for _ in ()).throw(RuntimeError("down")), max_timeout=1)
+    time.sleep(0.06)
+
+    def no_pool():
+        raise RuntimeError("pool shut down")
+
+    monkeypatch.setattr(policy, "_executor", no_pool)
+    with pytest.raises(RuntimeError, match="pool shut down"):
+        policy.call("host", lambda timeout: "ok", max_timeout=1)
+    monkeypatch.undo()
+
+    # Still half-open with no probe in flight, so the next call probes and closes the breaker
+    assert policy.call("host", lambda timeout: "ok", max_timeout=1) == "ok"
+    assert policy.metrics()["hosts"]["host"]["state"] == "closed"
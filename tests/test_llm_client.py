@@ -0,0 +1,45 @@
+"""Tests for the shared LLM client registry."""
+from __future__ import annotations
+
+import asyncio
+
+from src.core import llm_client
+
+
+def test_sync_client_is_reused(monkeypatch):
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+    llm_client.reset_clients()
+
+    assert llm_client.get_client() is llm_client.get_client()
+    llm_client.reset_clients()
+
+
+def test_no_key_means_no_client(monkeypatch):
+    monkeypatch.delenv("OPENROUTER_API_KEY", raising=False)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+    assert llm_client.get_client() is None
+    assert llm_client.get_async_client() is None
+
+
+def test_openai_key_alone_is_not_sent_to_openrouter(monkeypatch):
+    monkeypatch.delenv("OPENROUTER_API_KEY", raising=False)
+    monkeypatch.delenv("OPENAI_BASE_URL", raising=False)
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-openai")
+
+    assert llm_client._credentials() == (None, llm_client.DEFAULT_BASE_URL)
+    assert llm_client.get_client() is None
+
+
+def test_async_client_is_per_event_loop(monkeypatch):
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+    llm_client.reset_clients()
+
+    async def grab():
+        return llm_client.get_async_client(), llm_client.get_async_client()
+
+    first_a, first_b = asyncio.run(grab())
+    second, _ = asyncio.run(grab())
+    assert first_a is first_b
+    assert second is not first_a
+    llm_client.reset_clients()
@@ -0,0 +1,71 @@
+"""Tests for MinHash near-duplicate collapsing ahead of summarization."""
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from src.core import pipeline
+from src.modules import near_duplicates
+from src.modules.near_duplicates import drop_near_duplicates, near_duplicate_groups
+
+pytest.importorskip("numpy")
+
+WORDS = ("apple shares revenue iphone quarter analysts growth services china demand tariffs "
+         "margin guidance supplier chip outlook investors record sales market").split()
+
+
+def _story(seed: int, n: int = 300) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def _edit(text: str, seed: int, changes: int = 5) -> str:
+    rng = random.Random(seed)
+    words = text.split()
+    for _ in range(changes):
+        words[rng.randrange(len(words))] = "updated"
+    return " ".join(words)
+
+
+def test_updated_copy_collapses_to_most_complete_version():
+    story = _story(1)
+    longer = story + " Additional reporting by the business desk."
+    other = _story(2)
+
+    result = drop_near_duplicates([_edit(story, 3), other, longer])
+
+    assert result == [longer, other]
+
+
+def test_distinct_articles_are_kept_in_order():
+    stories = [_story(i) for i in range(6)]
+    assert drop_near_duplicates(stories) == stories
+
+
+def test_threshold_is_configurable():
+    story = _story(4)
+    heavy_edit = _edit(story, 5, changes=40)
+    similarity = near_duplicates.similarity_matrix([story, heavy_edit])[0, 1]
+
+    assert len(near_duplicate_groups([story, heavy_edit], threshold=similarity - 0.05)) == 1
+    assert len(near_duplicate_groups([story, heavy_edit], threshold=min(1.0, similarity + 0.05))) == 2
+    assert len(near_duplicate_groups([story, story], threshold=0)) == 2  # 0 disables detection
+
+
+def test_empty_texts_never_match():
+    assert drop_near_duplicates(["", "", "x"]) == ["", "", "x"]
+
+
+def test_fetch_news_summarizes_each_story_once(monkeypatch):
+    story, other = _story(7), _story(8)
+    truncated = " ".join(story.split()[:280])
+    copies = [truncated, other, story, truncated]
+    monkeypatch.setattr(pipeline, "get_news_content", lambda company, max_articles=5: copies)
+    monkeypatch.setattr(pipeline, "SUMMARY_MODE", "concurrent")
+    summarized = []
+    monkeypatch.setattr(pipeline, "summarize_articles", lambda articles, on_summary=None, stop=None: summarized.extend(articles) or articles)
+
+    pipeline.fetch_news("apple")
+
+    assert summarized == [story, other]
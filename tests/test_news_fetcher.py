@@ -0,0 +1,66 @@
+"""Offline tests for the concurrent BBC fetch layer."""
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.article_store import ArticleStore
+from src.core.http_cache import HttpCache
+from src.modules import news_fetcher, news_sources
+
+pytest.importorskip("bs4")
+
+SEARCH_HTML = "".join(
+    f'<a href="/news/articles/story{i}">story {i}</a>' for i in range(8)
+) + '<a href="/sport">sport</a><a href="/news/articles/story0">dup</a>'
+
+
+def _article(i):
+    return f"<html><p>Paragraph for story {i} " + "with plenty of words " * 5 + "</p></html>"
+
+
+def test_search_page_is_downloaded_once(monkeypatch):
+    calls = []
+
+    def fake_fetch(url, ttl=None):
+        calls.append(url)
+        return SEARCH_HTML if "search" in url else _article(url[-1])
+
+    monkeypatch.setattr(news_fetcher, "fetch_html", fake_fetch)
+    monkeypatch.setattr(news_sources, "NEWS_SOURCES", "bbc")
+    monkeypatch.setattr(news_fetcher, "article_store", ArticleStore(None))
+
+    articles = news_fetcher.get_news_content("apple", max_articles=3)
+
+    assert len(articles) == 3
+    assert sum("search" in url for url in calls) == 1
+    assert news_fetcher.parse_hrefs(SEARCH_HTML)[0] == "https://www.bbc.com/news/articles/story0"
+    assert len(news_fetcher.parse_hrefs(SEARCH_HTML)) == 8
+
+
+def test_per_host_limit_caps_parallel_downloads(monkeypatch):
+    monkeypatch.setattr(news_fetcher, "NEWS_PER_HOST_LIMIT", 2)
+    monkeypatch.setattr(news_fetcher, "_host_limits", {})
+    monkeypatch.setattr(news_fetcher, "http_cache", HttpCache(None))
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    class FakeSession:
+        def get(self, url, headers=None, timeout=None):
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            time.sleep(0.02)
+            with lock:
+                active["now"] -= 1
+            return SimpleNamespace(status_code=200, text="<p>" + "x" * 80 + "</p>", headers={}, raise_for_status=lambda: None)
+
+    monkeypatch.setattr(news_fetcher, "get_session", lambda: FakeSession())
+    links = [f"https://www.bbc.com/news/articles/story{i}" for i in range(6)]
+
+    list(news_fetcher.iter_articles(links, max_workers=6))
+
+    assert active["peak"] == 2
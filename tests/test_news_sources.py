@@ -0,0 +1,114 @@
+"""Offline tests for the news-source plugins and the fan-out engine."""
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from src.modules import news_fetcher, news_sources, ticker_resolver
+from src.modules.news_sources import Article, LocalFileSource, canonical_url, collect_articles
+
+FIXTURES = Path(__file__).parent / "fixtures" / "news"
+
+
+class _ListSource:
+    def __init__(self, name, articles, delay=0.0, timeout=5.0):
+        self.name = name
+        self.articles = articles
+        self.delay = delay
+        self.timeout = timeout
+        self.closed = threading.Event()
+
+    def iter_articles(self, topic):
+        try:
+            for article in self.articles:
+                time.sleep(self.delay)
+                yield article
+        finally:
+            self.closed.set()
+
+
+def _article(url, text="Apple " + "news " * 20, source="fake"):
+    return Article(url, "", text, source)
+
+
+def test_canonical_url_ignores_tracking_and_cosmetic_differences():
+    assert canonical_url("http://www.BBC.com/news/articles/x/?utm_source=a&at_medium=b#top") == \
+        canonical_url("https://bbc.com/news/articles/x")
+    assert canonical_url("https://example.com/a?id=1") != canonical_url("https://example.com/a?id=2")
+
+
+def test_local_source_returns_only_matching_articles():
+    articles = list(LocalFileSource(FIXTURES).iter_articles("Apple"))
+    assert [a.title for a in articles] == ["Apple beats earnings expectations", "Apple cuts headset production"]
+
+
+def test_merges_sources_and_dedupes_by_canonical_url():
+    local = LocalFileSource(FIXTURES)
+    mirror = _ListSource("mirror", [_article("https://example.com/markets/apple-earnings")])
+
+    articles = collect_articles("Apple", [local, mirror], limit=5)
+
+    assert len(articles) == 2
+    assert len({canonical_url(a.url) for a in articles}) == 2
+
+
+def test_stops_once_enough_relevant_articles_arrive():
+    endless = _ListSource("endless", [_article(f"https://example.com/{i}") for i in range(1000)], delay=0.001)
+
+    start = time.perf_counter()
+    articles = collect_articles("Apple", [endless], limit=3)
+
+    assert len(articles) == 3
+    assert time.perf_counter() - start < 1
+    assert endless.closed.wait(1)
+
+
+def test_slow_source_is_abandoned_after_its_timeout():
+    fast = _ListSource("fast", [_article("https://example.com/fast")])
+    slow = _ListSource("slow", [_article("https://example.com/slow")], delay=2, timeout=0.2)
+
+    start = time.perf_counter()
+    articles = collect_articles("Apple", [fast, slow], limit=5)
+
+    assert [a.url for a in articles] == ["https://example.com/fast"]
+    assert time.perf_counter() - start < 1
+
+
+def test_irrelevant_articles_only_pad_the_result():
+    source = _ListSource("mixed", [
+        _article("https://example.com/other", text="Oil " + "prices " * 20),
+        _article("https://example.com/apple"),
+    ])
+
+    articles = collect_articles("Apple", [source], limit=5)
+
+    assert [a.url for a in articles] == ["https://example.com/apple", "https://example.com/other"]
+
+
+def test_rss_source_falls_back_to_feed_summary(monkeypatch):
+    pytest.importorskip("feedparser")
+    feed = """<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>
+      <item><title>Apple &amp; suppliers</title><link>https://example.com/rss/1</link>
+      <description>&lt;p&gt;Apple suppliers expect a strong quarter as demand for new devices keeps rising.&lt;/p&gt;</description></item>
+    </channel></rss>"""
+    monkeypatch.setattr(news_fetcher, "fetch_html", lambda url, ttl=None: feed)
+    monkeypatch.setattr(news_fetcher, "extract_paragraphs", lambda url: "")
+
+    source = news_sources.RSSSource("https://feeds.example.com/headline?s={ticker}")
+    assert source.feed_url("Apple") == "https://feeds.example.com/headline?s=AAPL"
+    articles = list(source.iter_articles("Apple"))
+
+    assert len(articles) == 1
+    assert articles[0].title == "Apple & suppliers"
+    assert articles[0].text.startswith("Apple & suppliers\nApple suppliers expect")
+
+
+def test_rss_ticker_feed_skips_fuzzy_matches():
+    source = news_sources.RSSSource("https://feeds.example.com/headline?s={ticker}&q={query}")
+    assert ticker_resolver.resolve_ticker("Microsfot").tier == "fuzzy"
+
+    assert source.feed_url("Microsfot") is None
+    assert source.feed_url("Microsoft") == "https://feeds.example.com/headline?s=MSFT&q=Microsoft"
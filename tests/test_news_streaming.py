@@ -0,0 +1,108 @@
+"""Tests for the streaming news pipeline (fetch and summarize overlapped)."""
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from src.core import pipeline
+from src.modules.news_sources import Article, stream_articles
+
+pytest.importorskip("numpy")
+
+
+def _text(i, company="Apple"):
+    return f"{company} story {i}: " + " ".join(f"word{i}x{j}" for j in range(40))
+
+
+def _slow_news(texts, delay, consumed=None, closed=None):
+    def fake_iter(company, max_articles=5, buffer=None):
+        try:
+            for text in texts:
+                time.sleep(delay)
+                if consumed is not None:
+                    consumed.append(text)
+                yield text
+        finally:
+            if closed is not None:
+                closed.set()
+    return fake_iter
+
+
+def _fake_summarize(delay):
+    def summarize(_summarizer, text, max_chars=1500):
+        time.sleep(delay)
+        return "summary of " + text.split(":")[0]
+    return summarize
+
+
+def test_summarizing_overlaps_downloading(monkeypatch):
+    texts = [_text(i) for i in range(5)]
+    monkeypatch.setattr(pipeline, "iter_news_content", _slow_news(texts, 0.05))
+    monkeypatch.setattr(pipeline, "safe_summarize", _fake_summarize(0.05))
+    seen = []
+
+    start = time.perf_counter()
+    summaries = pipeline.fetch_news_streaming("Apple", k=5, max_workers=1, on_summary=lambda i, s: seen.append(i))
+    elapsed = time.perf_counter() - start
+
+    # Fetch then summarize one at a time would take 0.25 + 0.25 s
+    assert elapsed < 0.42
+    assert summaries == [f"summary of Apple story {i}" for i in range(5)]
+    assert sorted(seen) == list(range(5))
+
+
+def test_download_is_cancelled_once_enough_articles_are_in(monkeypatch):
+    consumed, closed = [], threading.Event()
+    texts = [_text(i) for i in range(10)]
+    monkeypatch.setattr(pipeline, "iter_news_content", _slow_news(texts, 0, consumed, closed))
+    monkeypatch.setattr(pipeline, "safe_summarize", _fake_summarize(0))
+
+    summaries = pipeline.fetch_news_streaming("Apple", k=3)
+
+    assert len(summaries) == 3
+    assert len(consumed) == 3
+    assert closed.is_set()
+
+
+def test_duplicates_and_unrelated_articles_are_skipped(monkeypatch):
+    texts = [_text(0, "Tesla"), _text(1), _text(1), _text(2)]
+    monkeypatch.setattr(pipeline, "iter_news_content", _slow_news(texts, 0))
+    monkeypatch.setattr(pipeline, "safe_summarize", _fake_summarize(0))
+
+    assert pipeline.fetch_news_streaming("Apple", k=5) == ["summary of Apple story 1", "summary of Apple story 2"]
+    # Nothing mentions the company: fall back to what arrived first
+    assert pipeline.fetch_news_streaming("Nvidia", k=2) == ["summary of Tesla story 0", "summary of Apple story 1"]
+
+
+def test_fetch_news_uses_streaming_mode(monkeypatch):
+    monkeypatch.setattr(pipeline, "SUMMARY_MODE", "stream")
+    monkeypatch.setattr(pipeline, "iter_news_content", _slow_news([_text(0)], 0))
+    monkeypatch.setattr(pipeline, "safe_summarize", _fake_summarize(0))
+
+    assert pipeline.fetch_news("Apple") == ["summary of Apple story 0"]
+
+
+def test_stream_articles_applies_backpressure_and_stops_sources():
+    produced, closed = [], threading.Event()
+
+    class Source:
+        name, timeout = "fake", 5.0
+
+        def iter_articles(self, topic):
+            try:
+                for i in range(50):
+                    produced.append(i)
+                    yield Article(f"https://example.com/{i}", "", f"Apple {i} " * 20, self.name)
+            finally:
+                closed.set()
+
+    stream = stream_articles("apple", [Source()], limit=50, buffer=2)
+    first = next(stream)
+    time.sleep(0.2)
+
+    assert first.url == "https://example.com/0"
+    assert len(produced) <= 5  # one yielded, two buffered, one blocked on the full buffer
+    stream.close()
+    assert closed.wait(1)
@@ -0,0 +1,73 @@
+"""Tests for per-dependency offloading and the non-blocking request path."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from src.core import offload, pipeline
+from src.core.offload import Offloader
+
+
+def test_each_dependency_is_capped_at_its_limit():
+    offloader = Offloader({"db": 2, "llm": 1})
+
+    async def main():
+        start = time.perf_counter()
+        await asyncio.gather(*(offloader.run("db", time.sleep, 0.1) for _ in range(6)))
+        return time.perf_counter() - start
+
+    elapsed = asyncio.run(main())
+    stats = offloader.stats()["dependencies"]["db"]
+    assert stats["peak_active"] == 2 and stats["calls"] == 6
+    assert stats["active"] == stats["waiting"] == 0
+    assert elapsed >= 0.29
+
+
+def test_a_saturated_dependency_does_not_delay_another():
+    offloader = Offloader({"db": 1, "llm": 1})
+
+    async def main():
+        slow = [asyncio.ensure_future(offloader.run("db", time.sleep, 0.2)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        start = time.perf_counter()
+        assert await offloader.run("llm", lambda: "ok") == "ok"
+        waited = time.perf_counter() - start
+        await asyncio.gather(*slow)
+        return waited
+
+    assert asyncio.run(main()) < 0.1
+    with pytest.raises(KeyError):
+        asyncio.run(offloader.run("smtp", print))
+
+
+def test_concurrent_requests_no_longer_serialize(monkeypatch):
+    """Load test: slow blocking quote lookups overlap, and other routes stay responsive meanwhile."""
+    pytest.importorskip("fastapi")
+    httpx = pytest.importorskip("httpx")
+
+    import frontend.app as app_module
+
+    delay, requests = 0.3, 8
+    monkeypatch.setattr(offload, "offloader", Offloader({**offload.DEPENDENCY_LIMITS, "yfinance": requests}))
+    monkeypatch.setattr(pipeline, "fetch_stock_info", lambda company: time.sleep(delay) or {"ticker": company})
+
+    async def main():
+        transport = httpx.ASGITransport(app=app_module.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            start = time.perf_counter()
+            stocks = [asyncio.ensure_future(client.post("/api/stock", json={"company": f"T{i}"}))
+                      for i in range(requests)]
+            await asyncio.sleep(0.05)
+            probe_start = time.perf_counter()
+            options = await client.get("/api/analysis/options")
+            probe = time.perf_counter() - probe_start
+            responses = await asyncio.gather(*stocks)
+            return time.perf_counter() - start, probe, options, responses
+
+    elapsed, probe, options, responses = asyncio.run(main())
+    assert options.status_code == 200 and probe < delay / 2
+    assert [r.json()["stock_info"]["ticker"] for r in responses] == [f"T{i}" for i in range(requests)]
+    # Serialized, this would take requests * delay = 2.4 s
+    assert elapsed < 3 * delay
@@ -0,0 +1,122 @@
+"""Tests for the local daily price-history store and its incremental sync."""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from src.core.price_store import PriceBar, PriceStore
+from src.modules import quote_service
+
+pd = pytest.importorskip("pandas")
+
+
+def _frame(days):
+    index = pd.DatetimeIndex([pd.Timestamp(d, tz="America/New_York") for d in days], name="Date")
+    closes = [float(n) for n in range(1, len(days) + 1)]
+    return pd.DataFrame({"Open": closes, "High": closes, "Low": closes, "Close": closes, "Volume": 100.0}, index=index)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = PriceStore(tmp_path / "prices.sqlite3")
+    monkeypatch.setattr(quote_service, "price_store", store)
+    return store
+
+
+def test_store_upserts_bars_and_tracks_the_covered_range(store):
+    store.add("AAPL", [PriceBar("2024-01-02", 1, 1, 1, 1.0, 10), PriceBar("2024-01-03", 2, 2, 2, 2.0, 10)], "2023-12-01")
+    store.add("AAPL", [PriceBar("2024-01-03", 2, 2, 2, 2.5, 10), PriceBar("2024-01-04", 3, 3, 3, 3.0, 10)], "2024-01-03")
+
+    state = store.sync_state("AAPL")
+    assert (state.covered_from, state.last_date) == ("2023-12-01", "2024-01-04")
+    assert [bar.close for bar in store.bars("AAPL")] == [1.0, 2.5, 3.0]
+    assert [bar.date for bar in store.bars("AAPL", "2024-01-03")] == ["2024-01-03", "2024-01-04"]
+    assert store.sync_state("MSFT") is None
+    assert store.stats() == {"namespace": "prices", "tickers": 1, "bars": 3}
+
+
+def test_replace_starts_the_tickers_history_over(store):
+    store.add("AAPL", [PriceBar("2023-06-01", 1, 1, 1, 10.0, 10), PriceBar("2024-01-02", 1, 1, 1, 10.0, 10)], "2023-01-01")
+    store.add("AAPL", [PriceBar("2024-01-02", 1, 1, 1, 1.0, 10)], "2024-01-01", replace=True)
+
+    assert store.sync_state("AAPL").covered_from == "2024-01-01"
+    assert [bar.close for bar in store.bars("AAPL")] == [1.0]
+
+
+def test_history_downloads_only_bars_after_the_last_stored_date(store, monkeypatch):
+    today = date.today()
+    first = [(today - timedelta(days=n)).isoformat() for n in (5, 4, 3)]
+    calls = []
+
+    def fake_fetch(symbol, **kwargs):
+        calls.append(kwargs)
+        if "period" in kwargs:
+            return _frame(first)
+        return _frame([first[-1], (today - timedelta(days=2)).isoformat()])
+
+    monkeypatch.setattr(quote_service, "fetch_history", fake_fetch)
+
+    monkeypatch.setattr(quote_service, "history_is_current", lambda state: True)
+    assert len(quote_service.load_history("AAPL", "1y")) == 3
+    assert len(quote_service.load_history("AAPL", "1mo")) == 3
+    assert calls == [{"period": "1y", "interval": "1d"}]
+
+    monkeypatch.setattr(quote_service, "history_is_current", lambda state: False)
+    hist = quote_service.load_history("AAPL", "6mo")
+    assert calls[1] == {"start": first[-1], "interval": "1d"}
+    assert hist["Close"].tolist() == [1.0, 2.0, 1.0, 2.0]
+    assert [str(ts.date()) for ts in hist.index][-1] == (today - timedelta(days=2)).isoformat()
+
+    # A longer period than the stored range is backfilled in full
+    quote_service.load_history("AAPL", "5y")
+    assert calls[-1] == {"period": "5y", "interval": "1d"}
+
+
+def test_split_in_the_top_up_replaces_the_stored_history(store, monkeypatch):
+    today = date.today()
+    days = [(today - timedelta(days=n)).isoformat() for n in (5, 4, 3)]
+    store.add("AAPL", [PriceBar(day, 100, 100, 100, 100.0, 10) for day in days], "2000-01-01")
+    monkeypatch.setattr(quote_service, "history_is_current", lambda state: False)
+    calls = []
+
+    def fake_fetch(symbol, **kwargs):
+        calls.append(kwargs)
+        if kwargs["start"] == days[-1]:
+            top_up = _frame([days[-1], (today - timedelta(days=2)).isoformat()])
+            return top_up.assign(Dividends=0.0, **{"Stock Splits": [0.0, 10.0]})
+        return _frame(days + [(today - timedelta(days=2)).isoformat()])  # re-adjusted after the split
+
+    monkeypatch.setattr(quote_service, "fetch_history", fake_fetch)
+    hist = quote_service.load_history("AAPL", "1y")
+
+    assert calls == [{"start": days[-1], "interval": "1d"}, {"start": "2000-01-01", "interval": "1d"}]
+    assert hist["Close"].tolist() == [1.0, 2.0, 3.0, 4.0]
+    assert store.sync_state("AAPL").covered_from == "2000-01-01"
+
+
+def test_stored_bars_are_served_when_the_top_up_fails(store, monkeypatch):
+    store.add("AAPL", [PriceBar(date.today().isoformat(), 1, 1, 1, 1.0, 10)], "2000-01-01")
+    monkeypatch.setattr(quote_service, "history_is_current", lambda state: False)
+
+    def failing(symbol, **kwargs):
+        raise TimeoutError("yfinance did not answer")
+
+    monkeypatch.setattr(quote_service, "fetch_history", failing)
+    assert quote_service.load_history("AAPL", "1y")["Close"].tolist() == [1.0]
+
+
+def test_intraday_intervals_bypass_the_store(store, monkeypatch):
+    monkeypatch.setattr(quote_service, "fetch_history", lambda symbol, **kwargs: _frame(["2024-01-02"]))
+    quote_service.load_history("AAPL", "5d", "1h")
+    assert store.sync_state("AAPL") is None
+
+
+def test_sync_is_final_after_the_last_close():
+    # Saturday 2024-03-09 12:00 New York; the last close was Friday 16:00
+    saturday = datetime(2024, 3, 9, 17, 0, tzinfo=timezone.utc)
+    friday_close = datetime(2024, 3, 8, 21, 0, tzinfo=timezone.utc)
+    assert quote_service.last_close(saturday) == friday_close
+    state = quote_service.SyncState("2023-01-01", "2024-03-08", friday_close.timestamp() + 1)
+    assert quote_service.history_is_current(state, saturday)
+    assert not quote_service.history_is_current(state._replace(synced_at=friday_close.timestamp() - 60), saturday)
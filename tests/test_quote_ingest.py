@@ -0,0 +1,76 @@
+"""Offline tests for bulk quote ingestion."""
+from __future__ import annotations
+
+import pytest
+
+from src.core.latency import IOPolicy
+from src.modules import quote_ingest
+
+pd = pytest.importorskip("pandas")
+
+
+def _info(symbol, **extra):
+    return {"symbol": symbol, "longName": f"{symbol} Inc.", "sector": "Technology", "currentPrice": 10.0, **extra}
+
+
+def test_batches_are_written_with_one_save_each(monkeypatch):
+    symbols = [f"S{i}" for i in range(7)]
+    monkeypatch.setattr(quote_ingest, "fetch_info", lambda symbol: None if symbol == "S3" else _info(symbol))
+    monkeypatch.setattr(quote_ingest, "price_summary", lambda batch, threads=1: {s: {"52WeekHigh": 12.0} for s in batch})
+    saves = []
+
+    report = quote_ingest.ingest_quotes(symbols, batch_size=3, max_workers=2, save=lambda rows: saves.append(rows) or len(rows))
+
+    assert [len(rows) for rows in saves] == [3, 2, 1]
+    assert (report.symbols, report.fetched, report.stored, report.failed) == (7, 6, 6, ["S3"])
+    assert saves[0][0]["ticker"] == "S0" and saves[0][0]["52WeekHigh"] == 12.0
+    assert report.symbols_per_second > 0
+
+
+def test_download_prices_only_fill_gaps_in_info():
+    snapshot = quote_ingest.build_snapshot(
+        _info("AAPL", fiftyTwoWeekLow=5.0), {"currentPrice": 99.0, "52WeekHigh": 12.0, "52WeekLow": 4.0}
+    )
+
+    assert (snapshot["currentPrice"], snapshot["52WeekHigh"], snapshot["52WeekLow"]) == (10.0, 12.0, 5.0)
+    assert quote_ingest.build_snapshot({}, {"currentPrice": 1.0}) is None
+
+
+def test_price_summary_reads_one_multi_symbol_download_and_stores_bars(tmp_path, monkeypatch):
+    import yfinance
+
+    from src.core.price_store import PriceStore
+    from src.modules import quote_service
+
+    columns = pd.MultiIndex.from_product([["AAPL", "MSFT", "GONE"], ["Close", "Adj Close", "High", "Low"]])
+    frame = pd.DataFrame(
+        [[1.0, 0.5, 1.5, 0.5, 2.0, 2.0, 2.5, 1.5, None, None, None, None],
+         [1.2, 1.2, 1.4, 1.0, None, None, None, None, None, None, None, None]],
+        columns=columns,
+        index=pd.to_datetime(["2024-01-02", "2024-01-03"]),
+    )
+    calls = []
+    monkeypatch.setattr(yfinance, "download", lambda symbols, **kwargs: calls.append((symbols, kwargs)) or frame)
+    monkeypatch.setattr(quote_service.latency, "policy", IOPolicy())
+    monkeypatch.setattr(quote_service, "price_store", PriceStore(tmp_path / "prices.sqlite3"))
+
+    prices = quote_ingest.price_summary(["AAPL", "MSFT", "GONE"])
+
+    assert [symbols for symbols, _ in calls] == [["AAPL", "MSFT", "GONE"]]
+    assert calls[0][1]["auto_adjust"] is False
+    assert prices == {
+        "AAPL": {"currentPrice": 1.2, "52WeekHigh": 1.5, "52WeekLow": 0.5},
+        "MSFT": {"currentPrice": 2.0, "52WeekHigh": 2.5, "52WeekLow": 1.5},
+    }
+    # Stored bars are adjusted the way yfinance's history() returns them
+    assert [bar.close for bar in quote_service.price_store.bars("AAPL")] == [0.5, 1.2]
+    assert quote_service.latency.policy.metrics()["hosts"]["yfinance.download"]["hedges"] == 0
+
+
+def test_resolve_symbols_uses_the_local_table():
+    symbols, unresolved = quote_ingest.resolve_symbols(["Apple", "apple inc", "Microsoft", "Zzyzx Holdings"])
+    everything, _ = quote_ingest.resolve_symbols()
+
+    assert symbols == ["AAPL", "MSFT"]
+    assert unresolved == ["Zzyzx Holdings"]
+    assert len(everything) > 400 and "AAPL" in everything
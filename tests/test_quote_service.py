@@ -0,0 +1,149 @@
+"""Tests for the shared, cached yfinance quote service."""
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from src.core import pipeline
+from src.core.price_store import PriceStore
+from src.modules import quote_service
+from src.modules.quote_service import QuoteService, market_is_open
+
+
+@pytest.fixture
+def service(monkeypatch):
+    svc = QuoteService(ttl_open=60, ttl_closed=600, is_open=lambda: True)
+    monkeypatch.setattr(quote_service, "service", svc)
+    monkeypatch.setattr(quote_service, "price_store", PriceStore(None))
+    return svc
+
+
+def test_repeated_lookups_hit_the_cache_until_the_ttl(service, monkeypatch):
+    calls = []
+    monkeypatch.setattr(quote_service, "fetch_info", lambda symbol: calls.append(symbol) or {"symbol": symbol})
+
+    assert quote_service.get_info("aapl") == {"symbol": "AAPL"}
+    assert quote_service.get_info("AAPL ") == {"symbol": "AAPL"}
+    assert calls == ["AAPL"]
+
+    service.ttl_open = 0
+    service.clear()
+    quote_service.get_info("AAPL")
+    time.sleep(0.01)
+    quote_service.get_info("AAPL")
+    assert calls == ["AAPL"] * 3
+    assert service.stats()["hits"] == 1
+
+
+def test_ttl_is_longer_while_the_market_is_closed():
+    svc = QuoteService(ttl_open=60, ttl_closed=600, is_open=lambda: False)
+    assert svc.ttl() == 600
+    svc.is_open = lambda: True
+    assert svc.ttl() == 60
+
+
+def test_concurrent_lookups_share_one_download(service, monkeypatch):
+    calls = []
+    release = threading.Event()
+
+    def slow_fetch(symbol):
+        calls.append(symbol)
+        release.wait(2)
+        return {"symbol": symbol}
+
+    monkeypatch.setattr(quote_service, "fetch_info", slow_fetch)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(quote_service.get_info("MSFT"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert calls == ["MSFT"]
+    assert results == [{"symbol": "MSFT"}] * 8
+    assert service.stats()["coalesced"] == 7
+
+
+def test_failures_and_empty_results_are_not_cached(service, monkeypatch):
+    outcomes = iter([RuntimeError("rate limited"), {}, {"symbol": "TSLA"}])
+
+    def flaky(symbol):
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(quote_service, "fetch_info", flaky)
+
+    with pytest.raises(RuntimeError):
+        quote_service.get_info("TSLA")
+    assert quote_service.get_info("TSLA") == {}
+    assert quote_service.get_info("TSLA") == {"symbol": "TSLA"}
+    assert quote_service.get_info("TSLA") == {"symbol": "TSLA"}
+
+
+def test_market_hours():
+    # 2024-03-08 is a Friday; New York is UTC-5 before the DST switch
+    assert market_is_open(datetime(2024, 3, 8, 14, 30, tzinfo=timezone.utc))
+    assert market_is_open(datetime(2024, 3, 8, 20, 59, tzinfo=timezone.utc))
+    assert not market_is_open(datetime(2024, 3, 8, 14, 29, tzinfo=timezone.utc))
+    assert not market_is_open(datetime(2024, 3, 8, 21, 0, tzinfo=timezone.utc))
+    assert not market_is_open(datetime(2024, 3, 9, 16, 0, tzinfo=timezone.utc))
+
+
+def test_report_makes_one_info_and_one_history_call(service, monkeypatch):
+    pytest.importorskip("fastapi")
+    pd = pytest.importorskip("pandas")
+    from fastapi.testclient import TestClient
+
+    import frontend.app as app_module
+
+    calls = []
+    history = pd.DataFrame({"Close": [1.0, 2.0]}, index=pd.to_datetime(["2024-01-02", "2024-01-03"]))
+    monkeypatch.setattr(quote_service, "fetch_info", lambda symbol: calls.append("info") or {"symbol": symbol})
+    monkeypatch.setattr(quote_service, "fetch_history", lambda symbol, **kw: calls.append("history") or history)
+    monkeypatch.setattr(pipeline, "extract_company_name", lambda query: "Apple")
+    monkeypatch.setattr(pipeline, "fetch_news", lambda company: [])
+    monkeypatch.setattr(pipeline, "get_stock_ticker", lambda company: "AAPL")
+    monkeypatch.setattr(pipeline, "save_stock_snapshot", lambda data: None)
+
+    async def fake_report(company, report):
+        return "report"
+
+    monkeypatch.setattr(pipeline, "agenerate_detailed_report", fake_report)
+
+    client = TestClient(app_module.app)
+    first = client.post("/api/report", json={"query": "How is Apple doing?"}).json()
+    client.post("/api/report", json={"query": "How is Apple doing?"})
+    client.post("/api/stock/history", json={"company": "AAPL"})
+
+    assert first["chart_data"]["dates"] == ["2024-01-02", "2024-01-03"]
+    assert first["chart_data"]["close"] == [1.0, 2.0]
+    assert {"company", "stock", "indicators", "chart", "report"} <= set(first["timings"]["stages"])
+    assert sorted(calls) == ["history", "info"]
+
+
+def test_yfinance_requests_are_capped_by_the_call_deadline():
+    assert quote_service._request_timeout(30) == 30
+    with quote_service.deadline(0.5):
+        assert quote_service._request_timeout(30) <= 0.5
+        assert quote_service._request_timeout(None) <= 0.5
+    with quote_service.deadline(0):
+        with pytest.raises(TimeoutError):
+            quote_service._request_timeout(30)
+    assert quote_service._request_timeout(None) is None
+
+
+def test_nested_deadlines_restore_the_outer_one():
+    with quote_service.deadline(0.5):
+        with quote_service.deadline(10):
+            assert quote_service._request_timeout(30) <= 0.5  # never extends the outer deadline
+        with quote_service.deadline(0.1):
+            assert quote_service._request_timeout(30) <= 0.1
+        assert 0.1 < quote_service._request_timeout(30) <= 0.5
+    assert quote_service._request_timeout(30) == 30
@@ -0,0 +1,74 @@
+"""Tests for BM25 ranking of candidate news articles."""
+from __future__ import annotations
+
+import pytest
+
+from src.modules import relevance
+
+pytest.importorskip("numpy")
+
+FILLER = "Markets moved on the day as investors weighed rates and earnings. " * 6
+
+
+def test_strong_match_outranks_passing_mention():
+    texts = [
+        FILLER + "Apple was mentioned once.",
+        "Apple unveiled a new iPhone. Apple shares rose as Apple beat estimates. " + FILLER,
+        FILLER,
+    ]
+    ranked = relevance.rank_articles(texts, "Apple")
+
+    assert [r.index for r in ranked] == [1, 0, 2]
+    assert ranked[-1].score == 0
+
+
+def test_ticker_and_aliases_count_as_mentions():
+    by_alias = FILLER + "Google announced new AI features for search."
+    by_ticker = FILLER + "Shares of $GOOGL climbed after the close."
+    unrelated = FILLER + "Microsoft reported cloud growth."
+
+    selected = relevance.select_articles([unrelated, by_alias, by_ticker], "Alphabet", k=5)
+
+    assert set(selected) == {by_alias, by_ticker}
+
+
+def test_multi_word_names_are_matched_as_phrases():
+    phrase = FILLER + "Goldman Sachs raised its outlook."
+    scattered = FILLER + "Sachs said goldman prices were flat."
+
+    ranked = relevance.rank_articles([scattered, phrase], "Goldman Sachs")
+
+    assert ranked[0].index == 1
+
+
+def test_weak_matches_are_dropped_and_k_is_respected():
+    strong = ["Tesla deliveries jumped. Tesla stock and Tesla margins rose. " + FILLER for _ in range(3)]
+    weak = FILLER * 3 + "Tesla."
+    texts = strong + [weak]
+
+    assert relevance.select_articles(texts, "Tesla", k=2) == strong[:2]
+    assert weak not in relevance.select_articles(texts, "Tesla", k=5, min_relative_score=0.5)
+    assert weak in relevance.select_articles(texts, "Tesla", k=5, min_relative_score=0)
+
+
+def test_falls_back_to_input_order_when_nothing_matches():
+    texts = [FILLER + str(i) for i in range(4)]
+
+    assert relevance.select_articles(texts, "Nvidia", k=3) == texts[:3]
+    assert relevance.select_articles([], "Nvidia") == []
+
+
+def test_tokenization_is_cached_across_rankings():
+    relevance._index.cache_clear()
+    texts = [FILLER + f"Apple story {i}" for i in range(5)]
+
+    relevance.rank_articles(texts, "Apple")
+    relevance.rank_articles(texts, "Microsoft")
+
+    info = relevance._index.cache_info()
+    assert info.misses == 5
+    assert info.hits == 5
+
+
+def test_tokenize_folds_joiners_and_possessives():
+    assert relevance.tokenize("AT&T's U.S. deal") == ("att", "us", "deal")
@@ -0,0 +1,158 @@
+"""Offline tests for progressive report delivery (callbacks, token streaming, SSE)."""
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.core import pipeline
+
+
+def _stream_client(pieces):
+    requests = []
+
+    def create(**kwargs):
+        requests.append(kwargs)
+        return iter(
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+            for piece in pieces
+        )
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    return client, requests
+
+
+def test_stream_detailed_report_yields_deltas(monkeypatch):
+    client, requests = _stream_client(["Over", None, "view", ""])
+    monkeypatch.setattr(pipeline, "get_openai_client", lambda: client)
+
+    pieces = list(pipeline.stream_detailed_report("Apple", {"stock_information": {}, "news_summaries": []}))
+
+    assert pieces == ["Over", "view"]
+    assert requests[0]["stream"] is True
+    assert "Apple" in requests[0]["messages"][0]["content"]
+
+
+def test_stream_detailed_report_without_client(monkeypatch):
+    monkeypatch.setattr(pipeline, "get_openai_client", lambda: None)
+    pieces = list(pipeline.stream_detailed_report("Apple", {}))
+    assert len(pieces) == 1 and pieces[0].startswith("Unable to generate detailed report")
+
+
+def test_on_summary_reports_each_article(monkeypatch):
+    monkeypatch.setattr(pipeline, "safe_summarize", lambda _s, text, max_chars=1500: f"sum:{text}")
+    seen = []
+
+    summaries = pipeline.summarize_articles(["a", "b", "c"], max_workers=4, on_summary=lambda i, s: seen.append((i, s)))
+
+    assert sorted(seen) == list(enumerate(summaries))
+
+
+def _parse_sse(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_report_stream_endpoint_emits_stages_then_tokens(monkeypatch):
+    pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+    from frontend import app as app_module
+
+    def fake_news(company, on_summary=None, stop=None):
+        for idx, text in enumerate(["first", "second"]):
+            on_summary(idx, text)
+        return ["first", "second"]
+
+    monkeypatch.setattr(pipeline, "extract_company_name", lambda query: "Apple")
+    monkeypatch.setattr(pipeline, "fetch_news", fake_news)
+    monkeypatch.setattr(pipeline, "fetch_stock_quote", lambda ticker: {"ticker": "AAPL"})
+    monkeypatch.setattr(pipeline, "fetch_indicators", lambda ticker: {})
+    monkeypatch.setattr(app_module, "_price_history", lambda ticker: [{"date": "2024-01-02", "close": 1.0}])
+    monkeypatch.setattr(pipeline, "stream_detailed_report", lambda company, report: iter(["Rep", "ort"]))
+
+    response = TestClient(app_module.app).get("/api/report/stream", params={"query": "apple news"})
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _parse_sse(response.text)
+    names = [name for name, _ in events]
+    assert names[0] == "company"
+    assert {"stock", "chart"} <= set(names)
+    assert [data["index"] for name, data in events if name == "news"] == [0, 1]
+    assert [data["text"] for name, data in events if name == "report_delta"] == ["Rep", "ort"]
+    assert names[-1] == "done"
+    assert events[-1][1]["detailed_report"] == "Report"
+    assert events[-1][1]["news_summaries"] == ["first", "second"]
+
+
+def test_report_stream_endpoint_reports_missing_company(monkeypatch):
+    pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+    from frontend import app as app_module
+
+    monkeypatch.setattr(pipeline, "extract_company_name", lambda query: None)
+
+    events = _parse_sse(TestClient(app_module.app).get("/api/report/stream", params={"query": "hello"}).text)
+    assert events == [("error", {"detail": "Could not extract company name from query"})]
+
+
+def test_report_stream_runs_stages_under_the_offload_limits(monkeypatch):
+    pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+    from frontend import app as app_module
+    from src.core import offload
+
+    monkeypatch.setattr(offload, "offloader", offload.Offloader())
+    monkeypatch.setattr(pipeline, "extract_company_name", lambda query: "Apple")
+    monkeypatch.setattr(pipeline, "fetch_news", lambda company, on_summary=None, stop=None: [])
+    monkeypatch.setattr(pipeline, "report_ticker", lambda company: "AAPL")
+    monkeypatch.setattr(pipeline, "fetch_stock_quote", lambda ticker: {"ticker": ticker})
+    monkeypatch.setattr(pipeline, "fetch_indicators", lambda ticker: {})
+    monkeypatch.setattr(app_module, "_price_history", lambda ticker: {"dates": [], "close": []})
+    monkeypatch.setattr(pipeline, "stream_detailed_report", lambda company, report: iter(["ok"]))
+
+    events = _parse_sse(TestClient(app_module.app).get("/api/report/stream", params={"query": "apple"}).text)
+
+    assert events[-1][0] == "done" and set(events[-1][1]["timings"]["stages"]) >= {"news", "stock", "chart"}
+    calls = {name: stats["calls"] for name, stats in offload.offloader.stats()["dependencies"].items()}
+    assert calls["news"] == 1 and calls["yfinance"] == 3 and calls["llm"] == 2
+    offload.offloader.shutdown()
+
+
+def test_report_stream_stops_when_the_client_disconnects(monkeypatch):
+    pytest.importorskip("fastapi")
+    import asyncio
+    import threading
+
+    from frontend import app as app_module
+
+    stopped = threading.Event()
+
+    def blocking_news(company, on_summary=None, stop=None):
+        # Stands in for a summarizer that keeps calling the LLM until told to stop
+        stop.wait(5)
+        stopped.set()
+        return []
+
+    monkeypatch.setattr(app_module, "SSE_DISCONNECT_POLL", 0.05)
+    monkeypatch.setattr(pipeline, "extract_company_name", lambda query: "Apple")
+    monkeypatch.setattr(pipeline, "fetch_news", blocking_news)
+    monkeypatch.setattr(pipeline, "report_ticker", lambda company: "AAPL")
+    monkeypatch.setattr(pipeline, "fetch_stock_quote", lambda ticker: None)
+    monkeypatch.setattr(pipeline, "fetch_indicators", lambda ticker: {})
+    monkeypatch.setattr(app_module, "_price_history", lambda ticker: {"dates": [], "close": []})
+
+    class GoneRequest:
+        async def is_disconnected(self):
+            return True
+
+    async def consume():
+        return [event async for event in app_module._report_events(GoneRequest(), "apple")]
+
+    events = asyncio.run(consume())
+
+    assert stopped.wait(1)
+    assert not any(event.startswith("event: done") for event in events)
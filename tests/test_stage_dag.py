@@ -0,0 +1,116 @@
+"""Tests for the report stage DAG executor."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from src.core import pipeline
+from src.core.offload import Offloader
+from src.core.stage_dag import Stage, arun_stages, plan, run_stages
+
+
+def _sleeper(seconds, value):
+    def fn(**_deps):
+        time.sleep(seconds)
+        return value
+    return fn
+
+
+def test_independent_stages_overlap():
+    stages = [
+        Stage("a", _sleeper(0.2, "a")),
+        Stage("b", _sleeper(0.2, "b")),
+        Stage("c", _sleeper(0.2, "c")),
+        Stage("d", lambda a, b, c: a + b + c, ("a", "b", "c")),
+    ]
+    run = run_stages(stages)
+    assert run.results["d"] == "abc"
+    assert run.elapsed < 0.45
+    assert run.critical_path[-1] == "d"
+    assert set(run.timings) == {"a", "b", "c", "d"}
+
+
+def test_results_follow_edges_from_inputs():
+    stages = [
+        Stage("double", lambda x: x * 2, ("x",)),
+        Stage("slow", _sleeper(0.1, 1)),
+        Stage("total", lambda double, slow: double + slow, ("double", "slow")),
+    ]
+    seen = []
+    run = run_stages(stages, {"x": 5}, on_stage=lambda timing, value: seen.append(timing.name))
+    assert run.results["total"] == 11
+    assert seen[-1] == "total"
+    assert run.critical_path == ["slow", "total"]
+
+
+def test_fallback_keeps_the_run_going_but_required_stages_fail_it():
+    def boom():
+        raise RuntimeError("down")
+
+    run = run_stages([Stage("news", boom, fallback=[]), Stage("out", lambda news: len(news), ("news",))])
+    assert run.results["out"] == 0
+    assert run.timings["news"].error == "down"
+
+    ran = []
+    with pytest.raises(RuntimeError, match="down"):
+        run_stages([Stage("news", boom), Stage("out", lambda news: ran.append(news), ("news",))])
+    assert ran == []
+
+
+def test_plan_rejects_bad_graphs_and_prunes_to_targets():
+    with pytest.raises(ValueError, match="cycle"):
+        plan([Stage("a", len, ("b",)), Stage("b", len, ("a",))])
+    with pytest.raises(ValueError, match="unknown"):
+        plan([Stage("a", len, ("missing",))])
+    with pytest.raises(ValueError, match="Duplicate"):
+        plan([Stage("a", len), Stage("a", len)])
+
+    stages = [Stage("a", len), Stage("b", len, ("a",)), Stage("c", len, ("a",))]
+    assert [stage.name for stage in plan(stages, targets=["b"])] == ["a", "b"]
+
+
+def test_async_runner_awaits_coroutines_and_offloads_the_rest(monkeypatch):
+    from src.core import offload
+
+    monkeypatch.setattr(offload, "offloader", Offloader({"local": 4, "llm": 2}))
+
+    async def fetch(x):
+        await asyncio.sleep(0.2)
+        return x + 1
+
+    stages = [
+        Stage("blocking", _sleeper(0.2, 10)),
+        Stage("awaited", fetch, ("x",), "llm"),
+        Stage("sum", lambda blocking, awaited: blocking + awaited, ("blocking", "awaited")),
+    ]
+    run = asyncio.run(arun_stages(stages, {"x": 1}))
+    assert run.results["sum"] == 12
+    assert run.elapsed < 0.35
+    offload.offloader.shutdown()
+
+
+def test_report_dag_runs_news_and_ticker_side_by_side(monkeypatch):
+    def slow(value):
+        def fn(*_args, **_kwargs):
+            time.sleep(0.2)
+            return value
+        return fn
+
+    monkeypatch.setattr(pipeline, "extract_company_name", lambda query: "Apple")
+    monkeypatch.setattr(pipeline, "fetch_news", slow(["summary"]))
+    monkeypatch.setattr(pipeline, "report_ticker", slow("AAPL"))
+    monkeypatch.setattr(pipeline, "fetch_stock_quote", lambda ticker: {"ticker": ticker})
+    monkeypatch.setattr(pipeline, "fetch_indicators", slow({"rsi_14": 50.0}))
+
+    run = run_stages(pipeline.report_stages(report=lambda company, report: f"{company}: {report['stock_information']}"),
+                     {"query": "How is Apple doing?"})
+    assert run.results["aggregate"]["technical_indicators"] == {"rsi_14": 50.0}
+    assert run.results["report"] == "Apple: {'ticker': 'AAPL'}"
+    # news overlaps ticker -> indicators: two slow steps on the critical path, not three
+    assert run.elapsed < 0.55
+
+    monkeypatch.setattr(pipeline, "extract_company_name", lambda query: None)
+    with pytest.raises(pipeline.CompanyNotFound):
+        run_stages(pipeline.report_stages(), {"query": "hello"})
@@ -0,0 +1,24 @@
+"""Guard against heavy dependencies creeping back into import time."""
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+LAZY_MODULES = ("spacy", "yfinance", "openai", "psycopg", "bs4", "requests")
+
+
+def _eager_imports(module: str) -> list[str]:
+    code = f"import json, sys; import {module}; print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_pipeline_import_is_lazy():
+    assert _eager_imports("src.core.pipeline") == []
+
+
+def test_app_import_is_lazy():
+    assert _eager_imports("frontend.app") == []
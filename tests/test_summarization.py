@@ -0,0 +1,85 @@
+"""Offline tests for the news summarization helpers in the pipeline."""
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+from src.core import pipeline
+from src.core.cache import TwoTierCache
+
+
+def _fake_summarize(calls):
+    lock = threading.Lock()
+
+    def fake(_summarizer, text, max_chars=1500):
+        with lock:
+            calls.append(text)
+        time.sleep(0.01)
+        return f"summary of {len(text)} chars " + "x" * 100
+
+    return fake
+
+
+def test_concurrent_summaries_keep_article_order(monkeypatch):
+    calls: list[str] = []
+    monkeypatch.setattr(pipeline, "safe_summarize", _fake_summarize(calls))
+    articles = [("word " * 400) * (i + 1) for i in range(4)]
+
+    serial = pipeline.summarize_articles(articles, max_workers=1)
+    serial_calls = len(calls)
+    calls.clear()
+    concurrent = pipeline.summarize_articles(articles, max_workers=8)
+
+    assert concurrent == serial
+    assert len(calls) == serial_calls
+
+
+def test_short_articles_skip_reduce_step(monkeypatch):
+    calls: list[str] = []
+    monkeypatch.setattr(pipeline, "safe_summarize", lambda _s, text, max_chars=1500: calls.append(text) or "ok")
+
+    assert pipeline.summarize_articles(["tiny", "also tiny"], max_workers=4) == ["ok", "ok"]
+    assert len(calls) == 2
+
+
+class _FakeCompletions:
+    def __init__(self, reply):
+        self.reply = reply
+        self.requests = []
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs)
+        message = SimpleNamespace(content=self.reply(kwargs["messages"][-1]["content"]))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _fake_client(reply):
+    return SimpleNamespace(chat=SimpleNamespace(completions=_FakeCompletions(reply)))
+
+
+def test_batch_maps_ids_and_falls_back_for_invalid_entries(monkeypatch):
+    monkeypatch.setattr(pipeline, "summary_cache", TwoTierCache("summaries", None, ttl_seconds=60))
+    reply = '```json\n{"summaries": [{"id": "1", "summary": "first"}, {"id": "3", "summary": ""}, {"id": "9", "summary": "x"}]}\n```'
+    client = _fake_client(lambda prompt: reply)
+    monkeypatch.setattr(pipeline, "get_openai_client", lambda: client)
+    fallback: list[str] = []
+    monkeypatch.setattr(pipeline, "summarize_article", lambda text: fallback.append(text) or f"single:{text}")
+
+    articles = ["article one " * 10, "article two " * 10, "article three " * 10]
+    summaries = pipeline.summarize_articles_batched(articles, "Apple", max_workers=1)
+
+    assert summaries == ["first", f"single:{articles[1]}", f"single:{articles[2]}"]
+    assert len(client.chat.completions.requests) == 1
+    assert fallback == articles[1:]
+
+
+def test_batch_results_are_cached(monkeypatch):
+    monkeypatch.setattr(pipeline, "summary_cache", TwoTierCache("summaries", None, ttl_seconds=60))
+    client = _fake_client(lambda prompt: '{"summaries": [{"id": "1", "summary": "a"}, {"id": "2", "summary": "b"}]}')
+    monkeypatch.setattr(pipeline, "get_openai_client", lambda: client)
+
+    articles = ["alpha " * 20, "beta " * 20]
+    assert pipeline.summarize_batch_with_grok(articles) == ["a", "b"]
+    assert pipeline.summarize_batch_with_grok(articles) == ["a", "b"]
+    assert len(client.chat.completions.requests) == 1
@@ -0,0 +1,76 @@
+"""Tests for the token-budgeted streaming chunker."""
+from __future__ import annotations
+
+from src.modules.text_chunker import approx_token_count, iter_chunks, pack_texts
+
+
+def _words(text):
+    return text.split()
+
+
+def test_chunks_respect_budget_and_keep_every_word():
+    text = "\n".join(" ".join(f"w{p}_{i}." for i in range(30)) for p in range(20))
+    chunks = list(iter_chunks(text, max_tokens=50))
+
+    assert all(approx_token_count(c) <= 50 for c in chunks)
+    assert [w for c in chunks for w in _words(c)] == _words(text)
+
+
+def test_paragraph_boundaries_are_preferred():
+    paragraphs = ["First paragraph is short.", "Second paragraph is short too.", "Third one."]
+    chunks = list(iter_chunks("\n".join(paragraphs), max_tokens=12))
+
+    assert chunks == ["First paragraph is short.", "Second paragraph is short too.\nThird one."]
+
+
+def test_oversized_sentence_falls_back_to_words():
+    chunks = list(iter_chunks("word " * 100, max_tokens=20))
+
+    assert len(chunks) > 1
+    assert sum(len(_words(c)) for c in chunks) == 100
+
+
+def test_custom_token_counter_is_used():
+    chunks = list(iter_chunks("a b c d e f", max_tokens=2, count_tokens=lambda s: len(s.split())))
+    assert chunks == ["a b", "c d", "e f"]
+
+
+def test_pack_texts_groups_small_articles():
+    texts = ["x" * 40, "y" * 40, "z" * 40, "w" * 400]
+    batches = list(pack_texts(texts, max_tokens=25))
+
+    assert batches[0] == [(0, texts[0]), (1, texts[1])]
+    assert [idx for batch in batches for idx, _ in batch].count(3) == 1
+    assert batches[-1] == [(2, texts[2])]
+
+
+def _legacy_chunk_text(text, max_chars=1500):
+    """The word-by-word chunker pipeline.chunk_text used before token budgets."""
+    chunks, current = [], []
+    for w in text.split():
+        if sum(len(x) for x in current) + len(w) + len(current) > max_chars:
+            chunks.append(" ".join(current))
+            current = []
+        current.append(w)
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def test_chunk_count_never_exceeds_the_old_char_chunker():
+    sentence = "The company reported quarterly revenue growth while analysts expect margins to widen."
+    for n in (3, 40, 400):
+        text = "\n".join(" ".join([sentence] * (2 + p % 5)) for p in range(n))
+        chunks = list(iter_chunks(text, max_tokens=375))
+
+        assert len(chunks) <= len(_legacy_chunk_text(text))
+        assert all(len(c) <= 1500 for c in chunks)
+        assert [w for c in chunks for w in _words(c)] == _words(text)
+
+
+def test_chunk_text_keeps_max_chars_as_second_argument():
+    from src.core.pipeline import chunk_text
+
+    text = "alpha beta gamma. " * 200
+    assert all(len(c) <= 400 for c in chunk_text(text, 400))
+    assert chunk_text(text, 400) == chunk_text(text, max_tokens=100)
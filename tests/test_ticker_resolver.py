@@ -0,0 +1,72 @@
+"""Tests for the local ticker resolver and its LLM write-back cache."""
+from __future__ import annotations
+
+import pytest
+
+from src.core.cache import TwoTierCache
+from src.modules import ticker_resolver
+from src.modules.ticker_resolver import resolve_ticker
+
+
+@pytest.fixture(autouse=True)
+def memory_cache(monkeypatch):
+    monkeypatch.setattr(ticker_resolver, "ticker_cache", TwoTierCache("tickers", None, ttl_seconds=60))
+
+
+@pytest.mark.parametrize(
+    "query, symbol, tier",
+    [
+        ("AAPL", "AAPL", "symbol"),
+        ("BRK.B", "BRK-B", "symbol"),
+        ("Apple", "AAPL", "exact"),
+        ("Tesla, Inc.", "TSLA", "exact"),
+        ("The Home Depot", "HD", "exact"),
+        ("Google", "GOOGL", "alias"),
+        ("JP Morgan Chase", "JPM", "alias"),
+        ("Goldman", "GS", "alias"),
+        ("Microsft", "MSFT", "fuzzy"),
+    ],
+)
+def test_local_tiers(query, symbol, tier):
+    match = resolve_ticker(query)
+    assert match is not None
+    assert (match.symbol, match.tier) == (symbol, tier)
+
+
+def test_generic_or_unknown_names_miss():
+    assert resolve_ticker("American") is None
+    assert resolve_ticker("Shopify") is None
+
+
+def test_remembered_llm_answers_resolve_locally():
+    ticker_resolver.remember_ticker("Shopify Inc.", "SHOP")
+
+    assert resolve_ticker("Shopify").symbol == "SHOP"
+    assert resolve_ticker("SHOP").tier == "symbol"
+
+
+def test_short_names_need_a_close_fuzzy_match():
+    assert resolve_ticker("AMC") is None
+
+
+def test_fuzzy_candidates_are_confirmed_by_the_llm(monkeypatch):
+    from types import SimpleNamespace
+
+    from src.core import pipeline
+
+    asked = []
+
+    def create(**kwargs):
+        asked.append(kwargs["messages"][-1]["content"])
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content='{"ticker":"MSFT"}'))])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(pipeline, "get_openai_client", lambda: client)
+    assert pipeline.get_stock_ticker("Microsft") == "MSFT"
+    assert len(asked) == 1
+    # The confirmed answer is remembered, so the next lookup stays local
+    assert pipeline.get_stock_ticker("Microsft") == "MSFT"
+    assert len(asked) == 1
+
+    monkeypatch.setattr(pipeline, "get_openai_client", lambda: None)
+    assert pipeline.get_stock_ticker("Microsoftt") == "MSFT"